@@ -18,7 +18,9 @@ from app.database import Base
 from app.config import get_settings
 
 # Import all models to ensure they are registered with Base
-from app.models import Account, Proxy, Video, VideoProject  # noqa: F401
+from app.models import (  # noqa: F401
+    Account, Proxy, Video, VideoProject, RenderJob, VideoUpload, VideoBlob
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,105 @@
+"""Initial schema
+
+Tables as created by init_db before migrations were added. Databases
+created that way are brought under migration control with
+``alembic stamp 0001`` followed by ``alembic upgrade head``.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-16 19:13:09.110363
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('proxies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('proxy_type', sa.Enum('SOCKS5', 'HTTP', 'HTTPS', name='proxytype'), nullable=False),
+    sa.Column('address', sa.String(length=255), nullable=False),
+    sa.Column('port', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=255), nullable=True),
+    sa.Column('password', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('last_tested', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_proxies_id'), 'proxies', ['id'], unique=False)
+    op.create_table('accounts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=255), nullable=False),
+    sa.Column('platform', sa.Enum('TIKTOK', 'REELS', 'SHORTS', name='platform'), nullable=False),
+    sa.Column('region', sa.String(length=100), nullable=True),
+    sa.Column('followers', sa.BigInteger(), nullable=False),
+    sa.Column('videos_count', sa.Integer(), nullable=False),
+    sa.Column('total_likes', sa.BigInteger(), nullable=False),
+    sa.Column('total_comments', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.Enum('ONLINE', 'OFFLINE', 'SUSPENDED', 'PENDING', name='accountstatus'), nullable=False),
+    sa.Column('last_activity', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('proxy_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['proxy_id'], ['proxies.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_accounts_id'), 'accounts', ['id'], unique=False)
+    op.create_index(op.f('ix_accounts_username'), 'accounts', ['username'], unique=True)
+    op.create_table('video_projects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=False),
+    sa.Column('status', sa.Enum('DRAFT', 'PROCESSING', 'COMPLETED', 'FAILED', name='projectstatus'), nullable=False),
+    sa.Column('video_track_path', sa.String(length=1000), nullable=False),
+    sa.Column('audio_track_path', sa.String(length=1000), nullable=True),
+    sa.Column('subtitle_text', sa.String(length=5000), nullable=True),
+    sa.Column('audio_volume', sa.Integer(), nullable=False),
+    sa.Column('filter_type', sa.Enum('NONE', 'CINEMATIC', 'BRIGHT', 'CYBERPUNK', 'VINTAGE', 'WARM', 'COOL', name='filtertype'), nullable=False),
+    sa.Column('uniquify_subtitles', sa.Boolean(), nullable=False),
+    sa.Column('output_path', sa.String(length=1000), nullable=True),
+    sa.Column('error_message', sa.String(length=2000), nullable=True),
+    sa.Column('account_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_video_projects_id'), 'video_projects', ['id'], unique=False)
+    op.create_table('videos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=500), nullable=False),
+    sa.Column('file_path', sa.String(length=1000), nullable=False),
+    sa.Column('thumbnail_path', sa.String(length=1000), nullable=True),
+    sa.Column('duration', sa.Float(), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=True),
+    sa.Column('views', sa.BigInteger(), nullable=False),
+    sa.Column('likes', sa.BigInteger(), nullable=False),
+    sa.Column('comments', sa.Integer(), nullable=False),
+    sa.Column('engagement_rate', sa.Float(), nullable=False),
+    sa.Column('platform', sa.String(length=50), nullable=True),
+    sa.Column('upload_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('account_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_videos_id'), 'videos', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_videos_id'), table_name='videos')
+    op.drop_table('videos')
+    op.drop_index(op.f('ix_video_projects_id'), table_name='video_projects')
+    op.drop_table('video_projects')
+    op.drop_index(op.f('ix_accounts_username'), table_name='accounts')
+    op.drop_index(op.f('ix_accounts_id'), table_name='accounts')
+    op.drop_table('accounts')
+    op.drop_index(op.f('ix_proxies_id'), table_name='proxies')
+    op.drop_table('proxies')
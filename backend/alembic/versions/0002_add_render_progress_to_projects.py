@@ -0,0 +1,30 @@
+"""Add render progress to projects
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 19:13:11.170629
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('video_projects', sa.Column('progress', sa.Float(), server_default='0', nullable=False))
+    op.add_column('video_projects', sa.Column('render_fps', sa.Float(), nullable=True))
+    op.add_column('video_projects', sa.Column('render_speed', sa.Float(), nullable=True))
+    op.add_column('video_projects', sa.Column('eta_seconds', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('video_projects', 'eta_seconds')
+    op.drop_column('video_projects', 'render_speed')
+    op.drop_column('video_projects', 'render_fps')
+    op.drop_column('video_projects', 'progress')
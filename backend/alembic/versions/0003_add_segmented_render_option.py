@@ -0,0 +1,24 @@
+"""Add segmented render option
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 19:13:13.611218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('video_projects', sa.Column('segmented_render', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('video_projects', 'segmented_render')
@@ -0,0 +1,24 @@
+"""Add custom filter presets to projects
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 19:13:16.175928
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('video_projects', sa.Column('custom_filter', sa.String(length=100), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('video_projects', 'custom_filter')
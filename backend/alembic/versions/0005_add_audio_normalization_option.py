@@ -0,0 +1,24 @@
+"""Add audio normalization option
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 19:13:18.269486
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('video_projects', sa.Column('normalize_audio', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('video_projects', 'normalize_audio')
@@ -0,0 +1,24 @@
+"""Add video mezzanine path
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 19:13:20.566535
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('videos', sa.Column('mezzanine_path', sa.String(length=1000), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('videos', 'mezzanine_path')
@@ -0,0 +1,47 @@
+"""Add render jobs table
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 19:13:22.651520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('render_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.Enum('PROJECT', 'BATCH', 'INGEST', name='renderjobkind'), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', name='renderjobstatus'), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('lease_owner', sa.String(length=255), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.String(length=2000), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_render_jobs_id'), 'render_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_render_jobs_lease_expires_at'), 'render_jobs', ['lease_expires_at'], unique=False)
+    op.create_index(op.f('ix_render_jobs_status'), 'render_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_render_jobs_status'), table_name='render_jobs')
+    op.drop_index(op.f('ix_render_jobs_lease_expires_at'), table_name='render_jobs')
+    op.drop_index(op.f('ix_render_jobs_id'), table_name='render_jobs')
+    op.drop_table('render_jobs')
+    sa.Enum(name='renderjobstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='renderjobkind').drop(op.get_bind(), checkfirst=True)
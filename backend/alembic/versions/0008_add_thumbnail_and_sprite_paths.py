@@ -0,0 +1,45 @@
+"""Add thumbnail and sprite paths
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 19:13:25.027389
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # ADD VALUE cannot run inside a transaction block before PostgreSQL 12
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE renderjobkind ADD VALUE IF NOT EXISTS 'THUMBNAILS'")
+    else:
+        with op.batch_alter_table('render_jobs') as batch_op:
+            batch_op.alter_column('kind',
+                existing_type=sa.Enum('PROJECT', 'BATCH', 'INGEST', name='renderjobkind'),
+                type_=sa.Enum('PROJECT', 'BATCH', 'INGEST', 'THUMBNAILS', name='renderjobkind'),
+                existing_nullable=False)
+    op.add_column('video_projects', sa.Column('thumbnail_path', sa.String(length=1000), nullable=True))
+    op.add_column('video_projects', sa.Column('sprite_path', sa.String(length=1000), nullable=True))
+    op.add_column('video_projects', sa.Column('sprite_vtt_path', sa.String(length=1000), nullable=True))
+    op.add_column('videos', sa.Column('sprite_path', sa.String(length=1000), nullable=True))
+    op.add_column('videos', sa.Column('sprite_vtt_path', sa.String(length=1000), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('videos', 'sprite_vtt_path')
+    op.drop_column('videos', 'sprite_path')
+    op.drop_column('video_projects', 'sprite_vtt_path')
+    op.drop_column('video_projects', 'sprite_path')
+    op.drop_column('video_projects', 'thumbnail_path')
+    # PostgreSQL cannot drop an enum value; queued thumbnail jobs are removed
+    # and the THUMBNAILS value stays unused
+    op.execute("DELETE FROM render_jobs WHERE kind = 'THUMBNAILS'")
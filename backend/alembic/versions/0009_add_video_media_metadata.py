@@ -0,0 +1,32 @@
+"""Add video media metadata
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16 19:13:27.275568
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('videos', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('videos', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('videos', sa.Column('fps', sa.Float(), nullable=True))
+    op.add_column('videos', sa.Column('codec', sa.String(length=50), nullable=True))
+    op.add_column('videos', sa.Column('bit_rate', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('videos', 'bit_rate')
+    op.drop_column('videos', 'codec')
+    op.drop_column('videos', 'fps')
+    op.drop_column('videos', 'height')
+    op.drop_column('videos', 'width')
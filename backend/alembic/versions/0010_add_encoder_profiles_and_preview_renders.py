@@ -0,0 +1,31 @@
+"""Add encoder profiles and preview renders
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16 19:13:29.663854
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+encoder_profile_type = sa.Enum('DRAFT', 'STANDARD', 'ARCHIVAL', name='encoderprofiletype')
+
+
+def upgrade() -> None:
+    encoder_profile_type.create(op.get_bind(), checkfirst=True)
+    op.add_column('video_projects', sa.Column('encoder_profile', encoder_profile_type, server_default='STANDARD', nullable=False))
+    op.add_column('video_projects', sa.Column('preview_path', sa.String(length=1000), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('video_projects', 'preview_path')
+    op.drop_column('video_projects', 'encoder_profile')
+    encoder_profile_type.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,24 @@
+"""Add subtitle cues
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16 19:13:31.961367
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('video_projects', sa.Column('subtitle_cues', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('video_projects', 'subtitle_cues')
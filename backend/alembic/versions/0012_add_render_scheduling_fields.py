@@ -0,0 +1,32 @@
+"""Add render scheduling fields
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-16 19:13:34.328841
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('accounts', sa.Column('render_weight', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('render_jobs', sa.Column('priority', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('render_jobs', sa.Column('account_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_render_jobs_account_id'), 'render_jobs', ['account_id'], unique=False)
+    op.create_index('ix_render_jobs_queue', 'render_jobs', ['status', 'priority', 'account_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_render_jobs_queue', table_name='render_jobs')
+    op.drop_index(op.f('ix_render_jobs_account_id'), table_name='render_jobs')
+    op.drop_column('render_jobs', 'account_id')
+    op.drop_column('render_jobs', 'priority')
+    op.drop_column('accounts', 'render_weight')
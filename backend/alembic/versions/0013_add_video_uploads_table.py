@@ -0,0 +1,42 @@
+"""Add video uploads table
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-16 19:13:36.218817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('video_uploads',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('status', sa.Enum('UPLOADING', 'COMPLETED', name='uploadstatus'), nullable=False),
+    sa.Column('title', sa.String(length=500), nullable=False),
+    sa.Column('filename', sa.String(length=500), nullable=False),
+    sa.Column('platform', sa.String(length=50), nullable=True),
+    sa.Column('account_id', sa.Integer(), nullable=True),
+    sa.Column('normalize', sa.Boolean(), nullable=True),
+    sa.Column('file_path', sa.String(length=1000), nullable=False),
+    sa.Column('length', sa.BigInteger(), nullable=False),
+    sa.Column('offset', sa.BigInteger(), nullable=False),
+    sa.Column('video_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_video_uploads_status'), 'video_uploads', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_video_uploads_status'), table_name='video_uploads')
+    op.drop_table('video_uploads')
+    sa.Enum(name='uploadstatus').drop(op.get_bind(), checkfirst=True)
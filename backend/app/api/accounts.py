@@ -8,6 +8,7 @@ from typing import List, Optional
 
 from app.database import get_db
 from app.models import Account, Platform
+from app.services.blob_store import get_blob_store
 from app.schemas import AccountCreate, AccountUpdate, AccountResponse
 
 router = APIRouter(prefix="/api/accounts", tags=["Accounts"])
@@ -176,6 +177,13 @@ async def delete_account(
     if not account:
         raise HTTPException(status_code=404, detail=f"Account with ID {account_id} not found")
 
+    # The account's videos go with it; their stored files are kept on disk
+    # (see POST /api/videos/storage/reclaim)
+    blob_store = get_blob_store()
+    for video in account.videos:
+        if video.content_hash:
+            blob_store.release(db, video.content_hash)
+
     db.delete(account)
     db.commit()
 
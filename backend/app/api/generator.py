@@ -2,21 +2,68 @@
 API router for video generation and processing.
 Handles video project CRUD and processing operations.
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+import asyncio
 
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.models import VideoProject, ProjectStatus, Account
 from app.schemas import (
     VideoProjectCreate,
     VideoProjectUpdate,
     VideoProjectResponse,
+    VideoBatchCreate,
+    VideoProjectProgress,
+    FilterPresetResponse,
     VideoProcessResponse
 )
-from app.services.video_generator import VideoGenerator
+from app.config import get_settings
+from app.services.encoder_profiles import ENCODER_PROFILES
+from app.services.filter_presets import get_filter_registry
+from app.services.render_cache import RenderCache
+from app.services.job_queue import get_job_queue
+from app.services.render_pool import get_render_pool, resolve_render_source, RenderQueueFull
+from app.services.render_worker import get_render_worker
+from app.services.workspace import scratch_usage
+from app.utils.streaming import ranged_file_response
 
 router = APIRouter(prefix="/api/generator", tags=["Video Generator"])
+settings = get_settings()
+
+
+def _validate_custom_filter(name: str) -> None:
+    """Raise 400 if a custom filter preset is not registered."""
+    if not get_filter_registry().get(name):
+        raise HTTPException(status_code=400, detail=f"Filter preset '{name}' not found")
+
+
+@router.get("/filters", response_model=List[FilterPresetResponse])
+async def get_filter_presets():
+    """
+    Get all registered filter presets.
+
+    Includes the built-in presets and custom presets loaded from the
+    presets directory.
+
+    Returns:
+        List of filter presets
+    """
+    return [preset.to_dict() for preset in get_filter_registry().presets()]
+
+
+@router.get("/encoder-profiles", response_model=List[Dict[str, Any]])
+async def get_encoder_profiles():
+    """
+    Get the available encoder profiles.
+
+    Returns:
+        List of encoder profiles with their x264 settings
+    """
+    return [profile.to_dict() for profile in ENCODER_PROFILES.values()]
 
 
 @router.post("/project", response_model=VideoProjectResponse, status_code=201)
@@ -43,6 +90,9 @@ async def create_project(
         if not account:
             raise HTTPException(status_code=404, detail=f"Account with ID {project_data.account_id} not found")
 
+    if project_data.custom_filter:
+        _validate_custom_filter(project_data.custom_filter)
+
     # Create new project
     new_project = VideoProject(**project_data.model_dump())
     db.add(new_project)
@@ -131,6 +181,9 @@ async def update_project(
         if not account:
             raise HTTPException(status_code=404, detail=f"Account with ID {update_data['account_id']} not found")
 
+    if update_data.get("custom_filter"):
+        _validate_custom_filter(update_data["custom_filter"])
+
     for field, value in update_data.items():
         setattr(project, field, value)
 
@@ -143,22 +196,27 @@ async def update_project(
 @router.post("/project/{project_id}/process", response_model=VideoProcessResponse)
 async def process_project(
     project_id: int,
-    background_tasks: BackgroundTasks,
+    priority: int = Query(0, ge=-5, le=5, description="Scheduling priority (higher renders first)"),
     db: Session = Depends(get_db)
 ):
     """
     Process a video project (add audio, filters, subtitles).
 
+    Identical renders are served from the render cache immediately.
+    Otherwise a render job is queued; the first render worker with an idle
+    process claims it and renders in that process with its own database
+    session. Jobs are scheduled by priority, then fairly between accounts.
+
     Args:
         project_id: Project ID
-        background_tasks: FastAPI background tasks
+        priority: Scheduling priority
         db: Database session
 
     Returns:
         Processing status
 
     Raises:
-        HTTPException: If project not found or not processable
+        HTTPException: If project not found, not processable or the render queue is full
     """
     project = db.query(VideoProject).filter(VideoProject.id == project_id).first()
     if not project:
@@ -170,35 +228,38 @@ async def process_project(
             detail=f"Project cannot be processed. Current status: {project.status.value}"
         )
 
-    # Set status to processing
-    project.status = ProjectStatus.PROCESSING
-    project.error_message = None
-    db.commit()
-
-    # Process in background
-    def process_video_task():
-        try:
-            generator = VideoGenerator()
-            output_path = generator.composite_video(
-                video_path=project.video_track_path,
-                audio_path=project.audio_track_path,
-                subtitle_text=project.subtitle_text,
-                volume=project.audio_volume,
-                filter_type=project.filter_type.value,
-                uniquify=project.uniquify_subtitles
-            )
+    # Serve identical renders from the cache
+    cache_key = None
+    if settings.RENDER_CACHE_ENABLED:
+        cache = RenderCache()
+        source_path = resolve_render_source(db, project.video_track_path)
+        cache_key = await run_in_threadpool(cache.key_for_project, project, source_path)
+        cached_output = await run_in_threadpool(cache.checkout, cache_key) if cache_key else None
 
-            # Update project
-            project.output_path = output_path
+        if cached_output:
+            project.output_path = cached_output
             project.status = ProjectStatus.COMPLETED
+            project.error_message = None
+            get_job_queue().enqueue_thumbnails(db, project_ids=[project_id])
             db.commit()
 
-        except Exception as e:
-            project.status = ProjectStatus.FAILED
-            project.error_message = str(e)
-            db.commit()
+            return VideoProcessResponse(
+                success=True,
+                message="Video served from render cache",
+                project_id=project_id,
+                output_path=cached_output
+            )
 
-    background_tasks.add_task(process_video_task)
+    # Queue the render; the status change and the job commit together
+    try:
+        get_job_queue().enqueue_project(db, project_id, cache_key, project.account_id, priority)
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    project.status = ProjectStatus.PROCESSING
+    project.error_message = None
+    project.reset_progress()
+    db.commit()
 
     return VideoProcessResponse(
         success=True,
@@ -207,6 +268,319 @@ async def process_project(
     )
 
 
+@router.post("/project/{project_id}/preview", response_model=VideoProcessResponse)
+async def preview_project(
+    project_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Render a quick low-resolution preview of a project.
+
+    Uses the draft encoder profile (first PREVIEW_DURATION seconds at
+    PREVIEW_HEIGHT, ultrafast preset) and waits for the result. The
+    project's status and output are not changed, so previews can be
+    rendered at any time while iterating on filters and subtitles.
+
+    Args:
+        project_id: Project ID
+        db: Database session
+
+    Returns:
+        Preview render result
+
+    Raises:
+        HTTPException: If project not found, the render pool is full or the render fails
+    """
+    project = db.query(VideoProject).filter(VideoProject.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+
+    # Previews skip the durable queue: they are short, interactive and
+    # not worth retrying on another node
+    try:
+        future = get_render_pool().submit_preview(project_id)
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    try:
+        preview_path = await asyncio.wrap_future(future)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Preview render failed: {str(e)}")
+
+    return VideoProcessResponse(
+        success=True,
+        message="Preview rendered",
+        project_id=project_id,
+        output_path=preview_path
+    )
+
+
+def _project_progress(project: VideoProject) -> VideoProjectProgress:
+    """Build a progress event payload for a project."""
+    return VideoProjectProgress(
+        project_id=project.id,
+        status=project.status,
+        progress=project.progress,
+        render_fps=project.render_fps,
+        render_speed=project.render_speed,
+        eta_seconds=project.eta_seconds,
+        error_message=project.error_message
+    )
+
+
+@router.get("/project/{project_id}/progress")
+async def stream_project_progress(
+    project_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Stream render progress as server-sent events.
+
+    Emits a ``progress`` event whenever the stored progress changes and a
+    final ``done`` event once the project leaves the processing state.
+
+    Args:
+        project_id: Project ID
+        db: Database session
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        HTTPException: If project not found
+    """
+    project = db.query(VideoProject).filter(VideoProject.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+
+    async def event_stream():
+        # The request session is released once the handler returns,
+        # so the stream polls with its own session
+        stream_db = SessionLocal()
+        last_payload = None
+        try:
+            while True:
+                stream_db.expire_all()
+                current = stream_db.query(VideoProject).filter(VideoProject.id == project_id).first()
+                if not current:
+                    break
+
+                payload = _project_progress(current).model_dump_json()
+                if payload != last_payload:
+                    yield f"event: progress\ndata: {payload}\n\n"
+                    last_payload = payload
+
+                if current.status != ProjectStatus.PROCESSING:
+                    yield f"event: done\ndata: {payload}\n\n"
+                    break
+
+                await asyncio.sleep(settings.RENDER_PROGRESS_INTERVAL)
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _preview_response(file_path: Optional[str], media_type: str, detail: str) -> FileResponse:
+    """Serve a generated preview file, or 404 if it is not ready."""
+    if not file_path or not Path(file_path).exists():
+        raise HTTPException(status_code=404, detail=detail)
+    return FileResponse(file_path, media_type=media_type, headers={"Cache-Control": "public, max-age=86400"})
+
+
+@router.get("/project/{project_id}/thumbnail")
+async def get_project_thumbnail(
+    project_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the poster frame of a project's rendered output.
+
+    Args:
+        project_id: Project ID
+        db: Database session
+
+    Returns:
+        JPEG image
+
+    Raises:
+        HTTPException: If project not found or the thumbnail is not generated yet
+    """
+    project = db.query(VideoProject).filter(VideoProject.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+
+    return _preview_response(project.thumbnail_path, "image/jpeg", "Thumbnail not available yet")
+
+
+@router.get("/project/{project_id}/preview.vtt")
+async def get_project_preview_index(
+    project_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the WebVTT index of the output's scrub-preview sprite.
+
+    Args:
+        project_id: Project ID
+        db: Database session
+
+    Returns:
+        WebVTT file with cues pointing at tiles of ``sprite.jpg``
+
+    Raises:
+        HTTPException: If project not found or the sprite is not generated yet
+    """
+    project = db.query(VideoProject).filter(VideoProject.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+
+    return _preview_response(project.sprite_vtt_path, "text/vtt", "Preview sprite not available yet")
+
+
+@router.get("/project/{project_id}/sprite.jpg")
+async def get_project_preview_sprite(
+    project_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the scrub-preview sprite sheet of a project's rendered output.
+
+    Args:
+        project_id: Project ID
+        db: Database session
+
+    Returns:
+        JPEG image
+
+    Raises:
+        HTTPException: If project not found or the sprite is not generated yet
+    """
+    project = db.query(VideoProject).filter(VideoProject.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+
+    return _preview_response(project.sprite_path, "image/jpeg", "Preview sprite not available yet")
+
+
+@router.post("/batch", response_model=List[VideoProjectResponse], status_code=201)
+async def create_batch(
+    batch_data: VideoBatchCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create and render several variants of one source video.
+
+    One project is created per variant. Variants already in the render
+    cache complete immediately; the rest are rendered together in a single
+    FFmpeg process that decodes the source once and splits its frames
+    across the variant encodes.
+
+    Args:
+        batch_data: Source video, shared audio and per-variant settings
+        db: Database session
+
+    Returns:
+        Created variant projects
+
+    Raises:
+        HTTPException: If a target account is not found or the render queue is full
+    """
+    # Validate target accounts
+    account_ids = {variant.account_id for variant in batch_data.variants if variant.account_id}
+    if account_ids:
+        found_ids = {row.id for row in db.query(Account.id).filter(Account.id.in_(account_ids)).all()}
+        missing_ids = account_ids - found_ids
+        if missing_ids:
+            raise HTTPException(status_code=404, detail=f"Account with ID {min(missing_ids)} not found")
+
+    for variant in batch_data.variants:
+        if variant.custom_filter:
+            _validate_custom_filter(variant.custom_filter)
+
+    # Create one project per variant
+    projects = [
+        VideoProject(
+            name=f"{batch_data.name} #{index}",
+            status=ProjectStatus.PROCESSING,
+            video_track_path=batch_data.video_track_path,
+            audio_track_path=batch_data.audio_track_path,
+            audio_volume=batch_data.audio_volume,
+            normalize_audio=batch_data.normalize_audio,
+            encoder_profile=batch_data.encoder_profile,
+            filter_type=variant.filter_type,
+            custom_filter=variant.custom_filter,
+            subtitle_text=variant.subtitle_text,
+            subtitle_cues=[cue.model_dump() for cue in variant.subtitle_cues] if variant.subtitle_cues else None,
+            uniquify_subtitles=variant.uniquify_subtitles,
+            account_id=variant.account_id
+        )
+        for index, variant in enumerate(batch_data.variants, start=1)
+    ]
+    db.add_all(projects)
+    db.commit()
+
+    # Serve identical variants from the cache
+    pending = []
+    cache = RenderCache() if settings.RENDER_CACHE_ENABLED else None
+    source_path = resolve_render_source(db, batch_data.video_track_path)
+    for project in projects:
+        cached_output = None
+        if cache:
+            cache_key = await run_in_threadpool(cache.key_for_project, project, source_path)
+            cached_output = await run_in_threadpool(cache.checkout, cache_key) if cache_key else None
+
+        if cached_output:
+            project.output_path = cached_output
+            project.status = ProjectStatus.COMPLETED
+        else:
+            pending.append(project)
+
+    # Render the remaining variants with a shared decode
+    if pending:
+        try:
+            # The batch is one job, scheduled under its first variant's account
+            get_job_queue().enqueue_batch(
+                db, [project.id for project in pending], pending[0].account_id, batch_data.priority
+            )
+        except RenderQueueFull as e:
+            for project in pending:
+                project.status = ProjectStatus.DRAFT
+            db.commit()
+            raise HTTPException(status_code=503, detail=str(e))
+
+    cached = [project.id for project in projects if project.status == ProjectStatus.COMPLETED]
+    get_job_queue().enqueue_thumbnails(db, project_ids=cached)
+
+    db.commit()
+    for project in projects:
+        db.refresh(project)
+
+    return projects
+
+
+@router.get("/render/stats", response_model=Dict[str, Any])
+async def get_render_stats():
+    """
+    Get render job queue, worker pool, render cache and scratch space usage.
+
+    Returns:
+        Job counts by status, queue depth and wait times per account, worker
+        slot usage, cache size, scratch disk usage
+    """
+    stats = get_render_pool().stats()
+    stats["jobs"] = await run_in_threadpool(get_job_queue().stats)
+    stats["accounts"] = await run_in_threadpool(get_job_queue().account_stats)
+    stats["worker"] = get_render_worker().stats() if settings.RENDER_WORKER_ENABLED else None
+    stats["cache"] = await run_in_threadpool(RenderCache().stats)
+    stats["scratch"] = await run_in_threadpool(scratch_usage)
+    return stats
+
+
 @router.post("/project/{project_id}/export", response_model=VideoProcessResponse)
 async def export_project(
     project_id: int,
@@ -243,6 +617,44 @@ async def export_project(
     )
 
 
+@router.api_route("/project/{project_id}/output", methods=["GET", "HEAD"])
+async def stream_project_output(
+    project_id: int,
+    request: Request,
+    download: bool = Query(False, description="Send as an attachment instead of inline"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the rendered video of a completed project.
+
+    Supports Range requests (206) for preview and seeking, and ETag /
+    Last-Modified validators; see ``ranged_file_response``.
+
+    Args:
+        project_id: Project ID
+        request: Incoming request
+        download: Send as an attachment
+        db: Database session
+
+    Returns:
+        Rendered video or byte range
+
+    Raises:
+        HTTPException: If project not found, not completed or output missing
+    """
+    project = db.query(VideoProject).filter(VideoProject.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+
+    if not project.is_completed or not project.output_path:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Project is not completed. Current status: {project.status.value}"
+        )
+
+    return await ranged_file_response(request, project.output_path, media_type="video/mp4", download=download)
+
+
 @router.delete("/project/{project_id}", status_code=204)
 async def delete_project(
     project_id: int,
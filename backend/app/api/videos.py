@@ -2,20 +2,39 @@
 API router for video management.
 Handles video listing and upload operations.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
-import shutil
-import uuid
+import logging
 
 from app.database import get_db
-from app.models import Video, Account
-from app.schemas import VideoCreate, VideoResponse
+from app.models import Video, VideoProject, Account, VideoUpload, UploadStatus, VideoBlob
+from app.schemas import VideoCreate, VideoResponse, VideoUploadResponse
 from app.config import get_settings
+from app.services.blob_store import get_blob_store
+from app.services.job_queue import get_job_queue
+from app.services.media_probe import apply_media_info, backfill_media_info, get_media_info
+from app.services.render_pool import RenderQueueFull
+from app.services.storage import get_storage
+from app.services.video_stats import StatsPayloadError, ingest_video_stats
+from app.utils.streaming import ranged_file_response
+from app.services.uploads import (
+    UploadBusy,
+    UploadOffsetMismatch,
+    UploadTooLarge,
+    create_upload,
+    lock_upload,
+    release_upload,
+    upload_digest,
+    write_chunk,
+)
 
 router = APIRouter(prefix="/api/videos", tags=["Videos"])
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 @router.get("/", response_model=List[VideoResponse])
@@ -71,22 +90,144 @@ async def get_video(
     return video
 
 
+def _preview_response(file_path: Optional[str], media_type: str, detail: str) -> FileResponse:
+    """Serve a generated preview file, or 404 if it is not ready."""
+    if not file_path or not Path(file_path).exists():
+        raise HTTPException(status_code=404, detail=detail)
+    return FileResponse(file_path, media_type=media_type, headers={"Cache-Control": "public, max-age=86400"})
+
+
+@router.api_route("/{video_id}/stream", methods=["GET", "HEAD"])
+async def stream_video(
+    video_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Stream a video's uploaded file for in-browser playback and seeking.
+
+    Supports Range requests (206), ETag (the content hash) and
+    Last-Modified validators; see ``ranged_file_response``.
+
+    Args:
+        video_id: Video ID
+        request: Incoming request
+        db: Database session
+
+    Returns:
+        Video file or byte range
+
+    Raises:
+        HTTPException: If video or file not found, or range not satisfiable
+    """
+    video = db.query(Video).filter(Video.id == video_id).first()
+    if not video:
+        raise HTTPException(status_code=404, detail=f"Video with ID {video_id} not found")
+
+    storage = get_storage()
+    file_path = await storage.run(storage.localize, video.file_path)
+    return await ranged_file_response(request, file_path, etag=video.content_hash)
+
+
+@router.get("/{video_id}/thumbnail")
+async def get_video_thumbnail(
+    video_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the poster frame of a video.
+
+    Args:
+        video_id: Video ID
+        db: Database session
+
+    Returns:
+        JPEG image
+
+    Raises:
+        HTTPException: If video not found or the thumbnail is not generated yet
+    """
+    video = db.query(Video).filter(Video.id == video_id).first()
+    if not video:
+        raise HTTPException(status_code=404, detail=f"Video with ID {video_id} not found")
+
+    return _preview_response(video.thumbnail_path, "image/jpeg", "Thumbnail not available yet")
+
+
+@router.get("/{video_id}/preview.vtt")
+async def get_video_preview_index(
+    video_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the WebVTT index of a video's scrub-preview sprite.
+
+    Each cue points at a tile of ``sprite.jpg`` (relative to this URL)
+    with a ``#xywh=`` fragment.
+
+    Args:
+        video_id: Video ID
+        db: Database session
+
+    Returns:
+        WebVTT file
+
+    Raises:
+        HTTPException: If video not found or the sprite is not generated yet
+    """
+    video = db.query(Video).filter(Video.id == video_id).first()
+    if not video:
+        raise HTTPException(status_code=404, detail=f"Video with ID {video_id} not found")
+
+    return _preview_response(video.sprite_vtt_path, "text/vtt", "Preview sprite not available yet")
+
+
+@router.get("/{video_id}/sprite.jpg")
+async def get_video_preview_sprite(
+    video_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the scrub-preview sprite sheet of a video.
+
+    Args:
+        video_id: Video ID
+        db: Database session
+
+    Returns:
+        JPEG image
+
+    Raises:
+        HTTPException: If video not found or the sprite is not generated yet
+    """
+    video = db.query(Video).filter(Video.id == video_id).first()
+    if not video:
+        raise HTTPException(status_code=404, detail=f"Video with ID {video_id} not found")
+
+    return _preview_response(video.sprite_path, "image/jpeg", "Preview sprite not available yet")
+
+
 @router.post("/upload", response_model=VideoResponse, status_code=201)
 async def upload_video(
     file: UploadFile = File(..., description="Video file to upload"),
     title: str = Query(..., description="Video title"),
     account_id: Optional[int] = Query(None, description="Associated account ID"),
     platform: Optional[str] = Query(None, description="Platform name"),
+    normalize: Optional[bool] = Query(None, description="Transcode to mezzanine format (default: MEZZANINE_ENABLED)"),
     db: Session = Depends(get_db)
 ):
     """
     Upload a video file.
 
+    When mezzanine normalization is enabled, the upload is queued for a
+    one-time transcode into the house mezzanine format on the render pool.
+
     Args:
         file: Video file
         title: Video title
         account_id: Associated account ID (optional)
         platform: Platform name (optional)
+        normalize: Queue mezzanine transcoding (optional)
         db: Database session
 
     Returns:
@@ -95,16 +236,11 @@ async def upload_video(
     Raises:
         HTTPException: If account not found or file too large
     """
-    # Validate account if provided
-    if account_id:
-        account = db.query(Account).filter(Account.id == account_id).first()
-        if not account:
-            raise HTTPException(status_code=404, detail=f"Account with ID {account_id} not found")
+    _check_account(db, account_id)
+    storage = get_storage()
 
-    # Validate file size
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
+    # Validate file size (the spooled upload may be on disk)
+    file_size = await storage.run(_file_size, file.file)
 
     if file_size > settings.MAX_UPLOAD_SIZE:
         raise HTTPException(
@@ -112,36 +248,455 @@ async def upload_video(
             detail=f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE / (1024*1024)} MB"
         )
 
-    # Generate unique filename
-    file_extension = Path(file.filename).suffix
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    upload_path = Path(settings.UPLOAD_DIR) / "videos" / unique_filename
-
-    # Save file
+    # Save file off the event loop, hashed on the way; identical content
+    # resolves to the blob already stored
     try:
-        upload_path.parent.mkdir(parents=True, exist_ok=True)
-        with upload_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        blob = await get_blob_store().ingest(db, file.file, Path(file.filename).suffix)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
-    # Create video record
+    video = await _register_video(db, title, blob, account_id, platform, normalize)
+    db.commit()
+    db.refresh(video)
+    return video
+
+
+def _file_size(fileobj) -> int:
+    """Get the size of a file object, leaving it at the start."""
+    fileobj.seek(0, 2)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+def _check_account(db: Session, account_id: Optional[int]) -> None:
+    """Raise 404 if an account ID is given but does not exist."""
+    if account_id:
+        account = db.query(Account).filter(Account.id == account_id).first()
+        if not account:
+            raise HTTPException(status_code=404, detail=f"Account with ID {account_id} not found")
+
+
+async def _register_video(
+    db: Session,
+    title: str,
+    blob: VideoBlob,
+    account_id: Optional[int],
+    platform: Optional[str],
+    normalize: Optional[bool]
+) -> Video:
+    """
+    Create the video record of a stored upload and queue its ingest jobs.
+
+    An upload deduplicated to a stored blob takes the metadata, mezzanine
+    and previews of a video with the same content instead of probing and
+    queuing the same work again. Everything happens in the caller's
+    transaction; the caller commits.
+
+    Args:
+        db: Database session
+        title: Video title
+        blob: Stored file, already referenced in this session
+        account_id: Associated account ID (optional)
+        platform: Platform name (optional)
+        normalize: Queue mezzanine transcoding (optional)
+
+    Returns:
+        Created video record
+    """
     video_data = VideoCreate(
         title=title,
-        file_path=str(upload_path),
-        size=file_size,
+        file_path=blob.file_path,
+        size=blob.size,
         account_id=account_id,
         platform=platform
     )
 
     new_video = Video(**video_data.model_dump())
+    new_video.content_hash = blob.sha256
+    file_path = blob.file_path
+
+    # Prefer the copy that got furthest through ingest
+    existing = db.query(Video).filter(Video.content_hash == blob.sha256).order_by(
+        Video.mezzanine_path.is_(None), Video.thumbnail_path.is_(None), Video.duration.is_(None)
+    ).first()
+
+    # Store duration, resolution and codec so nothing has to probe the file again
+    if existing and existing.duration:
+        for column in (Video.duration, Video.width, Video.height, Video.fps, Video.codec, Video.bit_rate):
+            setattr(new_video, column.key, getattr(existing, column.key))
+    else:
+        try:
+            apply_media_info(new_video, await run_in_threadpool(get_media_info, file_path))
+        except Exception as e:
+            logger.warning(f"Could not probe uploaded video {file_path}: {e}")
+
     db.add(new_video)
-    db.commit()
-    db.refresh(new_video)
+    db.flush()
+
+    # Queue mezzanine ingest
+    if settings.MEZZANINE_ENABLED if normalize is None else normalize:
+        if existing and existing.mezzanine_path:
+            new_video.mezzanine_path = existing.mezzanine_path
+        else:
+            try:
+                get_job_queue().enqueue_ingest(db, new_video.id, new_video.account_id)
+            except RenderQueueFull:
+                logger.warning(f"Render queue full, video {new_video.id} uploaded without mezzanine")
+
+    # Queue poster and preview sprite generation
+    if existing and existing.thumbnail_path:
+        for column in (Video.thumbnail_path, Video.sprite_path, Video.sprite_vtt_path):
+            setattr(new_video, column.key, getattr(existing, column.key))
+    else:
+        get_job_queue().enqueue_thumbnails(db, video_ids=[new_video.id])
 
     return new_video
 
 
+def _get_upload(db: Session, upload_id: str) -> VideoUpload:
+    """Get an upload session or raise 404."""
+    upload = db.query(VideoUpload).filter(VideoUpload.id == upload_id).first()
+    if not upload:
+        raise HTTPException(status_code=404, detail=f"Upload {upload_id} not found")
+    return upload
+
+
+def _lock_upload(db: Session, upload_id: str) -> VideoUpload:
+    """Lock an upload session, or raise 404 (not found) or 409 (receiving a chunk)."""
+    try:
+        upload = lock_upload(db, upload_id)
+    except UploadBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not upload:
+        raise HTTPException(status_code=404, detail=f"Upload {upload_id} not found")
+    return upload
+
+
+def _upload_headers(upload: VideoUpload) -> Dict[str, str]:
+    """Get the offset headers clients resume from."""
+    return {
+        "Upload-Offset": str(upload.offset),
+        "Upload-Length": str(upload.length),
+        "Cache-Control": "no-store",
+    }
+
+
+@router.post("/uploads", response_model=VideoUploadResponse, status_code=201)
+async def start_upload(
+    response: Response,
+    upload_length: int = Header(..., ge=1, alias="Upload-Length", description="Total file size in bytes"),
+    title: str = Query(..., description="Video title"),
+    filename: str = Query(..., description="Original file name"),
+    account_id: Optional[int] = Query(None, description="Associated account ID"),
+    platform: Optional[str] = Query(None, description="Platform name"),
+    normalize: Optional[bool] = Query(None, description="Transcode to mezzanine format (default: MEZZANINE_ENABLED)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Start a resumable upload.
+
+    The file is then sent with ``PATCH /uploads/{id}`` in one or more
+    chunks and turned into a video with ``POST /uploads/{id}/finalize``.
+
+    Args:
+        response: Response (gets Location and offset headers)
+        upload_length: Total file size in bytes
+        title: Video title
+        filename: Original file name
+        account_id: Associated account ID (optional)
+        platform: Platform name (optional)
+        normalize: Queue mezzanine transcoding on finalize (optional)
+        db: Database session
+
+    Returns:
+        Created upload session
+
+    Raises:
+        HTTPException: If account not found or file too large
+    """
+    _check_account(db, account_id)
+
+    try:
+        upload = await create_upload(db, title, filename, upload_length, account_id, platform, normalize)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    response.headers["Location"] = f"{router.prefix}/uploads/{upload.id}"
+    response.headers.update(_upload_headers(upload))
+    return upload
+
+
+@router.head("/uploads/{upload_id}")
+async def get_upload_offset(
+    upload_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Get how many bytes of an upload have been received.
+
+    Clients resuming an interrupted upload continue from ``Upload-Offset``.
+
+    Args:
+        upload_id: Upload ID
+        db: Database session
+
+    Returns:
+        Empty response with Upload-Offset and Upload-Length headers
+
+    Raises:
+        HTTPException: If upload not found
+    """
+    upload = _get_upload(db, upload_id)
+    return Response(status_code=200, headers=_upload_headers(upload))
+
+
+@router.get("/uploads/{upload_id}", response_model=VideoUploadResponse)
+async def get_upload(
+    upload_id: str,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a resumable upload session.
+
+    Args:
+        upload_id: Upload ID
+        response: Response (gets offset headers)
+        db: Database session
+
+    Returns:
+        Upload session
+
+    Raises:
+        HTTPException: If upload not found
+    """
+    upload = _get_upload(db, upload_id)
+    response.headers.update(_upload_headers(upload))
+    return upload
+
+
+@router.patch("/uploads/{upload_id}", status_code=204)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., ge=0, alias="Upload-Offset", description="Offset the chunk starts at"),
+    db: Session = Depends(get_db)
+):
+    """
+    Append a chunk to a resumable upload.
+
+    The raw request body is written straight into the destination file at
+    ``Upload-Offset``, which must equal the bytes received so far. Bytes
+    received before a dropped connection are kept.
+
+    Args:
+        upload_id: Upload ID
+        request: Request whose body is the chunk
+        upload_offset: Offset the chunk starts at
+        db: Database session
+
+    Returns:
+        Empty response with the new Upload-Offset header
+
+    Raises:
+        HTTPException: If upload not found or finished (404/400), the offset
+            is wrong or another chunk is being written (409), or the chunk
+            runs past the declared length (413)
+    """
+    upload = _get_upload(db, upload_id)
+    if upload.status != UploadStatus.UPLOADING:
+        raise HTTPException(status_code=400, detail=f"Upload {upload_id} is already finalized")
+
+    # Refuse an oversized chunk before reading any of it
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and upload_offset + int(content_length) > upload.length:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Upload exceeds its declared length of {upload.length} bytes",
+            headers=_upload_headers(upload)
+        )
+
+    try:
+        await write_chunk(db, upload, upload_offset, request.stream())
+    except (UploadOffsetMismatch, UploadBusy) as e:
+        raise HTTPException(status_code=409, detail=str(e), headers=_upload_headers(upload))
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e), headers=_upload_headers(upload))
+
+    return Response(status_code=204, headers=_upload_headers(upload))
+
+
+@router.post("/uploads/{upload_id}/finalize", response_model=VideoResponse, status_code=201)
+async def finalize_upload(
+    upload_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Turn a fully received upload into a video.
+
+    The file is renamed into the content-addressed store (or dropped if
+    that content is already stored, using the hash computed while the
+    chunks arrived), then probed and registered with ingest jobs queued as
+    ``POST /upload`` does. Finalizing again returns the same video. If
+    registering fails, the file is put back and the upload can be
+    finalized again.
+
+    Args:
+        upload_id: Upload ID
+        db: Database session
+
+    Returns:
+        Created video record
+
+    Raises:
+        HTTPException: If upload not found or not fully received, or the
+            video could not be registered
+    """
+    upload = _lock_upload(db, upload_id)
+
+    if upload.status == UploadStatus.COMPLETED:
+        video = db.query(Video).filter(Video.id == upload.video_id).first()
+        if not video:
+            raise HTTPException(status_code=404, detail=f"Video of upload {upload_id} was deleted")
+        return video
+
+    if not upload.is_complete:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload incomplete: {upload.offset} of {upload.length} bytes received",
+            headers=_upload_headers(upload)
+        )
+
+    # Claim the upload so a concurrent finalize cannot consume the file twice
+    claimed = db.query(VideoUpload).filter(
+        VideoUpload.id == upload.id,
+        VideoUpload.status == UploadStatus.UPLOADING
+    ).update({VideoUpload.status: UploadStatus.COMPLETED}, synchronize_session=False)
+    if not claimed:
+        raise HTTPException(status_code=409, detail=f"Upload {upload_id} is being finalized")
+
+    blob_store = get_blob_store()
+    upload_path = upload.file_path
+    suffix = Path(upload.filename).suffix
+    sha256 = await upload_digest(upload)
+
+    # The upload, blob reference and video commit together; on failure the
+    # file goes back where the upload expects it
+    try:
+        blob = await blob_store.add(db, upload_path, sha256, upload.length, suffix)
+        video = await _register_video(db, upload.title, blob, upload.account_id, upload.platform, upload.normalize)
+
+        upload.status = UploadStatus.COMPLETED
+        upload.file_path = blob.file_path
+        upload.video_id = video.id
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        await blob_store.restore(db, upload_path, sha256, suffix)
+        logger.error(f"Finalizing upload {upload_id} failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to finalize upload: {str(e)}")
+
+    await blob_store.discard(blob, upload_path)
+    release_upload(upload_id)
+
+    db.refresh(video)
+    return video
+
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+async def cancel_upload(
+    upload_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Abort an unfinished upload and delete the received bytes.
+
+    Args:
+        upload_id: Upload ID
+        db: Database session
+
+    Raises:
+        HTTPException: If upload not found or already finalized
+    """
+    upload = _lock_upload(db, upload_id)
+    if upload.status != UploadStatus.UPLOADING:
+        raise HTTPException(status_code=400, detail=f"Upload {upload_id} is already finalized")
+
+    await get_storage().delete(upload.file_path)
+    release_upload(upload.id)
+    db.delete(upload)
+    db.commit()
+
+    return None
+
+
+@router.post("/stats:bulk", response_model=Dict[str, int])
+async def bulk_update_video_stats(request: Request) -> Dict[str, Any]:
+    """
+    Store scraped views, likes and comments for many videos at once.
+
+    The body is either a JSON array of ``{"video_id", "views", "likes",
+    "comments"}`` objects or NDJSON (one object per line, sent as
+    ``application/x-ndjson``). Omitted counters keep their stored value and
+    engagement_rate is recomputed in SQL. Rows are applied with set-based
+    SQL (COPY into a staging table plus UPDATE ... FROM on PostgreSQL) in
+    one transaction, off the event loop.
+
+    Args:
+        request: Request with the statistics payload
+
+    Returns:
+        Number of received, updated and missing (unknown video) rows
+
+    Raises:
+        HTTPException: If the payload is invalid (nothing is applied)
+    """
+    payload = await request.body()
+    content_type = request.headers.get("content-type", "")
+    ndjson = "ndjson" in content_type or "jsonl" in content_type or not payload.lstrip().startswith(b"[")
+
+    try:
+        return await run_in_threadpool(ingest_video_stats, payload, ndjson)
+    except StatsPayloadError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post("/metadata/backfill", response_model=Dict[str, int])
+async def backfill_video_metadata(
+    force: bool = Query(False, description="Re-probe videos that already have metadata"),
+    video_ids: Optional[List[int]] = Query(None, description="Limit to these video IDs")
+) -> Dict[str, Any]:
+    """
+    Probe stored videos and save their duration, resolution and codec.
+
+    Videos are probed in parallel (PROBE_WORKERS); probe results are cached,
+    so unchanged files are not probed again.
+
+    Args:
+        force: Re-probe videos that already have a duration
+        video_ids: Limit to these video IDs
+
+    Returns:
+        Number of updated, failed and skipped videos
+    """
+    return await run_in_threadpool(backfill_media_info, video_ids, force)
+
+
+@router.post("/storage/reclaim", response_model=Dict[str, int])
+async def reclaim_video_storage() -> Dict[str, int]:
+    """
+    Delete stored videos that no video references anymore.
+
+    Such blobs are left by deletions without ``delete_file`` (and by a
+    crash between a deletion and the removal of its files).
+
+    Returns:
+        Number of deleted blobs
+    """
+    return {"purged": await get_blob_store().purge_unreferenced()}
+
+
 @router.delete("/{video_id}", status_code=204)
 async def delete_video(
     video_id: int,
@@ -151,9 +706,15 @@ async def delete_video(
     """
     Delete a video.
 
+    The video's blob reference is always dropped. Files are only removed
+    with ``delete_file``, after the deletion commits: the stored content
+    once no other video references it, and the mezzanine copy and previews
+    no other video uses. Without it, a blob left without references stays
+    on disk until ``POST /storage/reclaim``.
+
     Args:
         video_id: Video ID
-        delete_file: Whether to delete the physical file
+        delete_file: Whether to delete the video's files
         db: Database session
 
     Raises:
@@ -163,22 +724,49 @@ async def delete_video(
     if not video:
         raise HTTPException(status_code=404, detail=f"Video with ID {video_id} not found")
 
-    # Delete physical file if requested
+    # Drop the video's reference to its blob; content shared with other
+    # videos stays until the last one goes
+    content_hash = video.content_hash
+    blob_released = bool(content_hash) and get_blob_store().release(db, content_hash)
+
+    # Collect the files only this video uses while its row still exists
+    doomed = []
     if delete_file:
-        try:
-            file_path = Path(video.file_path)
-            if file_path.exists():
-                file_path.unlink()
-
-            if video.thumbnail_path:
-                thumb_path = Path(video.thumbnail_path)
-                if thumb_path.exists():
-                    thumb_path.unlink()
-        except Exception as e:
-            # Log error but don't fail the deletion
-            print(f"Warning: Could not delete file {video.file_path}: {str(e)}")
+        if not content_hash:
+            doomed.append(video.file_path)
+
+        # The mezzanine is named after the source file, so deduplicated videos share it
+        if video.mezzanine_path and not db.query(Video.id).filter(
+            Video.mezzanine_path == video.mezzanine_path, Video.id != video.id
+        ).first():
+            doomed.append(video.mezzanine_path)
+
+        # Previews are cached by content hash and may be shared with other rows
+        for column in (Video.thumbnail_path, Video.sprite_path, Video.sprite_vtt_path):
+            preview_path = getattr(video, column.key)
+            if not preview_path:
+                continue
+            project_column = getattr(VideoProject, column.key)
+            shared = (
+                db.query(Video.id).filter(column == preview_path, Video.id != video.id).first()
+                or db.query(VideoProject.id).filter(project_column == preview_path).first()
+            )
+            if not shared:
+                doomed.append(preview_path)
 
     db.delete(video)
     db.commit()
 
+    # Only delete files once the row is gone; a failed commit keeps them
+    if delete_file and blob_released:
+        await get_blob_store().purge(db, content_hash)
+
+    storage = get_storage()
+    for path in doomed:
+        try:
+            await storage.delete(path)
+        except Exception as e:
+            # Log error but don't fail the deletion
+            logger.warning(f"Could not delete file {path}: {e}")
+
     return None
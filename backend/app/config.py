@@ -21,6 +21,81 @@ class Settings(BaseSettings):
     # File Storage
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 500 * 1024 * 1024  # 500MB
+    UPLOAD_SESSION_MAX_AGE: float = 24 * 60 * 60  # Drop unfinished resumable uploads idle this long (seconds)
+    STORAGE_BACKEND: str = "local"  # local, or s3 to mirror uploads to an S3-compatible bucket
+    STORAGE_IO_WORKERS: int = 4  # Threads moving upload bytes off the event loop
+    S3_ENDPOINT_URL: str = ""  # e.g. http://localhost:9000 for MinIO (default: AWS)
+    S3_BUCKET: str = ""
+    S3_PREFIX: str = ""  # Prepended to object keys, e.g. admin-panel/
+    S3_ACCESS_KEY: str = ""
+    S3_SECRET_KEY: str = ""
+    S3_REGION: str = "us-east-1"
+    STREAM_ACCEL_REDIRECT_PREFIX: str = ""  # nginx internal location serving UPLOAD_DIR, e.g. /protected (empty = stream from the app)
+
+    # Rendering
+    RENDER_MAX_WORKERS: int = 2  # Concurrent render processes
+    RENDER_QUEUE_SIZE: int = 50  # Render jobs allowed to wait for a worker
+    RENDER_THREADS_PER_JOB: int = 0  # x264 threads per render (0 = split render cores between workers)
+    RENDER_RESERVED_CORES: int = 1  # Cores left to the API and database
+    RENDER_JOB_MEMORY_MB: int = 1024  # Memory a render needs before it is admitted
+    RENDER_MEMORY_RESERVE_MB: int = 512  # Memory always left free for the rest of the host
+    RENDER_NICE: int = 10  # Niceness added to render processes (0 = unchanged)
+    RENDER_IONICE_CLASS: int = 2  # ionice class for renders: 2 best-effort, 3 idle (0 = unchanged)
+    RENDER_IONICE_LEVEL: int = 7  # ionice level within the best-effort class (0-7)
+    RENDER_PROGRESS_INTERVAL: float = 1.0  # Seconds between progress updates
+    RENDER_WORKER_ENABLED: bool = True  # Run a render worker inside the API process
+    RENDER_JOB_LEASE_SECONDS: float = 60.0  # Lease lifetime without a heartbeat
+    RENDER_JOB_MAX_ATTEMPTS: int = 3  # Claims per job before it fails for good
+    RENDER_JOB_POLL_INTERVAL: float = 1.0  # Seconds between queue polls
+    RENDER_JOB_AGING_SECONDS: float = 300.0  # Waiting this long raises a job's priority by one (0 = off)
+    RENDER_FAIR_SHARE_WINDOW: float = 3600.0  # Seconds of render history used to share workers between accounts
+    SEGMENT_RENDER_MIN_DURATION: float = 120.0  # Auto segment-parallel above this (0 = off)
+    SEGMENT_RENDER_LENGTH: float = 20.0  # Target segment length in seconds
+    SEGMENT_RENDER_WORKERS: int = 0  # Parallel segment encodes (0 = CPU count)
+    RENDER_SCRATCH_DIR: str = ""  # Job scratch space, e.g. /dev/shm/renders (default: UPLOAD_DIR/scratch)
+    RENDER_SCRATCH_MAX_AGE: float = 6 * 60 * 60  # Reclaim workspaces untouched for this long (seconds)
+    PREVIEW_HEIGHT: int = 480  # Output height of draft previews
+    PREVIEW_DURATION: float = 15.0  # Seconds rendered by draft previews
+    FILTER_LUT_ENABLED: bool = True  # Bake color presets into 3D LUTs
+    FILTER_PRESETS_DIR: str = ""  # Custom presets (default: UPLOAD_DIR/presets)
+    AUDIO_PREP_SAMPLE_RATE: int = 48000
+    AUDIO_PREP_BITRATE: str = "192k"
+    AUDIO_LOUDNORM_TARGET_I: float = -14.0  # Integrated loudness (LUFS)
+    AUDIO_LOUDNORM_TARGET_TP: float = -1.5  # True peak (dBTP)
+    AUDIO_LOUDNORM_TARGET_LRA: float = 11.0  # Loudness range (LU)
+    AUDIO_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2GB of prepared tracks and measurements
+    RENDER_CACHE_ENABLED: bool = True
+    RENDER_CACHE_MAX_BYTES: int = 20 * 1024 * 1024 * 1024  # 20GB
+
+    # Upload ingest (mezzanine normalization)
+    MEZZANINE_ENABLED: bool = False
+    MEZZANINE_WIDTH: int = 1080
+    MEZZANINE_HEIGHT: int = 1920
+    MEZZANINE_FPS: int = 30
+    MEZZANINE_KEYFRAME_INTERVAL: float = 2.0  # Seconds between keyframes
+    MEZZANINE_CRF: int = 18
+    MEZZANINE_PRESET: str = "veryfast"
+
+    # Thumbnails and preview sprites
+    THUMBNAIL_ENABLED: bool = True
+    THUMBNAIL_WIDTH: int = 480
+    THUMBNAIL_POSTER_OFFSET: float = 0.1  # Poster position as a fraction of duration
+    SPRITE_INTERVAL: float = 2.0  # Seconds between sprite tiles
+    SPRITE_TILE_WIDTH: int = 160
+    SPRITE_COLUMNS: int = 10
+    SPRITE_MAX_TILES: int = 100
+
+    # Subtitles
+    SUBTITLE_MAX_CUE_CHARS: int = 84  # Characters per auto-split cue (about two lines)
+    SUBTITLE_CHARS_PER_SECOND: float = 15.0  # Reading speed for pacing auto-split cues
+    SUBTITLE_MIN_CUE_DURATION: float = 1.0  # Seconds an auto-split cue stays on screen at least
+
+    # Statistics ingestion
+    STATS_BATCH_SIZE: int = 5000  # Rows per batched UPDATE when COPY is not available
+
+    # Media probing
+    PROBE_CACHE_SIZE: int = 1024  # ffprobe results kept in memory
+    PROBE_WORKERS: int = 0  # Parallel probes during metadata backfill (0 = CPU count)
 
     # Application
     APP_NAME: str = "Admin Panel API"
@@ -45,5 +45,5 @@ def init_db():
     Initialize database tables.
     Creates all tables defined in models.
     """
-    from app.models import account, proxy, video, project  # noqa: F401
+    from app.models import account, proxy, video, project, render_job, upload, blob  # noqa: F401
     Base.metadata.create_all(bind=engine)
@@ -10,6 +10,11 @@ import logging
 from app.config import get_settings, init_directories
 from app.database import engine, Base
 from app.api import accounts, proxies, videos, generator, analytics
+from app.services.render_pool import get_render_pool
+from app.services.render_worker import get_render_worker
+from app.services.storage import get_storage
+from app.services.uploads import expire_stale_uploads
+from app.services.workspace import reclaim_stale_workspaces
 
 # Configure logging
 logging.basicConfig(
@@ -69,10 +74,23 @@ async def startup_event():
     init_directories()
     logger.info("Upload directories initialized")
 
+    # Fail fast on a misconfigured storage backend
+    logger.info(f"Storage backend: {type(get_storage()).__name__}")
+
+    # Remove scratch left behind by renders that died mid-job
+    reclaim_stale_workspaces()
+
     # Create database tables
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created")
 
+    # Drop resumable uploads their clients abandoned
+    expire_stale_uploads()
+
+    # Pull render jobs from the shared queue
+    if settings.RENDER_WORKER_ENABLED:
+        get_render_worker().start()
+
 
 # Shutdown event
 @app.on_event("shutdown")
@@ -82,6 +100,14 @@ async def shutdown_event():
     """
     logger.info("Shutting down application")
 
+    # Stop render workers
+    if settings.RENDER_WORKER_ENABLED:
+        get_render_worker().stop(timeout=5)
+    get_render_pool().shutdown(wait=False)
+    logger.info("Render workers stopped")
+
+    get_storage().shutdown()
+
 
 # Include routers
 app.include_router(accounts.router)
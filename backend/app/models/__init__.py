@@ -4,7 +4,10 @@ SQLAlchemy models for the application.
 from app.models.proxy import Proxy, ProxyType
 from app.models.account import Account, Platform, AccountStatus
 from app.models.video import Video
-from app.models.project import VideoProject, ProjectStatus, FilterType
+from app.models.project import VideoProject, ProjectStatus, FilterType, EncoderProfileType
+from app.models.render_job import RenderJob, RenderJobKind, RenderJobStatus
+from app.models.upload import VideoUpload, UploadStatus
+from app.models.blob import VideoBlob
 
 __all__ = [
     "Proxy",
@@ -16,4 +19,11 @@ __all__ = [
     "VideoProject",
     "ProjectStatus",
     "FilterType",
+    "EncoderProfileType",
+    "RenderJob",
+    "RenderJobKind",
+    "RenderJobStatus",
+    "VideoUpload",
+    "UploadStatus",
+    "VideoBlob",
 ]
@@ -39,6 +39,7 @@ class Account(Base):
         total_likes: Total likes across all videos
         total_comments: Total comments across all videos
         status: Account status (online/offline/suspended/pending)
+        render_weight: Share of render capacity relative to other accounts
         last_activity: Last activity timestamp
         proxy_id: Foreign key to proxy
         created_at: Creation timestamp
@@ -61,6 +62,9 @@ class Account(Base):
     status = Column(Enum(AccountStatus), default=AccountStatus.OFFLINE, nullable=False)
     last_activity = Column(DateTime(timezone=True), nullable=True)
 
+    # Render scheduling
+    render_weight = Column(Integer, default=1, nullable=False)
+
     # Relationships
     proxy_id = Column(Integer, ForeignKey("proxies.id"), nullable=True)
     proxy = relationship("Proxy", back_populates="accounts")
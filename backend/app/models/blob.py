@@ -0,0 +1,36 @@
+"""
+Video Blob model for database.
+Tracks content-addressed video files shared by identical uploads.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class VideoBlob(Base):
+    """
+    Stored video file, addressed by the SHA-256 of its content.
+
+    Identical uploads resolve to one blob; ``ref_count`` is the number of
+    videos pointing at it, and the file is removed with the last one.
+
+    Attributes:
+        sha256: Content hash (hex), primary key
+        file_path: Path to the stored file
+        size: File size in bytes
+        ref_count: Number of videos referencing the blob
+        created_at: Creation timestamp
+    """
+    __tablename__ = "video_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String(1000), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, default=0, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<VideoBlob {self.sha256[:12]} x{self.ref_count}>"
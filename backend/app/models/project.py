@@ -2,7 +2,7 @@
 Video Project model for database.
 Manages video generation projects with editing parameters.
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Enum, Float, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -29,6 +29,13 @@ class FilterType(str, enum.Enum):
     COOL = "cool"
 
 
+class EncoderProfileType(str, enum.Enum):
+    """Encoder profile types."""
+    DRAFT = "draft"
+    STANDARD = "standard"
+    ARCHIVAL = "archival"
+
+
 class VideoProject(Base):
     """
     Video project model for video generation and editing.
@@ -40,12 +47,25 @@ class VideoProject(Base):
         video_track_path: Path to source video file
         audio_track_path: Path to audio file (optional)
         subtitle_text: Subtitle text content (optional)
+        subtitle_cues: Timed subtitle cues ({start, end, text}); shown instead of subtitle_text
         audio_volume: Audio volume level (0-100)
+        normalize_audio: Whether to loudness-normalize the audio track
         filter_type: Applied filter type
+        custom_filter: Name of a custom filter preset (overrides filter_type)
         uniquify_subtitles: Whether to apply unique styling to subtitles
+        segmented_render: Segment-parallel encoding (None = automatic by duration)
+        encoder_profile: Encoder profile for the render (draft/standard/archival)
         account_id: Foreign key to account
         output_path: Path to generated output video
+        thumbnail_path: Path to poster frame of the output
+        sprite_path: Path to scrub-preview sprite sheet of the output
+        sprite_vtt_path: Path to WebVTT index of the sprite sheet
+        preview_path: Path to the latest draft preview render
         error_message: Error message if processing failed
+        progress: Render progress percentage (0-100)
+        render_fps: Current (or final) encode speed in frames per second
+        render_speed: Current (or final) encode speed as a multiple of realtime
+        eta_seconds: Estimated seconds until the render finishes
         created_at: Creation timestamp
         updated_at: Last update timestamp
     """
@@ -59,16 +79,31 @@ class VideoProject(Base):
     video_track_path = Column(String(1000), nullable=False)
     audio_track_path = Column(String(1000), nullable=True)
     subtitle_text = Column(String(5000), nullable=True)
+    subtitle_cues = Column(JSON, nullable=True)
 
     # Processing parameters
     audio_volume = Column(Integer, default=100, nullable=False)  # 0-100
+    normalize_audio = Column(Boolean, default=False, nullable=False)
     filter_type = Column(Enum(FilterType), default=FilterType.NONE, nullable=False)
+    custom_filter = Column(String(100), nullable=True)
     uniquify_subtitles = Column(Boolean, default=False, nullable=False)
+    segmented_render = Column(Boolean, nullable=True)  # None = automatic
+    encoder_profile = Column(Enum(EncoderProfileType), default=EncoderProfileType.STANDARD, nullable=False)
 
     # Output
     output_path = Column(String(1000), nullable=True)
+    thumbnail_path = Column(String(1000), nullable=True)
+    sprite_path = Column(String(1000), nullable=True)
+    sprite_vtt_path = Column(String(1000), nullable=True)
+    preview_path = Column(String(1000), nullable=True)
     error_message = Column(String(2000), nullable=True)
 
+    # Render progress
+    progress = Column(Float, default=0.0, nullable=False)  # 0-100
+    render_fps = Column(Float, nullable=True)
+    render_speed = Column(Float, nullable=True)
+    eta_seconds = Column(Float, nullable=True)
+
     # Relationships
     account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)
     account = relationship("Account", back_populates="projects")
@@ -90,6 +125,18 @@ class VideoProject(Base):
         """Check if project can be processed."""
         return self.status in [ProjectStatus.DRAFT, ProjectStatus.FAILED]
 
+    @property
+    def effective_filter(self) -> str:
+        """Get the filter preset name used for rendering."""
+        return self.custom_filter or self.filter_type.value
+
+    def reset_progress(self):
+        """Clear render progress before a new render."""
+        self.progress = 0.0
+        self.render_fps = None
+        self.render_speed = None
+        self.eta_seconds = None
+
     @property
     def is_completed(self) -> bool:
         """Check if project is completed."""
@@ -0,0 +1,94 @@
+"""
+Render Job model for database.
+Durable queue of render work shared by every render node.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Enum, JSON, Index
+from sqlalchemy.sql import func
+import enum
+
+from app.database import Base
+
+
+class RenderJobKind(str, enum.Enum):
+    """Render job types."""
+    PROJECT = "project"
+    BATCH = "batch"
+    INGEST = "ingest"
+    THUMBNAILS = "thumbnails"
+
+
+class RenderJobStatus(str, enum.Enum):
+    """Render job status types."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class RenderJob(Base):
+    """
+    Render job model.
+
+    A worker claims a queued job by taking a lease on it and renews the
+    lease with heartbeats while the render runs. If the worker dies, the
+    lease expires and the job is queued again, up to ``max_attempts``.
+
+    Attributes:
+        id: Primary key
+        kind: Job type (project/batch/ingest/thumbnails)
+        status: Job status (queued/running/completed/failed)
+        payload: Job arguments (project_id and cache_key, project_ids, video_id,
+            or video_ids and project_ids for thumbnails)
+        priority: Scheduling priority (higher runs first)
+        account_id: Account the job renders for, for fair scheduling
+        attempts: Number of times the job was claimed
+        max_attempts: Claims allowed before the job fails for good
+        lease_owner: Worker holding the lease
+        lease_expires_at: When the lease runs out without a heartbeat
+        heartbeat_at: Last heartbeat from the lease owner
+        last_error: Error of the last failed attempt
+        created_at: Creation timestamp
+        started_at: When the current attempt was claimed
+        finished_at: When the job completed or failed for good
+    """
+    __tablename__ = "render_jobs"
+    __table_args__ = (
+        Index("ix_render_jobs_queue", "status", "priority", "account_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(Enum(RenderJobKind), nullable=False)
+    status = Column(Enum(RenderJobStatus), default=RenderJobStatus.QUEUED, nullable=False, index=True)
+    payload = Column(JSON, nullable=False)
+
+    # Scheduling
+    priority = Column(Integer, default=0, nullable=False)
+    account_id = Column(Integer, nullable=True, index=True)
+
+    # Attempts
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+
+    # Lease
+    lease_owner = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+    last_error = Column(String(2000), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<RenderJob {self.id} {self.kind.value} ({self.status.value})>"
+
+    @property
+    def project_ids(self) -> list:
+        """Get the IDs of the projects this job renders."""
+        if self.kind == RenderJobKind.PROJECT:
+            return [self.payload["project_id"]]
+        if self.kind == RenderJobKind.BATCH:
+            return list(self.payload["project_ids"])
+        return []
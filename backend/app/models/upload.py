@@ -0,0 +1,75 @@
+"""
+Video Upload model for database.
+Tracks resumable chunked uploads until they become Video records.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, BigInteger
+from sqlalchemy.sql import func
+import enum
+
+from app.database import Base
+
+
+class UploadStatus(str, enum.Enum):
+    """Upload session status types."""
+    UPLOADING = "uploading"
+    COMPLETED = "completed"
+
+
+class VideoUpload(Base):
+    """
+    Resumable upload session.
+
+    Chunks are written straight into ``file_path`` at the offset the client
+    sends; on finalize the file is renamed into the content-addressed video
+    store. ``offset`` is the number of bytes safely written, so an
+    interrupted client asks for it and resumes from there.
+
+    Attributes:
+        id: Upload ID (random hex string used in URLs)
+        status: Upload status (uploading/completed)
+        title: Title of the video to create
+        filename: Original file name
+        platform: Platform name of the video to create
+        account_id: Account of the video to create
+        normalize: Queue mezzanine transcoding on finalize (None = MEZZANINE_ENABLED)
+        file_path: Final path of the uploaded file
+        length: Total upload size in bytes
+        offset: Bytes received so far
+        video_id: Created video, once finalized
+        created_at: Creation timestamp
+        updated_at: Last chunk timestamp
+    """
+    __tablename__ = "video_uploads"
+
+    id = Column(String(32), primary_key=True)
+    status = Column(Enum(UploadStatus), default=UploadStatus.UPLOADING, nullable=False, index=True)
+
+    # Video to create
+    title = Column(String(500), nullable=False)
+    filename = Column(String(500), nullable=False)
+    platform = Column(String(50), nullable=True)
+    account_id = Column(Integer, nullable=True)
+    normalize = Column(Boolean, nullable=True)
+
+    # Transfer state
+    file_path = Column(String(1000), nullable=False)
+    length = Column(BigInteger, nullable=False)
+    offset = Column(BigInteger, default=0, nullable=False)
+    video_id = Column(Integer, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self):
+        return f"<VideoUpload {self.id} {self.offset}/{self.length}>"
+
+    @property
+    def is_complete(self) -> bool:
+        """Check if every byte has been received."""
+        return self.offset >= self.length
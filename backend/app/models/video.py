@@ -16,11 +16,20 @@ class Video(Base):
     Attributes:
         id: Primary key
         title: Video title
-        file_path: Path to video file
+        file_path: Path to the original uploaded video file
+        content_hash: SHA-256 of the uploaded file (its blob in the content-addressed store)
+        mezzanine_path: Path to the normalized mezzanine copy (if ingested)
         thumbnail_path: Path to thumbnail image
+        sprite_path: Path to scrub-preview sprite sheet
+        sprite_vtt_path: Path to WebVTT index of the sprite sheet
         account_id: Foreign key to account
         duration: Video duration in seconds
         size: File size in bytes
+        width: Frame width in pixels
+        height: Frame height in pixels
+        fps: Average frame rate
+        codec: Video codec name
+        bit_rate: Overall bit rate in bits per second
         views: Number of views
         likes: Number of likes
         comments: Number of comments
@@ -34,11 +43,20 @@ class Video(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False)
     file_path = Column(String(1000), nullable=False)
+    content_hash = Column(String(64), nullable=True, index=True)
+    mezzanine_path = Column(String(1000), nullable=True)
     thumbnail_path = Column(String(1000), nullable=True)
+    sprite_path = Column(String(1000), nullable=True)
+    sprite_vtt_path = Column(String(1000), nullable=True)
 
     # Video metadata
     duration = Column(Float, nullable=True)  # in seconds
     size = Column(BigInteger, nullable=True)  # in bytes
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    fps = Column(Float, nullable=True)
+    codec = Column(String(50), nullable=True)
+    bit_rate = Column(BigInteger, nullable=True)  # bits per second
 
     # Statistics
     views = Column(BigInteger, default=0, nullable=False)
@@ -77,7 +95,12 @@ class Video(Base):
         return f"{minutes:02d}:{seconds:02d}"
 
     def calculate_engagement(self):
-        """Calculate and update engagement rate."""
+        """
+        Calculate and update engagement rate.
+
+        Bulk statistics updates compute the same value in SQL
+        (``app.services.video_stats.engagement_rate_sql``).
+        """
         if self.views > 0:
             self.engagement_rate = round(((self.likes + self.comments) / self.views) * 100, 2)
         else:
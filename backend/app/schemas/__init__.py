@@ -6,9 +6,15 @@ from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse, A
 from app.schemas.video import (
     VideoCreate,
     VideoResponse,
+    VideoUploadResponse,
+    VideoStatsUpdate,
     VideoProjectCreate,
     VideoProjectUpdate,
     VideoProjectResponse,
+    VideoBatchVariant,
+    VideoBatchCreate,
+    VideoProjectProgress,
+    FilterPresetResponse,
     VideoProcessRequest,
     VideoProcessResponse,
 )
@@ -24,9 +30,15 @@ __all__ = [
     "AccountStats",
     "VideoCreate",
     "VideoResponse",
+    "VideoUploadResponse",
+    "VideoStatsUpdate",
     "VideoProjectCreate",
     "VideoProjectUpdate",
     "VideoProjectResponse",
+    "VideoBatchVariant",
+    "VideoBatchCreate",
+    "VideoProjectProgress",
+    "FilterPresetResponse",
     "VideoProcessRequest",
     "VideoProcessResponse",
 ]
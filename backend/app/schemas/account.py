@@ -24,6 +24,7 @@ class AccountCreate(AccountBase):
     videos_count: int = Field(default=0, ge=0, description="Number of videos")
     total_likes: int = Field(default=0, ge=0, description="Total likes")
     total_comments: int = Field(default=0, ge=0, description="Total comments")
+    render_weight: int = Field(default=1, ge=1, le=100, description="Render capacity share")
 
     @validator('username')
     def username_must_start_with_at(cls, v):
@@ -44,6 +45,7 @@ class AccountUpdate(BaseModel):
     videos_count: Optional[int] = Field(None, ge=0)
     total_likes: Optional[int] = Field(None, ge=0)
     total_comments: Optional[int] = Field(None, ge=0)
+    render_weight: Optional[int] = Field(None, ge=1, le=100)
 
     @validator('username')
     def username_must_start_with_at(cls, v):
@@ -62,6 +64,7 @@ class AccountResponse(AccountBase):
     total_comments: int
     engagement_rate: float
     avg_likes_per_video: float
+    render_weight: int
     proxy_id: Optional[int]
     last_activity: Optional[datetime]
     created_at: datetime
@@ -2,11 +2,12 @@
 Pydantic schemas for Video and VideoProject models.
 Validation and serialization for API requests/responses.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from app.models.project import ProjectStatus, FilterType
+from app.models.project import ProjectStatus, FilterType, EncoderProfileType
+from app.models.upload import UploadStatus
 
 
 class VideoBase(BaseModel):
@@ -28,9 +29,17 @@ class VideoResponse(VideoBase):
     """Schema for video response."""
     id: int
     file_path: str
+    content_hash: Optional[str]
+    mezzanine_path: Optional[str]
     thumbnail_path: Optional[str]
+    sprite_vtt_path: Optional[str]
     duration: Optional[float]
     size: Optional[int]
+    width: Optional[int]
+    height: Optional[int]
+    fps: Optional[float]
+    codec: Optional[str]
+    bit_rate: Optional[int]
     size_mb: float
     duration_formatted: str
     views: int
@@ -45,15 +54,65 @@ class VideoResponse(VideoBase):
         from_attributes = True
 
 
+class VideoStatsUpdate(BaseModel):
+    """Schema for one row of a bulk statistics update (omitted counters are kept)."""
+    # Bounds match the columns: INTEGER id and comments, BIGINT views and likes
+    video_id: int = Field(..., ge=1, le=2**31 - 1, description="Video ID")
+    views: Optional[int] = Field(None, ge=0, le=2**63 - 1)
+    likes: Optional[int] = Field(None, ge=0, le=2**63 - 1)
+    comments: Optional[int] = Field(None, ge=0, le=2**31 - 1)
+
+
+class VideoUploadResponse(BaseModel):
+    """Schema for resumable upload response."""
+    id: str
+    title: str
+    filename: str
+    length: int
+    offset: int
+    status: UploadStatus
+    video_id: Optional[int]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SubtitleCue(BaseModel):
+    """Schema for a timed subtitle cue."""
+    start: float = Field(..., ge=0, description="Start time in seconds")
+    end: float = Field(..., gt=0, description="End time in seconds")
+    text: str = Field(..., min_length=1, max_length=1000, description="Caption text")
+
+    @model_validator(mode="after")
+    def check_span(self):
+        if self.end <= self.start:
+            raise ValueError("Cue end must be after its start")
+        return self
+
+
 class VideoProjectBase(BaseModel):
     """Base schema for video project."""
     name: str = Field(..., min_length=1, max_length=500, description="Project name")
     video_track_path: str = Field(..., description="Path to source video")
     audio_track_path: Optional[str] = Field(None, description="Path to audio file")
     subtitle_text: Optional[str] = Field(None, max_length=5000, description="Subtitle text")
+    subtitle_cues: Optional[List[SubtitleCue]] = Field(
+        None, max_length=20000, description="Timed subtitle cues (shown instead of subtitle_text)"
+    )
     audio_volume: int = Field(default=100, ge=0, le=100, description="Audio volume (0-100)")
+    normalize_audio: bool = Field(default=False, description="Loudness-normalize the audio track")
     filter_type: FilterType = Field(default=FilterType.NONE, description="Video filter type")
+    custom_filter: Optional[str] = Field(
+        None, max_length=100, description="Custom filter preset name (overrides filter_type)"
+    )
     uniquify_subtitles: bool = Field(default=False, description="Apply unique subtitle styling")
+    segmented_render: Optional[bool] = Field(
+        None, description="Segment-parallel encoding (null = automatic for long sources)"
+    )
+    encoder_profile: EncoderProfileType = Field(
+        default=EncoderProfileType.STANDARD, description="Encoder profile (draft, standard, archival)"
+    )
 
 
 class VideoProjectCreate(VideoProjectBase):
@@ -66,9 +125,14 @@ class VideoProjectUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=500)
     audio_track_path: Optional[str] = None
     subtitle_text: Optional[str] = Field(None, max_length=5000)
+    subtitle_cues: Optional[List[SubtitleCue]] = Field(None, max_length=20000)
     audio_volume: Optional[int] = Field(None, ge=0, le=100)
+    normalize_audio: Optional[bool] = None
     filter_type: Optional[FilterType] = None
+    custom_filter: Optional[str] = Field(None, max_length=100)
     uniquify_subtitles: Optional[bool] = None
+    segmented_render: Optional[bool] = None
+    encoder_profile: Optional[EncoderProfileType] = None
     account_id: Optional[int] = None
 
 
@@ -77,7 +141,14 @@ class VideoProjectResponse(VideoProjectBase):
     id: int
     status: ProjectStatus
     output_path: Optional[str]
+    thumbnail_path: Optional[str]
+    sprite_vtt_path: Optional[str]
+    preview_path: Optional[str]
     error_message: Optional[str]
+    progress: float
+    render_fps: Optional[float]
+    render_speed: Optional[float]
+    eta_seconds: Optional[float]
     account_id: Optional[int]
     is_processable: bool
     is_completed: bool
@@ -88,6 +159,54 @@ class VideoProjectResponse(VideoProjectBase):
         from_attributes = True
 
 
+class VideoBatchVariant(BaseModel):
+    """Schema for a single variant in a batch render."""
+    filter_type: FilterType = Field(default=FilterType.NONE, description="Video filter type")
+    custom_filter: Optional[str] = Field(
+        None, max_length=100, description="Custom filter preset name (overrides filter_type)"
+    )
+    subtitle_text: Optional[str] = Field(None, max_length=5000, description="Subtitle text")
+    subtitle_cues: Optional[List[SubtitleCue]] = Field(
+        None, max_length=20000, description="Timed subtitle cues (shown instead of subtitle_text)"
+    )
+    uniquify_subtitles: bool = Field(default=False, description="Apply unique subtitle styling")
+    account_id: Optional[int] = Field(None, description="Target account ID")
+
+
+class VideoBatchCreate(BaseModel):
+    """Schema for rendering several variants of one source video."""
+    name: str = Field(..., min_length=1, max_length=480, description="Base name for variant projects")
+    video_track_path: str = Field(..., description="Path to source video")
+    audio_track_path: Optional[str] = Field(None, description="Path to audio file")
+    audio_volume: int = Field(default=100, ge=0, le=100, description="Audio volume (0-100)")
+    normalize_audio: bool = Field(default=False, description="Loudness-normalize the audio track")
+    encoder_profile: EncoderProfileType = Field(
+        default=EncoderProfileType.STANDARD, description="Encoder profile for every variant"
+    )
+    priority: int = Field(default=0, ge=-5, le=5, description="Scheduling priority (higher renders first)")
+    variants: List[VideoBatchVariant] = Field(..., min_length=1, max_length=50, description="Variants to render")
+
+
+class VideoProjectProgress(BaseModel):
+    """Schema for a render progress event."""
+    project_id: int
+    status: ProjectStatus
+    progress: float
+    render_fps: Optional[float]
+    render_speed: Optional[float]
+    eta_seconds: Optional[float]
+    error_message: Optional[str]
+
+
+class FilterPresetResponse(BaseModel):
+    """Schema for a registered filter preset."""
+    name: str
+    color_filter: Optional[str]
+    spatial_filter: Optional[str]
+    lut_path: Optional[str]
+    builtin: bool
+
+
 class VideoProcessRequest(BaseModel):
     """Schema for video processing request."""
     project_id: int = Field(..., description="Video project ID to process")
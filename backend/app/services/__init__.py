@@ -2,6 +2,9 @@
 Business logic services for the application.
 """
 from app.services.video_generator import VideoGenerator
+from app.services.render_pool import RenderPool, RenderQueueFull, get_render_pool
+from app.services.job_queue import JobQueue, get_job_queue
+from app.services.render_worker import RenderWorker, get_render_worker
 from app.services.mock_data import (
     generate_username,
     generate_followers,
@@ -12,6 +15,13 @@ from app.services.mock_data import (
 
 __all__ = [
     "VideoGenerator",
+    "RenderPool",
+    "RenderQueueFull",
+    "get_render_pool",
+    "JobQueue",
+    "get_job_queue",
+    "RenderWorker",
+    "get_render_worker",
     "generate_username",
     "generate_followers",
     "generate_video_stats",
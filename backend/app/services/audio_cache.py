@@ -0,0 +1,206 @@
+"""
+Audio preparation cache.
+Encodes each soundtrack to AAC once and reuses it across renders.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import ffmpeg
+
+from app.config import get_settings
+from app.services.render_cache import file_content_hash
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bump when preparation output changes for identical inputs
+PREP_VERSION = 1
+
+
+class AudioPreparer:
+    """
+    Prepares soundtracks for muxing into renders.
+
+    Each (audio content, volume, normalization) combination is resampled and
+    encoded to AAC once and stored as ``<key>.m4a`` under
+    ``UPLOAD_DIR/audio/prepared``. Renders then stream-copy the prepared
+    track instead of decoding and re-encoding the source every time.
+
+    Two-pass loudness normalization measurements (the first ``loudnorm``
+    pass) are cached per file as ``<content hash>.loudnorm.json``.
+
+    Both are bounded by ``AUDIO_CACHE_MAX_BYTES`` with least-recently-used
+    eviction, like the render cache.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(settings.UPLOAD_DIR) / "audio" / "prepared"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.AUDIO_CACHE_MAX_BYTES
+
+    def _loudnorm_target(self) -> dict:
+        return {
+            'I': settings.AUDIO_LOUDNORM_TARGET_I,
+            'TP': settings.AUDIO_LOUDNORM_TARGET_TP,
+            'LRA': settings.AUDIO_LOUDNORM_TARGET_LRA,
+        }
+
+    def measure_loudness(self, audio_path: str) -> dict:
+        """
+        Measure loudness with a first ``loudnorm`` pass, cached per file.
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            loudnorm measurement (input_i, input_tp, input_lra, input_thresh, target_offset)
+
+        Raises:
+            Exception: If FFmpeg fails or prints no measurement
+        """
+        content_hash = file_content_hash(audio_path)
+        target = self._loudnorm_target()
+        target_tag = hashlib.sha1(json.dumps(target, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+        measurement_path = self.cache_dir / f"{content_hash}.{target_tag}.loudnorm.json"
+
+        try:
+            os.utime(measurement_path)
+            return json.loads(measurement_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+
+        try:
+            audio = ffmpeg.input(audio_path).audio.filter('loudnorm', print_format='json', **target)
+            output = ffmpeg.output(audio, '-', f='null')
+            _, stderr = ffmpeg.run(output, capture_stdout=True, capture_stderr=True)
+        except ffmpeg.Error as e:
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise Exception(f"Failed to measure loudness: {error_message}")
+
+        # loudnorm prints its JSON report as the last {...} block on stderr
+        matches = re.findall(r"\{[^{}]*\}", stderr.decode("utf-8", errors="replace"))
+        if not matches:
+            raise Exception("Failed to measure loudness: no loudnorm report in FFmpeg output")
+        measurement = json.loads(matches[-1])
+
+        tmp_path = measurement_path.with_name(f".{measurement_path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps(measurement), encoding="utf-8")
+        os.replace(tmp_path, measurement_path)
+        self.evict()
+
+        return measurement
+
+    def make_key(self, audio_path: str, volume: float, normalize: bool) -> str:
+        """Build the cache key for a prepared track."""
+        params = {
+            "version": PREP_VERSION,
+            "audio": file_content_hash(audio_path),
+            "volume": round(volume, 4),
+            "normalize": self._loudnorm_target() if normalize else None,
+            "sample_rate": settings.AUDIO_PREP_SAMPLE_RATE,
+            "bitrate": settings.AUDIO_PREP_BITRATE,
+        }
+        payload = json.dumps(params, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def prepare(self, audio_path: str, volume: float = 1.0, normalize: bool = False) -> str:
+        """
+        Get an AAC track with volume (and optional loudness normalization) applied.
+
+        Args:
+            audio_path: Path to audio file
+            volume: Audio volume multiplier
+            normalize: Apply two-pass EBU R128 loudness normalization first
+
+        Returns:
+            Path to prepared .m4a file
+
+        Raises:
+            Exception: If FFmpeg processing fails
+        """
+        prepared_path = self.cache_dir / f"{self.make_key(audio_path, volume, normalize)}.m4a"
+
+        if prepared_path.exists():
+            os.utime(prepared_path)
+            return str(prepared_path)
+
+        audio = ffmpeg.input(audio_path).audio
+
+        if normalize:
+            measurement = self.measure_loudness(audio_path)
+            audio = audio.filter(
+                'loudnorm',
+                measured_I=measurement['input_i'],
+                measured_TP=measurement['input_tp'],
+                measured_LRA=measurement['input_lra'],
+                measured_thresh=measurement['input_thresh'],
+                offset=measurement['target_offset'],
+                linear='true',
+                **self._loudnorm_target()
+            )
+
+        if volume != 1.0:
+            audio = audio.filter('volume', volume)
+
+        audio = audio.filter('aresample', settings.AUDIO_PREP_SAMPLE_RATE)
+
+        tmp_path = self.cache_dir / f".{prepared_path.stem}.{uuid.uuid4().hex}.m4a"
+        try:
+            output = ffmpeg.output(
+                audio,
+                str(tmp_path),
+                acodec='aac',
+                audio_bitrate=settings.AUDIO_PREP_BITRATE,
+                ac=2,
+                movflags='+faststart'
+            )
+            ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+            os.replace(tmp_path, prepared_path)
+
+        except ffmpeg.Error as e:
+            tmp_path.unlink(missing_ok=True)
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise Exception(f"Failed to prepare audio: {error_message}")
+
+        logger.info(f"Prepared audio track {prepared_path.name} from {audio_path}")
+        self.evict()
+        return str(prepared_path)
+
+    def evict(self) -> int:
+        """
+        Evict least recently used tracks and measurements until the cache fits its size limit.
+
+        Returns:
+            Number of evicted files
+        """
+        entries = []
+        total_size = 0
+        for pattern in ("*.m4a", "*.loudnorm.json"):
+            for entry in self.cache_dir.glob(pattern):
+                if entry.name.startswith("."):
+                    # In-progress temporary file
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+                total_size += stat.st_size
+
+        evicted = 0
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total_size <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total_size -= size
+            evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} prepared audio files")
+        return evicted
@@ -0,0 +1,253 @@
+"""
+Content-addressed video store.
+Stores uploaded videos once per content hash and shares them between
+identical uploads.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import VideoBlob
+from app.services.storage import COPY_BLOCK_SIZE, LocalStorage, get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def _copy_hashing(fileobj: BinaryIO, path: Path) -> Tuple[str, int]:
+    """Copy a file object to a path, hashing it on the way; returns (sha256, size)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    hasher = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    with path.open("wb") as buffer:
+        for block in iter(lambda: fileobj.read(COPY_BLOCK_SIZE), b""):
+            buffer.write(block)
+            hasher.update(block)
+            size += len(block)
+    return hasher.hexdigest(), size
+
+
+class BlobStore:
+    """
+    Video files stored under ``UPLOAD_DIR/videos/blobs`` by SHA-256.
+
+    Uploads are hashed while they are written, then either moved to
+    ``blobs/<aa>/<sha256><ext>`` or, if that content is already stored,
+    discarded in favour of the existing blob once the reference is
+    committed. Each blob counts the videos
+    referencing it; a blob left without references is kept until it is
+    purged (row and file), either by a deletion that asks for its files to
+    go or by ``purge_unreferenced``.
+
+    Reference changes are made in the caller's session and take effect
+    when it commits together with the video rows.
+    """
+
+    def __init__(self, storage: Optional[LocalStorage] = None):
+        self.storage = storage or get_storage()
+
+    @staticmethod
+    def blob_key(sha256: str, suffix: str) -> str:
+        """Get the storage key of a blob."""
+        return f"videos/blobs/{sha256[:2]}/{sha256}{suffix.lower()}"
+
+    async def ingest(self, db: Session, fileobj: BinaryIO, suffix: str) -> VideoBlob:
+        """
+        Store an uploaded file object and take a reference to its blob.
+
+        Args:
+            db: Database session
+            fileobj: Readable binary file object
+            suffix: File extension (kept on newly stored blobs)
+
+        Returns:
+            Blob of the file's content
+        """
+        incoming = self.storage.path(f"videos/incoming/{uuid.uuid4()}{suffix}")
+        try:
+            sha256, size = await self.storage.run(_copy_hashing, fileobj, incoming)
+            blob = await self.add(db, str(incoming), sha256, size, suffix)
+        except Exception:
+            await self.storage.run(incoming.unlink, missing_ok=True)
+            raise
+
+        # The incoming copy is disposable; the uploaded file object remains
+        await self.discard(blob, str(incoming))
+        return blob
+
+    async def add(self, db: Session, path: str, sha256: str, size: int, suffix: str) -> VideoBlob:
+        """
+        Take a reference to the blob of a fully written local file.
+
+        The file is moved into the store if its content is new, otherwise
+        the existing blob is used and the file is left in place. After the
+        caller commits, ``discard`` deletes a deduplicated file; after a
+        rollback, ``restore`` moves a stored file back to ``path``.
+
+        Args:
+            db: Database session
+            path: Local path of the written file
+            sha256: Content hash of the file
+            size: File size in bytes
+            suffix: File extension
+
+        Returns:
+            Blob of the file's content
+        """
+        blob = self._acquire(db, sha256)
+        if blob:
+            logger.info(f"Upload deduplicated to blob {sha256[:12]} ({blob.ref_count} references)")
+            return blob
+
+        blob_path = await self.storage.move(path, self.blob_key(sha256, suffix))
+        try:
+            with db.begin_nested():
+                blob = VideoBlob(sha256=sha256, file_path=blob_path, size=size, ref_count=1)
+                db.add(blob)
+        except IntegrityError:
+            # The same content was stored concurrently; use that blob and
+            # leave this file to be discarded like any duplicate
+            blob = self._acquire(db, sha256)
+            if blob.file_path != blob_path:
+                await self.storage.run(os.replace, blob_path, path)
+        return blob
+
+    async def discard(self, blob: VideoBlob, path: str) -> None:
+        """
+        Delete a file that ``add`` deduplicated, once the reference is committed.
+
+        Args:
+            blob: Blob returned by ``add``
+            path: Path passed to ``add``
+        """
+        if blob.file_path != path:
+            await self.storage.run(Path(path).unlink, missing_ok=True)
+
+    async def restore(self, db: Session, path: str, sha256: str, suffix: str) -> None:
+        """
+        Undo ``add`` after its transaction was rolled back.
+
+        A file moved into the store is moved back to ``path``. If an
+        identical upload committed that blob in the meantime, the blob file
+        is kept and copied back instead.
+
+        Args:
+            db: Database session (rolled back)
+            path: Path passed to ``add``
+            sha256: Content hash passed to ``add``
+            suffix: File extension passed to ``add``
+        """
+        if await self.storage.run(os.path.exists, path):
+            return
+
+        blob_path = str(self.storage.path(self.blob_key(sha256, suffix)))
+        try:
+            stored = db.query(VideoBlob.file_path).filter(VideoBlob.sha256 == sha256).first()
+        finally:
+            db.rollback()
+
+        if stored and stored.file_path == blob_path:
+            await self.storage.run(shutil.copyfile, blob_path, path)
+        else:
+            await self.storage.run(os.replace, blob_path, path)
+            # Drops the copy published for the blob (object storage)
+            await self.storage.delete(blob_path)
+
+    def _acquire(self, db: Session, sha256: str) -> Optional[VideoBlob]:
+        blob = db.query(VideoBlob).filter(VideoBlob.sha256 == sha256).with_for_update().first()
+        if blob:
+            blob.ref_count += 1
+            db.flush()
+        return blob
+
+    def release(self, db: Session, sha256: str) -> bool:
+        """
+        Drop a reference to a blob.
+
+        The blob is kept without references, so an identical upload can
+        still take it over, until ``purge`` or ``purge_unreferenced``
+        removes it after the caller commits.
+
+        Args:
+            db: Database session
+            sha256: Content hash of the blob
+
+        Returns:
+            True if this was the last reference
+        """
+        blob = db.query(VideoBlob).filter(VideoBlob.sha256 == sha256).with_for_update().first()
+        if not blob:
+            return False
+
+        blob.ref_count -= 1
+        db.flush()
+        return blob.ref_count <= 0
+
+    async def purge(self, db: Session, sha256: str) -> bool:
+        """
+        Delete a blob and its file if nothing references it anymore.
+
+        Runs in its own transaction after the release committed. The blob
+        row stays locked while its file is deleted, so a concurrent upload
+        of the same content waits and then stores the file anew.
+
+        Args:
+            db: Database session (committed by this call)
+            sha256: Content hash of the blob
+
+        Returns:
+            True if the blob was deleted
+        """
+        try:
+            blob = db.query(VideoBlob).filter(VideoBlob.sha256 == sha256).with_for_update().first()
+            if not blob or blob.ref_count > 0:
+                db.rollback()
+                return False
+
+            db.delete(blob)
+            db.flush()
+            await self.storage.delete(blob.file_path)
+            db.commit()
+            logger.info(f"Deleted unreferenced blob {sha256[:12]}")
+            return True
+
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not delete blob {sha256[:12]}: {e}")
+            return False
+
+    async def purge_unreferenced(self) -> int:
+        """
+        Delete blobs left without references, by deletions that kept their
+        files or by a crash between a video deletion and its purge.
+
+        Returns:
+            Number of blobs deleted
+        """
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            hashes = [row.sha256 for row in db.query(VideoBlob.sha256).filter(VideoBlob.ref_count <= 0).all()]
+            db.rollback()
+            purged = 0
+            for sha256 in hashes:
+                purged += await self.purge(db, sha256)
+            return purged
+
+        finally:
+            db.close()
+
+
+@lru_cache()
+def get_blob_store() -> BlobStore:
+    """Get cached blob store instance."""
+    return BlobStore()
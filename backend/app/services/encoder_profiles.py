@@ -0,0 +1,100 @@
+"""
+Encoder profiles.
+Named libx264 settings trading render time against output quality.
+"""
+import hashlib
+from typing import Dict, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class EncoderProfile:
+    """
+    A named set of encoder settings.
+
+    Attributes:
+        name: Profile name
+        preset: x264 preset
+        crf: x264 constant rate factor (lower is better quality)
+        threads: x264 threads (0 lets FFmpeg decide)
+        height: Maximum output height in pixels (None keeps the source size)
+        max_duration: Render only the first N seconds (None renders everything)
+        faststart: Move the moov atom to the front for progressive playback
+    """
+
+    def __init__(
+        self,
+        name: str,
+        preset: str,
+        crf: int,
+        threads: int = 0,
+        height: Optional[int] = None,
+        max_duration: Optional[float] = None,
+        faststart: bool = True
+    ):
+        self.name = name
+        self.preset = preset
+        self.crf = crf
+        self.threads = threads
+        self.height = height
+        self.max_duration = max_duration
+        self.faststart = faststart
+
+    def __repr__(self):
+        return f"<EncoderProfile {self.name}>"
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash identifying the profile's output, for cache keys."""
+        parts = [self.preset, str(self.crf), str(self.height), str(self.max_duration), str(self.faststart)]
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "preset": self.preset,
+            "crf": self.crf,
+            "threads": self.threads,
+            "height": self.height,
+            "max_duration": self.max_duration,
+            "faststart": self.faststart,
+        }
+
+
+ENCODER_PROFILES: Dict[str, EncoderProfile] = {
+    # Low-resolution head of the video for iterating on filters and subtitles
+    "draft": EncoderProfile(
+        "draft",
+        preset="ultrafast",
+        crf=30,
+        threads=2,
+        height=settings.PREVIEW_HEIGHT,
+        max_duration=settings.PREVIEW_DURATION
+    ),
+    # libx264 defaults, as used before profiles existed
+    "standard": EncoderProfile("standard", preset="medium", crf=23),
+    "archival": EncoderProfile("archival", preset="slow", crf=18),
+}
+
+DEFAULT_ENCODER_PROFILE = "standard"
+
+
+def get_encoder_profile(name: Optional[str] = None) -> EncoderProfile:
+    """
+    Get an encoder profile by name.
+
+    Args:
+        name: Profile name (draft, standard, archival); None means standard
+
+    Returns:
+        Encoder profile
+
+    Raises:
+        ValueError: If there is no such profile
+    """
+    key = (name or DEFAULT_ENCODER_PROFILE).lower()
+    if key not in ENCODER_PROFILES:
+        raise ValueError(f"Unknown encoder profile '{name}'")
+    return ENCODER_PROFILES[key]
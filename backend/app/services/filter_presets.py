@@ -0,0 +1,330 @@
+"""
+Filter preset registry with 3D LUT baking.
+Collapses each preset's per-pixel color filters into a single lut3d pass.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import ffmpeg
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Built-in presets: (per-pixel color chain, spatial chain applied after it)
+BUILTIN_PRESETS = {
+    "cinematic": ("eq=contrast=1.2:brightness=0.05:saturation=0.8", "vignette=PI/4"),
+    "bright": ("eq=brightness=0.15:contrast=1.1:saturation=1.2", None),
+    "cyberpunk": ("eq=contrast=1.3:saturation=1.5,colorchannelmixer=rr=1:rb=0.3:br=0.2:bb=1:bg=0.2", None),
+    "vintage": ("curves=vintage,colorbalance=rs=0.1:gs=-0.05:bs=-0.1", None),
+    "warm": ("colortemperature=temperature=7000,eq=saturation=1.1", None),
+    "cool": ("colortemperature=temperature=3000,eq=saturation=1.1", None),
+}
+
+# Hald CLUT level used for baking: level N gives an N^2 cube (36 for level 6)
+HALD_LEVEL = 6
+
+
+class RenderChain(NamedTuple):
+    """
+    Filters a preset runs at render time.
+
+    Attributes:
+        lut_path: .cube file applied with lut3d first (kept apart from the
+            chain, since a path may contain ',' or ':')
+        filters: FFmpeg filter chain applied after the LUT
+    """
+    lut_path: Optional[str]
+    filters: Optional[str]
+
+
+class FilterPreset:
+    """
+    A named visual filter preset.
+
+    Attributes:
+        name: Preset name
+        color_filter: Per-pixel color filter chain, baked into a LUT
+        spatial_filter: Filter chain that depends on pixel position (e.g. vignette),
+            applied after the color transform
+        lut_path: Pre-built .cube file to use instead of baking color_filter
+    """
+
+    def __init__(
+        self,
+        name: str,
+        color_filter: Optional[str] = None,
+        spatial_filter: Optional[str] = None,
+        lut_path: Optional[str] = None,
+        builtin: bool = False
+    ):
+        self.name = name
+        self.color_filter = color_filter
+        self.spatial_filter = spatial_filter
+        self.lut_path = lut_path
+        self.builtin = builtin
+
+    def __repr__(self):
+        return f"<FilterPreset {self.name}>"
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash identifying the preset's visual output."""
+        parts = [self.color_filter or "", self.spatial_filter or "", str(HALD_LEVEL)]
+        if self.lut_path:
+            stat = os.stat(self.lut_path)
+            parts.append(f"{self.lut_path}:{stat.st_size}:{stat.st_mtime_ns}")
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "color_filter": self.color_filter,
+            "spatial_filter": self.spatial_filter,
+            "lut_path": self.lut_path,
+            "builtin": self.builtin,
+        }
+
+
+class FilterPresetRegistry:
+    """
+    Registry of filter presets that renders each one as a single LUT pass.
+
+    The color part of a preset is baked once into a ``.cube`` file by
+    running the original filter chain over an identity Hald CLUT image.
+    At render time the preset becomes ``lut3d`` followed by its spatial
+    filters, so every preset costs about one per-pixel pass per frame.
+
+    Custom presets are picked up from ``FILTER_PRESETS_DIR`` without code
+    changes:
+        - ``<name>.json`` with ``color_filter`` and optional ``spatial_filter``
+        - ``<name>.cube`` used directly as the preset's LUT
+
+    Presets registered at runtime take precedence over built-in presets,
+    which take precedence over custom ones.
+    """
+
+    def __init__(self, presets_dir: Optional[str] = None, lut_dir: Optional[str] = None):
+        upload_dir = Path(settings.UPLOAD_DIR)
+        self.presets_dir = Path(presets_dir or settings.FILTER_PRESETS_DIR or upload_dir / "presets")
+        self.lut_dir = Path(lut_dir) if lut_dir else upload_dir / "luts"
+        self.presets_dir.mkdir(parents=True, exist_ok=True)
+        self.lut_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._builtin: Dict[str, FilterPreset] = {
+            name: FilterPreset(name, color_filter, spatial_filter, builtin=True)
+            for name, (color_filter, spatial_filter) in BUILTIN_PRESETS.items()
+        }
+        self._runtime: Dict[str, FilterPreset] = {}
+        self._custom: Dict[str, FilterPreset] = {}
+        self._custom_state = None
+
+    def register(
+        self,
+        name: str,
+        color_filter: Optional[str] = None,
+        spatial_filter: Optional[str] = None,
+        lut_path: Optional[str] = None
+    ) -> FilterPreset:
+        """
+        Register or replace a preset for this process.
+
+        Args:
+            name: Preset name
+            color_filter: Per-pixel color filter chain
+            spatial_filter: Position-dependent filter chain
+            lut_path: Pre-built .cube file
+
+        Returns:
+            Registered preset
+        """
+        preset = FilterPreset(name.lower(), color_filter, spatial_filter, lut_path)
+        with self._lock:
+            self._runtime[preset.name] = preset
+        return preset
+
+    def _scan_state(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Get name, mtime and size of every preset file."""
+        state = []
+        for path in self.presets_dir.glob("*"):
+            if path.suffix not in (".json", ".cube"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            state.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(state))
+
+    def _load_custom_presets(self) -> None:
+        """
+        Rescan the presets directory if a preset file was added, removed or changed.
+
+        Keyed on each file's mtime and size, since editing a file in place
+        does not change the directory's mtime.
+        """
+        state = self._scan_state()
+
+        with self._lock:
+            if state == self._custom_state:
+                return
+
+            custom = {}
+            for path in sorted(self.presets_dir.glob("*.cube")):
+                name = path.stem.lower()
+                custom[name] = FilterPreset(name, lut_path=str(path))
+
+            for path in sorted(self.presets_dir.glob("*.json")):
+                try:
+                    data = json.loads(path.read_text(encoding="utf-8"))
+                    name = str(data.get("name") or path.stem).lower()
+                    lut_path = data.get("lut_path")
+                    if lut_path and not Path(lut_path).is_absolute():
+                        lut_path = str(self.presets_dir / lut_path)
+                    custom[name] = FilterPreset(
+                        name,
+                        color_filter=data.get("color_filter"),
+                        spatial_filter=data.get("spatial_filter"),
+                        lut_path=lut_path
+                    )
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping invalid filter preset {path}: {e}")
+
+            self._custom = custom
+            self._custom_state = state
+
+    def get(self, name: Optional[str]) -> Optional[FilterPreset]:
+        """
+        Get a preset by name.
+
+        Args:
+            name: Preset name (case-insensitive); "none" or empty means no filter
+
+        Returns:
+            Preset, or None if there is no such preset
+        """
+        if not name or name.lower() == "none":
+            return None
+
+        self._load_custom_presets()
+        key = name.lower()
+        return self._runtime.get(key) or self._builtin.get(key) or self._custom.get(key)
+
+    def presets(self) -> List[FilterPreset]:
+        """Get all registered presets."""
+        self._load_custom_presets()
+        presets = dict(self._custom)
+        presets.update(self._builtin)
+        presets.update(self._runtime)
+        return [presets[name] for name in sorted(presets)]
+
+    def fingerprint(self, name: Optional[str]) -> Optional[str]:
+        """Get a hash of the preset's visual output, for cache keys."""
+        preset = self.get(name)
+        return preset.fingerprint if preset else None
+
+    def lut_for(self, preset: FilterPreset) -> Optional[str]:
+        """
+        Get the .cube file for a preset's color transform, baking it if needed.
+
+        Args:
+            preset: Filter preset
+
+        Returns:
+            Path to .cube file, or None if the preset has no color transform
+        """
+        if preset.lut_path:
+            return preset.lut_path
+        if not preset.color_filter:
+            return None
+
+        lut_path = self.lut_dir / f"{preset.name}_{preset.fingerprint}.cube"
+        if not lut_path.exists():
+            self._bake(preset, lut_path)
+        return str(lut_path)
+
+    def _bake(self, preset: FilterPreset, lut_path: Path) -> None:
+        """
+        Bake a color filter chain into a .cube 3D LUT.
+
+        Runs the chain over an identity Hald CLUT image and reads back the
+        transformed pixels. Hald and .cube share the same ordering (red
+        varies fastest, then green, then blue), so each output pixel maps
+        directly to one LUT entry.
+        """
+        size = HALD_LEVEL * HALD_LEVEL
+        image_size = HALD_LEVEL ** 3
+
+        identity = ffmpeg.input(f"haldclutsrc=level={HALD_LEVEL}", f='lavfi')
+        output = ffmpeg.output(
+            identity,
+            'pipe:',
+            vf=f"format=rgb24,{preset.color_filter},format=rgb24",
+            vframes=1,
+            f='rawvideo',
+            pix_fmt='rgb24'
+        )
+        pixels, _ = ffmpeg.run(output, capture_stdout=True, capture_stderr=True)
+
+        expected = image_size * image_size * 3
+        if len(pixels) != expected:
+            raise Exception(f"LUT bake for '{preset.name}' returned {len(pixels)} bytes, expected {expected}")
+
+        lines = [f'TITLE "{preset.name}"', f"LUT_3D_SIZE {size}"]
+        lines.extend(
+            f"{pixels[i] / 255:.6f} {pixels[i + 1] / 255:.6f} {pixels[i + 2] / 255:.6f}"
+            for i in range(0, expected, 3)
+        )
+
+        tmp_path = lut_path.with_name(f".{lut_path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="ascii")
+        os.replace(tmp_path, lut_path)
+        logger.info(f"Baked {size}^3 LUT for filter preset '{preset.name}'")
+
+    def render_chain(self, name: Optional[str]) -> Optional[RenderChain]:
+        """
+        Get the filters to run at render time for a preset.
+
+        Args:
+            name: Preset name
+
+        Returns:
+            LUT plus spatial filters, the original chain if baking is
+            disabled or fails, or None for no filter
+        """
+        preset = self.get(name)
+        if not preset:
+            return None
+
+        chain = []
+        lut_path = None
+        if settings.FILTER_LUT_ENABLED or preset.lut_path:
+            try:
+                lut_path = self.lut_for(preset)
+            except Exception as e:
+                logger.warning(f"Falling back to filter chain for '{preset.name}': {e}")
+
+        if not lut_path and preset.color_filter:
+            chain.append(preset.color_filter)
+
+        if preset.spatial_filter:
+            chain.append(preset.spatial_filter)
+
+        if not lut_path and not chain:
+            return None
+        return RenderChain(lut_path, ",".join(chain) or None)
+
+
+@lru_cache()
+def get_filter_registry() -> FilterPresetRegistry:
+    """Get the process-wide filter preset registry."""
+    return FilterPresetRegistry()
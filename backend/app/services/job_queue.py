@@ -0,0 +1,608 @@
+"""
+Durable render job queue.
+Render nodes claim jobs from the database with renewable leases, so several
+nodes can share one queue and a dead node's jobs are picked up again.
+"""
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import Account, RenderJob, RenderJobKind, RenderJobStatus, VideoProject, ProjectStatus
+from app.services.render_pool import RenderQueueFull
+
+logger = logging.getLogger(__name__)
+
+# Job priorities; higher runs first
+PRIORITY_DEFAULT = 0
+PRIORITY_BACKGROUND = -10  # Best-effort work such as thumbnails
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (SQLite) as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    """Get a nearest-rank percentile of unsorted values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+class JobQueue:
+    """
+    Lease-based render job queue stored in the ``render_jobs`` table.
+
+    Claiming uses ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent
+    workers on PostgreSQL never wait on or pick the same row. The claim
+    itself is a conditional ``UPDATE`` on the job status, which keeps it
+    exclusive on SQLite too, where row locks are not available.
+
+    Jobs are scheduled by priority, then by weighted fair share between
+    accounts, then first-in first-out within an account:
+
+    - A job's effective priority rises by one for every ``aging_seconds``
+      it waits, so low-priority work is never starved.
+    - Among equal priorities, the account that started the fewest jobs in
+      the last ``fair_share_window`` seconds relative to its
+      ``render_weight`` goes next, so a large batch for one account only
+      takes its share of the workers while other accounts' renders keep
+      flowing.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        aging_seconds: Optional[float] = None,
+        fair_share_window: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds if lease_seconds is not None else settings.RENDER_JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts if max_attempts is not None else settings.RENDER_JOB_MAX_ATTEMPTS
+        self.queue_size = queue_size if queue_size is not None else settings.RENDER_QUEUE_SIZE
+        self.aging_seconds = aging_seconds if aging_seconds is not None else settings.RENDER_JOB_AGING_SECONDS
+        self.fair_share_window = (
+            fair_share_window if fair_share_window is not None else settings.RENDER_FAIR_SHARE_WINDOW
+        )
+
+    def enqueue(
+        self,
+        db: Session,
+        kind: RenderJobKind,
+        payload: dict,
+        priority: int = PRIORITY_DEFAULT,
+        account_id: Optional[int] = None
+    ) -> RenderJob:
+        """
+        Add a job to the queue in the caller's transaction.
+
+        The job becomes visible to workers when the caller commits, together
+        with any project status change made in the same session.
+
+        Args:
+            db: Database session
+            kind: Job type
+            payload: Job arguments
+            priority: Scheduling priority (higher runs first)
+            account_id: Account the job renders for
+
+        Returns:
+            Created job
+
+        Raises:
+            RenderQueueFull: If the queue already holds RENDER_QUEUE_SIZE waiting jobs
+        """
+        queued = db.query(func.count(RenderJob.id)).filter(
+            RenderJob.status == RenderJobStatus.QUEUED
+        ).scalar()
+        if queued >= self.queue_size:
+            raise RenderQueueFull("Render queue is full, try again later")
+
+        job = RenderJob(
+            kind=kind,
+            payload=payload,
+            priority=priority,
+            account_id=account_id,
+            max_attempts=self.max_attempts
+        )
+        db.add(job)
+        return job
+
+    def enqueue_project(
+        self,
+        db: Session,
+        project_id: int,
+        cache_key: Optional[str] = None,
+        account_id: Optional[int] = None,
+        priority: int = PRIORITY_DEFAULT
+    ) -> RenderJob:
+        """Queue a render of a video project."""
+        return self.enqueue(
+            db, RenderJobKind.PROJECT, {"project_id": project_id, "cache_key": cache_key}, priority, account_id
+        )
+
+    def enqueue_batch(
+        self,
+        db: Session,
+        project_ids: List[int],
+        account_id: Optional[int] = None,
+        priority: int = PRIORITY_DEFAULT
+    ) -> RenderJob:
+        """Queue a shared-decode render of variant projects."""
+        return self.enqueue(db, RenderJobKind.BATCH, {"project_ids": list(project_ids)}, priority, account_id)
+
+    def enqueue_ingest(self, db: Session, video_id: int, account_id: Optional[int] = None) -> RenderJob:
+        """Queue mezzanine transcoding of an uploaded video."""
+        return self.enqueue(db, RenderJobKind.INGEST, {"video_id": video_id}, account_id=account_id)
+
+    def enqueue_thumbnails(
+        self,
+        db: Session,
+        video_ids: Optional[List[int]] = None,
+        project_ids: Optional[List[int]] = None
+    ) -> Optional[RenderJob]:
+        """
+        Queue poster and sprite generation for videos and rendered projects.
+
+        Thumbnails are best-effort: nothing is queued when THUMBNAIL_ENABLED
+        is off or the queue is full.
+        """
+        if not get_settings().THUMBNAIL_ENABLED or not (video_ids or project_ids):
+            return None
+        try:
+            return self.enqueue(db, RenderJobKind.THUMBNAILS, {
+                "video_ids": list(video_ids or []),
+                "project_ids": list(project_ids or []),
+            }, priority=PRIORITY_BACKGROUND)
+        except RenderQueueFull:
+            logger.warning("Render queue full, skipping thumbnail generation")
+            return None
+
+    def _schedule(self, db: Session, limit: int) -> List[int]:
+        """
+        Pick the next queued jobs to run.
+
+        Only the head (oldest job) of each (account, priority) queue is
+        considered, so the work per claim depends on the number of
+        accounts and priorities in use, not on the queue length.
+
+        Args:
+            db: Database session
+            limit: Maximum number of jobs to pick
+
+        Returns:
+            Job IDs in the order they should start
+        """
+        now = _utcnow()
+        heads = {
+            (account_id, priority): head_id
+            for account_id, priority, head_id in db.query(
+                RenderJob.account_id, RenderJob.priority, func.min(RenderJob.id)
+            ).filter(
+                RenderJob.status == RenderJobStatus.QUEUED
+            ).group_by(RenderJob.account_id, RenderJob.priority).all()
+        }
+        if not heads:
+            return []
+
+        created = dict(
+            db.query(RenderJob.id, RenderJob.created_at).filter(RenderJob.id.in_(heads.values())).all()
+        )
+
+        # Jobs started per account within the window, including running ones
+        usage = dict(
+            db.query(RenderJob.account_id, func.count(RenderJob.id)).filter(
+                RenderJob.started_at >= now - timedelta(seconds=self.fair_share_window)
+            ).group_by(RenderJob.account_id).all()
+        )
+        account_ids = [account_id for account_id, _ in heads if account_id is not None]
+        weights = dict(
+            db.query(Account.id, Account.render_weight).filter(Account.id.in_(account_ids)).all()
+        ) if account_ids else {}
+
+        def rank(group):
+            account_id, priority = group
+            head_id = heads[group]
+            waited = (now - _as_utc(created[head_id])).total_seconds() if created.get(head_id) else 0.0
+            aged = int(waited // self.aging_seconds) if self.aging_seconds > 0 else 0
+            share = usage.get(account_id, 0) / max(1, weights.get(account_id) or 1)
+            return -(priority + aged), share, head_id
+
+        picked = []
+        while heads and len(picked) < limit:
+            group = min(heads, key=rank)
+            picked.append(heads[group])
+            usage[group[0]] = usage.get(group[0], 0) + 1
+
+            # Advance this queue to its next job
+            account_id, priority = group
+            account_filter = (
+                RenderJob.account_id.is_(None) if account_id is None else RenderJob.account_id == account_id
+            )
+            next_job = db.query(RenderJob.id, RenderJob.created_at).filter(
+                RenderJob.status == RenderJobStatus.QUEUED,
+                RenderJob.priority == priority,
+                account_filter,
+                RenderJob.id > heads[group]
+            ).order_by(RenderJob.id).first()
+            if next_job:
+                heads[group] = next_job.id
+                created[next_job.id] = next_job.created_at
+            else:
+                del heads[group]
+
+        return picked
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[RenderJob]:
+        """
+        Take leases on the next queued jobs by priority and fair share.
+
+        Args:
+            worker_id: Unique ID of the claiming worker
+            limit: Maximum number of jobs to claim
+
+        Returns:
+            Claimed jobs, detached from the session
+        """
+        if limit <= 0:
+            return []
+
+        db = self.session_factory()
+        try:
+            now = _utcnow()
+            scheduled_ids = self._schedule(db, limit)
+            if not scheduled_ids:
+                db.rollback()
+                return []
+
+            # Jobs locked by a concurrent claim are skipped, not waited for
+            locked_ids = {
+                row.id for row in db.query(RenderJob.id)
+                .filter(RenderJob.id.in_(scheduled_ids), RenderJob.status == RenderJobStatus.QUEUED)
+                .with_for_update(skip_locked=True)
+                .all()
+            }
+            candidate_ids = [job_id for job_id in scheduled_ids if job_id in locked_ids]
+
+            claimed_ids = []
+            for job_id in candidate_ids:
+                updated = db.query(RenderJob).filter(
+                    RenderJob.id == job_id,
+                    RenderJob.status == RenderJobStatus.QUEUED
+                ).update({
+                    RenderJob.status: RenderJobStatus.RUNNING,
+                    RenderJob.lease_owner: worker_id,
+                    RenderJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                    RenderJob.heartbeat_at: now,
+                    RenderJob.started_at: now,
+                    RenderJob.attempts: RenderJob.attempts + 1,
+                }, synchronize_session=False)
+                if updated:
+                    claimed_ids.append(job_id)
+            db.commit()
+
+            if not claimed_ids:
+                return []
+
+            jobs = {job.id: job for job in db.query(RenderJob).filter(RenderJob.id.in_(claimed_ids)).all()}
+            for job in jobs.values():
+                db.expunge(job)
+            return [jobs[job_id] for job_id in claimed_ids]
+
+        finally:
+            db.close()
+
+    def heartbeat(self, worker_id: str, job_ids: List[int]) -> List[int]:
+        """
+        Renew the leases a worker holds.
+
+        Args:
+            worker_id: Lease owner
+            job_ids: Jobs the worker is running
+
+        Returns:
+            IDs of jobs whose lease the worker still holds
+        """
+        if not job_ids:
+            return []
+
+        db = self.session_factory()
+        try:
+            now = _utcnow()
+            held = db.query(RenderJob).filter(
+                RenderJob.id.in_(job_ids),
+                RenderJob.lease_owner == worker_id,
+                RenderJob.status == RenderJobStatus.RUNNING
+            )
+            held.update({
+                RenderJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                RenderJob.heartbeat_at: now,
+            }, synchronize_session=False)
+            db.commit()
+            return [row.id for row in held.with_entities(RenderJob.id).all()]
+
+        finally:
+            db.close()
+
+    def holds_lease(self, db: Session, worker_id: str, job_id: int) -> bool:
+        """
+        Lock a job row and check that a worker still holds its lease.
+
+        The row stays locked in the caller's transaction, so the lease
+        cannot be requeued by ``requeue_expired`` before the caller commits.
+
+        Args:
+            db: Database session
+            worker_id: Lease owner
+            job_id: Job ID
+
+        Returns:
+            True if the job is running under the worker's lease
+        """
+        return db.query(RenderJob.id).filter(
+            RenderJob.id == job_id,
+            RenderJob.lease_owner == worker_id,
+            RenderJob.status == RenderJobStatus.RUNNING
+        ).with_for_update().first() is not None
+
+    def complete(self, worker_id: str, job_id: int) -> bool:
+        """
+        Mark a job as done.
+
+        Args:
+            worker_id: Lease owner
+            job_id: Job ID
+
+        Returns:
+            False if the worker no longer held the lease
+        """
+        db = self.session_factory()
+        try:
+            updated = db.query(RenderJob).filter(
+                RenderJob.id == job_id,
+                RenderJob.lease_owner == worker_id,
+                RenderJob.status == RenderJobStatus.RUNNING
+            ).update({
+                RenderJob.status: RenderJobStatus.COMPLETED,
+                RenderJob.lease_owner: None,
+                RenderJob.lease_expires_at: None,
+                RenderJob.finished_at: _utcnow(),
+            }, synchronize_session=False)
+            db.commit()
+            return bool(updated)
+
+        finally:
+            db.close()
+
+    def fail(self, worker_id: str, job_id: int, error: str) -> bool:
+        """
+        Record a failed attempt; the job is queued again while attempts remain.
+
+        Args:
+            worker_id: Lease owner
+            job_id: Job ID
+            error: Error message
+
+        Returns:
+            False if the worker no longer held the lease
+        """
+        db = self.session_factory()
+        try:
+            job = db.query(RenderJob).filter(
+                RenderJob.id == job_id,
+                RenderJob.lease_owner == worker_id,
+                RenderJob.status == RenderJobStatus.RUNNING
+            ).with_for_update().first()
+            if not job:
+                db.rollback()
+                return False
+
+            self._end_attempt(db, job, error)
+            db.commit()
+            return True
+
+        finally:
+            db.close()
+
+    def requeue_expired(self) -> Dict[str, int]:
+        """
+        Queue jobs again whose lease ran out, e.g. because their worker died.
+
+        Jobs out of attempts fail for good and their projects are marked failed.
+
+        Returns:
+            Number of requeued and failed jobs
+        """
+        db = self.session_factory()
+        try:
+            expired = db.query(RenderJob).filter(
+                RenderJob.status == RenderJobStatus.RUNNING,
+                RenderJob.lease_expires_at < _utcnow()
+            ).with_for_update(skip_locked=True).all()
+
+            counts = {"requeued": 0, "failed": 0}
+            for job in expired:
+                error = f"Render lease held by {job.lease_owner} expired"
+                requeued = self._end_attempt(db, job, error)
+                counts["requeued" if requeued else "failed"] += 1
+                logger.warning(f"{error}: job {job.id} {'requeued' if requeued else 'failed'}")
+
+            db.commit()
+            return counts
+
+        finally:
+            db.close()
+
+    def _end_attempt(self, db: Session, job: RenderJob, error: str) -> bool:
+        """Requeue a running job, or fail it and its projects if out of attempts."""
+        job.lease_owner = None
+        job.lease_expires_at = None
+        job.last_error = error[:2000]
+        project_ids = job.project_ids
+
+        if job.attempts < job.max_attempts:
+            job.status = RenderJobStatus.QUEUED
+            if project_ids:
+                # The failed attempt marked its projects failed; they are
+                # processing again until the retry finishes
+                db.query(VideoProject).filter(
+                    VideoProject.id.in_(project_ids),
+                    VideoProject.status == ProjectStatus.FAILED
+                ).update({VideoProject.status: ProjectStatus.PROCESSING}, synchronize_session=False)
+            return True
+
+        job.status = RenderJobStatus.FAILED
+        job.finished_at = _utcnow()
+
+        if project_ids:
+            db.query(VideoProject).filter(
+                VideoProject.id.in_(project_ids),
+                VideoProject.status == ProjectStatus.PROCESSING
+            ).update({
+                VideoProject.status: ProjectStatus.FAILED,
+                VideoProject.error_message: f"Render failed after {job.attempts} attempts: {error}"[:2000],
+                VideoProject.eta_seconds: None,
+            }, synchronize_session=False)
+        return False
+
+    def recover_orphaned_projects(self) -> int:
+        """
+        Queue renders for PROCESSING projects that have no active job.
+
+        Covers projects left in PROCESSING by a process that died before
+        their job reached the queue.
+
+        Returns:
+            Number of projects queued again
+        """
+        db = self.session_factory()
+        try:
+            active_ids = set()
+            active_jobs = db.query(RenderJob).filter(
+                RenderJob.status.in_([RenderJobStatus.QUEUED, RenderJobStatus.RUNNING]),
+                RenderJob.kind.in_([RenderJobKind.PROJECT, RenderJobKind.BATCH])
+            ).all()
+            for job in active_jobs:
+                active_ids.update(job.project_ids)
+
+            orphaned = db.query(VideoProject.id, VideoProject.account_id).filter(
+                VideoProject.status == ProjectStatus.PROCESSING
+            ).all()
+
+            recovered = 0
+            for project_id, account_id in orphaned:
+                if project_id in active_ids:
+                    continue
+                db.add(RenderJob(
+                    kind=RenderJobKind.PROJECT,
+                    payload={"project_id": project_id, "cache_key": None},
+                    account_id=account_id,
+                    max_attempts=self.max_attempts
+                ))
+                recovered += 1
+
+            db.commit()
+            if recovered:
+                logger.info(f"Queued {recovered} orphaned processing projects")
+            return recovered
+
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Get job counts by status."""
+        db = self.session_factory()
+        try:
+            counts = dict(
+                db.query(RenderJob.status, func.count(RenderJob.id)).group_by(RenderJob.status).all()
+            )
+            return {status.value: counts.get(status, 0) for status in RenderJobStatus}
+
+        finally:
+            db.close()
+
+    def account_stats(self) -> List[dict]:
+        """
+        Get queue depth and wait times per account.
+
+        Wait times are measured from enqueue to the start of the latest
+        attempt, over jobs started within the fair-share window; queued
+        jobs contribute how long they have waited so far.
+
+        Returns:
+            One entry per account with queued or recently started jobs
+            (account_id None collects jobs without an account)
+        """
+        db = self.session_factory()
+        try:
+            now = _utcnow()
+            accounts: Dict[Optional[int], dict] = {}
+
+            def entry(account_id):
+                if account_id not in accounts:
+                    accounts[account_id] = {"queued": 0, "running": 0, "waits": [], "oldest_queued_seconds": None}
+                return accounts[account_id]
+
+            for account_id, created_at in db.query(RenderJob.account_id, RenderJob.created_at).filter(
+                RenderJob.status == RenderJobStatus.QUEUED
+            ).all():
+                stats = entry(account_id)
+                stats["queued"] += 1
+                waited = (now - _as_utc(created_at)).total_seconds()
+                stats["oldest_queued_seconds"] = max(stats["oldest_queued_seconds"] or 0.0, waited)
+
+            for account_id, status, created_at, started_at in db.query(
+                RenderJob.account_id, RenderJob.status, RenderJob.created_at, RenderJob.started_at
+            ).filter(
+                RenderJob.started_at >= now - timedelta(seconds=self.fair_share_window)
+            ).all():
+                stats = entry(account_id)
+                if status == RenderJobStatus.RUNNING:
+                    stats["running"] += 1
+                stats["waits"].append((_as_utc(started_at) - _as_utc(created_at)).total_seconds())
+
+            weights = dict(
+                db.query(Account.id, Account.render_weight).filter(
+                    Account.id.in_([account_id for account_id in accounts if account_id is not None])
+                ).all()
+            )
+
+            result = []
+            for account_id, stats in sorted(accounts.items(), key=lambda item: (item[0] is None, item[0] or 0)):
+                waits = stats.pop("waits")
+                oldest = stats["oldest_queued_seconds"]
+                result.append({
+                    "account_id": account_id,
+                    "weight": weights.get(account_id, 1),
+                    "queued": stats["queued"],
+                    "running": stats["running"],
+                    "oldest_queued_seconds": round(oldest, 1) if oldest is not None else None,
+                    "wait_avg_seconds": round(sum(waits) / len(waits), 1) if waits else None,
+                    "wait_p95_seconds": round(_percentile(waits, 95), 1) if waits else None,
+                })
+            return result
+
+        finally:
+            db.close()
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """Get the process-wide render job queue."""
+    return JobQueue()
@@ -0,0 +1,303 @@
+"""
+Media probe service.
+Caches ffprobe results so each file version is probed once.
+"""
+import hashlib
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import ffmpeg
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def parse_frame_rate(value: Optional[str]) -> float:
+    """
+    Parse an ffprobe frame rate such as "30000/1001" or "25".
+
+    Args:
+        value: Frame rate string
+
+    Returns:
+        Frames per second, or 0.0 if unknown
+    """
+    if not value:
+        return 0.0
+    try:
+        rate = Fraction(value)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+    return round(float(rate), 3)
+
+
+def _probe_cache_dir() -> Path:
+    path = Path(settings.UPLOAD_DIR) / "probe"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@lru_cache(maxsize=settings.PROBE_CACHE_SIZE)
+def _cached_probe(file_path: str, size: int, mtime_ns: int) -> dict:
+    """
+    Probe a file version, backed by a JSON file on disk.
+
+    The JSON file records the probed path, size and mtime next to the
+    result, so ``prune_probe_cache`` can drop it once the file changes or goes.
+    """
+    key = hashlib.sha1(f"{file_path}:{size}:{mtime_ns}".encode("utf-8")).hexdigest()
+    cache_path = _probe_cache_dir() / f"{key}.json"
+
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))["probe"]
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        pass
+
+    try:
+        probe = ffmpeg.probe(file_path)
+    except ffmpeg.Error as e:
+        error_message = e.stderr.decode() if e.stderr else str(e)
+        raise Exception(f"Failed to probe media: {error_message}")
+
+    entry = {"source": file_path, "size": size, "mtime_ns": mtime_ns, "probe": probe}
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+    return probe
+
+
+def _probe_entry_is_stale(cache_path: Path) -> bool:
+    """Check if a cached probe's file was deleted or changed since it was probed."""
+    try:
+        entry = json.loads(cache_path.read_text(encoding="utf-8"))
+        stat = os.stat(entry["source"])
+    except FileNotFoundError:
+        return True
+    except (OSError, ValueError, KeyError, TypeError):
+        # Unreadable, or written before entries recorded their source
+        return True
+    return (stat.st_size, stat.st_mtime_ns) != (entry["size"], entry["mtime_ns"])
+
+
+def prune_probe_cache() -> int:
+    """
+    Delete cached probes of files that were deleted or changed.
+
+    Returns:
+        Number of deleted cache entries
+    """
+    pruned = 0
+    for cache_path in _probe_cache_dir().glob("*.json"):
+        if _probe_entry_is_stale(cache_path):
+            cache_path.unlink(missing_ok=True)
+            pruned += 1
+
+    if pruned:
+        logger.info(f"Pruned {pruned} stale probe cache entries")
+    return pruned
+
+
+def probe_media(file_path: str) -> dict:
+    """
+    Get the ffprobe output for a file.
+
+    Results are cached in memory (LRU) and under ``UPLOAD_DIR/probe``,
+    keyed by path, size and modification time, so a changed file is
+    probed again and an unchanged one never is.
+
+    Args:
+        file_path: Path to media file
+
+    Returns:
+        ffprobe output with ``format`` and ``streams``
+
+    Raises:
+        Exception: If the file is missing or ffprobe fails
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    return _cached_probe(path, stat.st_size, stat.st_mtime_ns)
+
+
+def stream_codec(file_path: str, codec_type: str) -> Optional[str]:
+    """
+    Get the codec name of the first stream of a type.
+
+    Args:
+        file_path: Path to media file
+        codec_type: Stream type ("video" or "audio")
+
+    Returns:
+        Codec name, or None if the file has no such stream or can't be probed
+    """
+    try:
+        probe = probe_media(file_path)
+    except Exception:
+        return None
+
+    stream = next(
+        (stream for stream in probe['streams'] if stream['codec_type'] == codec_type),
+        None
+    )
+    return stream.get('codec_name') if stream else None
+
+
+def display_size(file_path: str) -> Tuple[int, int]:
+    """
+    Get the frame size FFmpeg decodes a video to.
+
+    Rotated sources (phone footage stored landscape with a 90/270 degree
+    rotation tag or display matrix) are autorotated on decode, so their
+    width and height are swapped.
+
+    Args:
+        file_path: Path to video file
+
+    Returns:
+        Tuple of (width, height), or (0, 0) if the file has no video stream
+
+    Raises:
+        Exception: If the file is missing or ffprobe fails
+    """
+    probe = probe_media(file_path)
+    video_stream = next(
+        (stream for stream in probe['streams'] if stream['codec_type'] == 'video'),
+        None
+    )
+    if not video_stream:
+        return 0, 0
+
+    width = int(video_stream.get('width', 0))
+    height = int(video_stream.get('height', 0))
+
+    rotation = video_stream.get('tags', {}).get('rotate')
+    for side_data in video_stream.get('side_data_list', []):
+        if 'rotation' in side_data:
+            rotation = side_data['rotation']
+    try:
+        rotation = int(float(rotation or 0))
+    except ValueError:
+        rotation = 0
+
+    if rotation % 180:
+        return height, width
+    return width, height
+
+
+def get_media_info(file_path: str) -> dict:
+    """
+    Get a summary of a video file's metadata.
+
+    Args:
+        file_path: Path to video file
+
+    Returns:
+        Dictionary with duration, width, height, codec, fps, size, bit_rate
+        and audio_codec; empty if the file has no video stream
+
+    Raises:
+        Exception: If the file is missing or ffprobe fails
+    """
+    probe = probe_media(file_path)
+    video_stream = next(
+        (stream for stream in probe['streams'] if stream['codec_type'] == 'video'),
+        None
+    )
+    if not video_stream:
+        return {}
+
+    audio_stream = next(
+        (stream for stream in probe['streams'] if stream['codec_type'] == 'audio'),
+        None
+    )
+    return {
+        'duration': float(probe['format'].get('duration') or video_stream.get('duration') or 0),
+        'width': int(video_stream.get('width', 0)),
+        'height': int(video_stream.get('height', 0)),
+        'codec': video_stream.get('codec_name', 'unknown'),
+        'fps': parse_frame_rate(video_stream.get('avg_frame_rate') or video_stream.get('r_frame_rate')),
+        'size': int(probe['format'].get('size', 0)),
+        'bit_rate': int(probe['format'].get('bit_rate') or 0),
+        'audio_codec': audio_stream.get('codec_name') if audio_stream else None,
+    }
+
+
+def apply_media_info(video, info: dict) -> None:
+    """
+    Copy probed metadata onto a Video row.
+
+    Args:
+        video: Video instance
+        info: Metadata from get_media_info
+    """
+    if not info:
+        return
+    video.duration = info['duration']
+    video.width = info['width']
+    video.height = info['height']
+    video.fps = info['fps']
+    video.codec = info['codec']
+    video.bit_rate = info['bit_rate']
+    video.size = info['size'] or video.size
+
+
+def backfill_media_info(video_ids: Optional[List[int]] = None, force: bool = False) -> dict:
+    """
+    Probe stored videos in parallel and save their metadata.
+
+    Cached probes of deleted or changed files are pruned afterwards.
+
+    Args:
+        video_ids: Videos to probe (default: all)
+        force: Re-probe videos that already have a duration
+
+    Returns:
+        Number of updated, failed and skipped videos, and of pruned cache entries
+    """
+    from app.database import SessionLocal
+    from app.models import Video
+
+    db = SessionLocal()
+    try:
+        query = db.query(Video)
+        if video_ids:
+            query = query.filter(Video.id.in_(video_ids))
+        if not force:
+            query = query.filter(Video.duration.is_(None))
+        videos = query.all()
+
+        def probe(video):
+            try:
+                return video, get_media_info(video.file_path), None
+            except Exception as e:
+                return video, None, e
+
+        counts = {"updated": 0, "failed": 0, "skipped": 0}
+        workers = settings.PROBE_WORKERS or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for video, info, error in executor.map(probe, videos):
+                if error:
+                    logger.warning(f"Probe of video {video.id} failed: {error}")
+                    counts["failed"] += 1
+                elif not info:
+                    counts["skipped"] += 1
+                else:
+                    apply_media_info(video, info)
+                    counts["updated"] += 1
+
+        db.commit()
+        counts["pruned"] = prune_probe_cache()
+        return counts
+
+    finally:
+        db.close()
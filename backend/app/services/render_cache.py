@@ -0,0 +1,249 @@
+"""
+Content-addressed render cache.
+Reuses finished renders when the same inputs and parameters come back.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from app.config import get_settings
+from app.services.encoder_profiles import get_encoder_profile
+from app.services.filter_presets import get_filter_registry
+from app.utils.helpers import calculate_file_hash
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bump when the render pipeline changes output for identical inputs
+CACHE_VERSION = 3
+
+
+@lru_cache(maxsize=1024)
+def _cached_file_hash(file_path: str, size: int, mtime_ns: int) -> str:
+    """Hash a file, memoized on its path, size and modification time."""
+    return calculate_file_hash(file_path)
+
+
+def file_content_hash(file_path: str) -> str:
+    """
+    Get the SHA-256 of a file, skipping the read if it is unchanged.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Hex digest of file content
+    """
+    stat = os.stat(file_path)
+    return _cached_file_hash(str(file_path), stat.st_size, stat.st_mtime_ns)
+
+
+class RenderCache:
+    """
+    Size-bounded LRU cache of rendered videos.
+
+    Entries live under ``UPLOAD_DIR/projects/cache`` as ``<key>.mp4``.
+    The file modification time records the last use; when the cache grows
+    beyond its size limit the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.output_dir = Path(settings.UPLOAD_DIR) / "projects"
+        self.cache_dir = Path(cache_dir) if cache_dir else self.output_dir / "cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.RENDER_CACHE_MAX_BYTES
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp4"
+
+    def make_key(
+        self,
+        video_path: str,
+        audio_path: Optional[str] = None,
+        filter_type: str = "none",
+        audio_volume: int = 100,
+        subtitle_text: Optional[str] = None,
+        uniquify_subtitles: bool = False,
+        normalize_audio: bool = False,
+        encoder_profile: Optional[str] = None,
+        subtitle_cues: Optional[List[dict]] = None
+    ) -> str:
+        """
+        Build a cache key from input content and render parameters.
+
+        Args:
+            video_path: Path to source video file
+            audio_path: Path to audio file (optional)
+            filter_type: Filter preset name
+            audio_volume: Audio volume (0-100)
+            subtitle_text: Subtitle text (optional)
+            uniquify_subtitles: Unique subtitle styling flag
+            normalize_audio: Audio loudness normalization flag
+            encoder_profile: Encoder profile name
+            subtitle_cues: Timed subtitle cues (optional)
+
+        Returns:
+            Hex digest identifying the render
+        """
+        params = {
+            "version": CACHE_VERSION,
+            "video": file_content_hash(video_path),
+            "audio": file_content_hash(audio_path) if audio_path else None,
+            "filter": get_filter_registry().fingerprint(filter_type),
+            "audio_volume": audio_volume if audio_path else None,
+            "normalize_audio": bool(normalize_audio) if audio_path else False,
+            "subtitle_text": subtitle_text or None,
+            "subtitle_cues": subtitle_cues or None,
+            "uniquify_subtitles": bool(uniquify_subtitles) if subtitle_text or subtitle_cues else False,
+            "encoder_profile": get_encoder_profile(encoder_profile).fingerprint,
+        }
+        payload = json.dumps(params, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def key_for_project(self, project, source_path: Optional[str] = None) -> Optional[str]:
+        """
+        Build the cache key for a video project.
+
+        Args:
+            project: VideoProject instance
+            source_path: File the render reads instead of video_track_path
+                (e.g. its mezzanine copy)
+
+        Returns:
+            Cache key, or None if an input file is missing
+        """
+        try:
+            return self.make_key(
+                video_path=source_path or project.video_track_path,
+                audio_path=project.audio_track_path,
+                filter_type=project.effective_filter,
+                audio_volume=project.audio_volume,
+                subtitle_text=project.subtitle_text,
+                uniquify_subtitles=project.uniquify_subtitles,
+                normalize_audio=project.normalize_audio,
+                encoder_profile=project.encoder_profile.value,
+                subtitle_cues=project.subtitle_cues
+            )
+        except OSError:
+            return None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached render and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Path to cached file, or None on a miss
+        """
+        entry = self._entry_path(key)
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            return None
+        return str(entry)
+
+    def checkout(self, key: str) -> Optional[str]:
+        """
+        Get a project output path for a cached render.
+
+        The cached file is hard-linked into the projects directory, so the
+        output survives eviction of the cache entry without copying data.
+        Where hard links are unsupported (e.g. the cache is on another
+        filesystem) it is copied instead. Blocking; call it off the event loop.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Path to output file, or None on a miss
+        """
+        cached_path = self.get(key)
+        if not cached_path:
+            return None
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = self.output_dir / f"cached_{timestamp}_{str(uuid.uuid4())[:8]}.mp4"
+        try:
+            try:
+                os.link(cached_path, output_path)
+            except OSError:
+                shutil.copy2(cached_path, output_path)
+        except OSError as e:
+            # Evicted meanwhile or out of space: render instead
+            output_path.unlink(missing_ok=True)
+            logger.warning(f"Could not check out cached render {key}: {e}")
+            return None
+        return str(output_path)
+
+    def put(self, key: str, output_path: str) -> None:
+        """
+        Store a finished render in the cache.
+
+        Args:
+            key: Cache key
+            output_path: Path to rendered file
+        """
+        entry = self._entry_path(key)
+        tmp_entry = self.cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            try:
+                os.link(output_path, tmp_entry)
+            except OSError:
+                shutil.copyfile(output_path, tmp_entry)
+            os.replace(tmp_entry, entry)
+        except OSError as e:
+            tmp_entry.unlink(missing_ok=True)
+            logger.warning(f"Could not cache render {output_path}: {e}")
+            return
+
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Evict least recently used entries until the cache fits its size limit.
+
+        Returns:
+            Number of evicted entries
+        """
+        entries = []
+        total_size = 0
+        for entry in self.cache_dir.glob("*.mp4"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total_size += stat.st_size
+
+        evicted = 0
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total_size <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total_size -= size
+            evicted += 1
+
+        return evicted
+
+    def stats(self) -> dict:
+        """Get cache entry count and size."""
+        sizes = []
+        for entry in self.cache_dir.glob("*.mp4"):
+            try:
+                sizes.append(entry.stat().st_size)
+            except FileNotFoundError:
+                continue
+        return {
+            "entries": len(sizes),
+            "size_bytes": sum(sizes),
+            "max_bytes": self.max_bytes,
+        }
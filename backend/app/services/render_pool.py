@@ -0,0 +1,609 @@
+"""
+Render worker pool.
+Runs FFmpeg renders in dedicated worker processes so they never compete
+with API request handling.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from app.config import get_settings
+from app.services.resource_governor import ResourceGovernor, get_resource_governor, lower_process_priority
+from app.services.storage import get_storage
+from app.services.workspace import reclaim_stale_workspaces
+
+logger = logging.getLogger(__name__)
+
+
+class RenderQueueFull(Exception):
+    """Raised when the render queue has no free slots."""
+
+
+class ProjectProgress:
+    """
+    Progress callback that persists render stats on VideoProject rows.
+
+    FFmpeg reports progress about twice a second; writes are throttled to
+    one commit per ``interval`` seconds, plus the final update.
+    """
+
+    def __init__(self, db, projects: list, interval: Optional[float] = None):
+        self.db = db
+        self.projects = projects
+        self.interval = interval if interval is not None else get_settings().RENDER_PROGRESS_INTERVAL
+        self.started_at = time.monotonic()
+        self._last_write = 0.0
+
+    def __call__(self, stats: dict) -> None:
+        now = time.monotonic()
+        if not stats['finished'] and now - self._last_write < self.interval:
+            return
+        self._last_write = now
+
+        for project in self.projects:
+            project.progress = stats['percent']
+            project.render_fps = stats['fps']
+            project.render_speed = stats['speed']
+            project.eta_seconds = stats['eta_seconds']
+        self.db.commit()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the render started."""
+        return time.monotonic() - self.started_at
+
+
+def resolve_render_source(db, video_path: str) -> str:
+    """
+    Get the file a render should read for a source video path.
+
+    Uploads that went through ingest have a mezzanine copy with a
+    predictable format and keyframe interval; renders prefer it. A source
+    mirrored to object storage is downloaded first if this host lacks it.
+
+    Args:
+        db: Database session
+        video_path: Source video path as stored on the project
+
+    Returns:
+        Mezzanine path if one exists, otherwise the given path
+    """
+    from app.models import Video
+
+    video = db.query(Video).filter(
+        Video.file_path == video_path,
+        Video.mezzanine_path.isnot(None)
+    ).first()
+    if video and Path(video.mezzanine_path).exists():
+        return video.mezzanine_path
+    return get_storage().localize(video_path)
+
+
+def _lease_held(db, job_id: Optional[int], worker_id: Optional[str]) -> bool:
+    """
+    Check that the queue job a render runs for still holds its lease.
+
+    The job row stays locked until the caller commits, so the lease cannot
+    expire and be retried between the check and writing the result.
+    Renders started outside the queue (no job ID) always hold it.
+    """
+    if job_id is None:
+        return True
+
+    from app.services.job_queue import get_job_queue
+
+    return get_job_queue().holds_lease(db, worker_id, job_id)
+
+
+def ingest_video(video_id: int, threads: int = 0) -> None:
+    """
+    Transcode an uploaded video into the mezzanine format in a worker process.
+
+    Args:
+        video_id: Video ID
+        threads: x264 thread budget for the encode
+
+    Raises:
+        Exception: If the transcode fails (the queue retries the job)
+    """
+    from app.database import SessionLocal
+    from app.models import Video
+    from app.services.video_generator import VideoGenerator
+    from app.services.workspace import RenderWorkspace
+
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if not video:
+            logger.warning(f"Ingest skipped: video {video_id} no longer exists")
+            return
+
+        # An identical upload queued earlier may have been transcoded meanwhile
+        existing = db.query(Video).filter(
+            Video.file_path == video.file_path,
+            Video.mezzanine_path.isnot(None)
+        ).first()
+        if existing and Path(existing.mezzanine_path).exists():
+            video.mezzanine_path = existing.mezzanine_path
+            db.commit()
+            logger.info(f"Ingest of video {video_id} reuses the mezzanine of video {existing.id}")
+            return
+
+        try:
+            with RenderWorkspace(prefix=f"ingest{video_id}") as workspace:
+                generator = VideoGenerator(threads=threads, workspace=workspace)
+                video.mezzanine_path = generator.create_mezzanine(get_storage().localize(video.file_path))
+            db.commit()
+        except Exception as e:
+            logger.error(f"Ingest of video {video_id} failed: {e}")
+            raise
+
+    finally:
+        db.close()
+
+
+def generate_thumbnails(video_ids: List[int], project_ids: List[int]) -> None:
+    """
+    Generate posters and preview sprites for uploads and rendered outputs.
+
+    Args:
+        video_ids: Uploaded video IDs
+        project_ids: Completed project IDs
+    """
+    from app.database import SessionLocal
+    from app.models import Video, VideoProject
+    from app.services.thumbnails import ThumbnailGenerator
+
+    db = SessionLocal()
+    try:
+        generator = ThumbnailGenerator()
+        targets = []
+        if video_ids:
+            targets += [(video, video.file_path) for video in db.query(Video).filter(Video.id.in_(video_ids)).all()]
+        if project_ids:
+            targets += [
+                (project, project.output_path)
+                for project in db.query(VideoProject).filter(VideoProject.id.in_(project_ids)).all()
+                if project.output_path
+            ]
+
+        for target, file_path in targets:
+            try:
+                previews = generator.generate(get_storage().localize(file_path))
+            except Exception as e:
+                logger.warning(f"Thumbnail generation for {file_path} failed: {e}")
+                continue
+            target.thumbnail_path = previews["thumbnail_path"]
+            target.sprite_path = previews["sprite_path"]
+            target.sprite_vtt_path = previews["sprite_vtt_path"]
+            db.commit()
+
+    finally:
+        db.close()
+
+
+def render_project(
+    project_id: int,
+    threads: int = 0,
+    cache_key: Optional[str] = None,
+    job_id: Optional[int] = None,
+    worker_id: Optional[str] = None
+) -> None:
+    """
+    Render a video project inside a worker process.
+
+    Opens its own database session, since the request session that
+    scheduled the job is closed by the time the job runs. The result is
+    only written while the queue job still holds its lease, so a render
+    that outlived its lease cannot overwrite a newer attempt.
+
+    Args:
+        project_id: Project ID
+        threads: x264 thread budget for the encode
+        cache_key: Render cache key to store the output under (optional)
+        job_id: Queue job the render runs for (optional)
+        worker_id: Worker holding the job's lease (optional)
+
+    Raises:
+        Exception: If the render fails, after the project is marked failed
+            (the queue retries the job while attempts remain)
+    """
+    from app.database import SessionLocal
+    from app.models import VideoProject, ProjectStatus
+    from app.services.job_queue import get_job_queue
+    from app.services.render_cache import RenderCache
+    from app.services.video_generator import VideoGenerator
+    from app.services.workspace import RenderWorkspace
+
+    db = SessionLocal()
+    try:
+        project = db.query(VideoProject).filter(VideoProject.id == project_id).first()
+        if not project:
+            logger.warning(f"Render skipped: project {project_id} no longer exists")
+            return
+
+        progress = ProjectProgress(db, [project])
+
+        try:
+            with RenderWorkspace(prefix=f"project{project_id}") as workspace:
+                generator = VideoGenerator(
+                    threads=threads,
+                    progress_callback=progress,
+                    workspace=workspace,
+                    profile=project.encoder_profile.value
+                )
+                output_path = generator.composite_video(
+                    video_path=resolve_render_source(db, project.video_track_path),
+                    audio_path=project.audio_track_path,
+                    subtitle_text=project.subtitle_text,
+                    subtitle_cues=project.subtitle_cues,
+                    volume=project.audio_volume,
+                    filter_type=project.effective_filter,
+                    uniquify=project.uniquify_subtitles,
+                    segmented=project.segmented_render,
+                    normalize_audio=project.normalize_audio
+                )
+
+        except Exception as e:
+            db.rollback()
+            if _lease_held(db, job_id, worker_id):
+                project.status = ProjectStatus.FAILED
+                project.error_message = str(e)
+                project.eta_seconds = None
+                db.commit()
+            raise
+
+        if not _lease_held(db, job_id, worker_id):
+            db.rollback()
+            Path(output_path).unlink(missing_ok=True)
+            logger.warning(f"Render of project {project_id} finished after job {job_id} lost its lease; discarded")
+            return
+
+        if cache_key:
+            RenderCache().put(cache_key, output_path)
+
+        project.output_path = output_path
+        project.status = ProjectStatus.COMPLETED
+        project.progress = 100.0
+        project.eta_seconds = 0.0
+        get_job_queue().enqueue_thumbnails(db, project_ids=[project_id])
+        db.commit()
+
+        logger.info(
+            f"Rendered project {project_id} (filter={project.effective_filter}) "
+            f"in {progress.elapsed:.1f}s at {project.render_fps or 0:.1f} fps, "
+            f"{project.render_speed or 0:.2f}x realtime"
+        )
+
+    finally:
+        db.close()
+
+
+def render_preview(project_id: int, threads: int = 0) -> str:
+    """
+    Render a quick low-resolution preview of a project with the draft profile.
+
+    The project status, output and render cache are left untouched; only
+    ``preview_path`` is updated.
+
+    Args:
+        project_id: Project ID
+        threads: x264 thread budget for the encode
+
+    Returns:
+        Path to preview file
+
+    Raises:
+        Exception: If the project is missing or the render fails
+    """
+    from app.database import SessionLocal
+    from app.models import VideoProject
+    from app.services.video_generator import VideoGenerator
+    from app.services.workspace import RenderWorkspace
+
+    db = SessionLocal()
+    try:
+        project = db.query(VideoProject).filter(VideoProject.id == project_id).first()
+        if not project:
+            raise Exception(f"Project {project_id} no longer exists")
+
+        started_at = time.monotonic()
+        with RenderWorkspace(prefix=f"preview{project_id}") as workspace:
+            generator = VideoGenerator(threads=threads, workspace=workspace, profile="draft")
+            preview_path = generator.composite_video(
+                video_path=resolve_render_source(db, project.video_track_path),
+                audio_path=project.audio_track_path,
+                subtitle_text=project.subtitle_text,
+                subtitle_cues=project.subtitle_cues,
+                volume=project.audio_volume,
+                filter_type=project.effective_filter,
+                uniquify=project.uniquify_subtitles,
+                normalize_audio=project.normalize_audio
+            )
+
+        # Each preview replaces the previous one
+        previous_path = project.preview_path
+        project.preview_path = preview_path
+        db.commit()
+        if previous_path and previous_path != preview_path:
+            Path(previous_path).unlink(missing_ok=True)
+
+        logger.info(f"Rendered preview of project {project_id} in {time.monotonic() - started_at:.1f}s")
+        return preview_path
+
+    finally:
+        db.close()
+
+
+def render_batch(
+    project_ids: List[int],
+    threads: int = 0,
+    job_id: Optional[int] = None,
+    worker_id: Optional[str] = None
+) -> None:
+    """
+    Render variants of one source video in a single worker process.
+
+    All projects must share the same source video, audio track, volume,
+    audio normalization and encoder profile.
+    The source is decoded once and every variant is encoded in the same
+    FFmpeg run.
+
+    Args:
+        project_ids: Project IDs, one per variant
+        threads: x264 thread budget per variant encode
+        job_id: Queue job the render runs for (optional)
+        worker_id: Worker holding the job's lease (optional)
+
+    Raises:
+        Exception: If the render fails, after the projects are marked failed
+            (the queue retries the job while attempts remain)
+    """
+    from app.database import SessionLocal
+    from app.models import VideoProject, ProjectStatus
+    from app.services.job_queue import get_job_queue
+    from app.services.render_cache import RenderCache
+    from app.services.video_generator import VideoGenerator
+    from app.services.workspace import RenderWorkspace
+
+    db = SessionLocal()
+    try:
+        projects = db.query(VideoProject).filter(VideoProject.id.in_(project_ids)).all()
+        if not projects:
+            logger.warning(f"Batch render skipped: projects {project_ids} no longer exist")
+            return
+
+        projects.sort(key=lambda project: project.id)
+        first = projects[0]
+        source_path = resolve_render_source(db, first.video_track_path)
+
+        progress = ProjectProgress(db, projects)
+
+        try:
+            with RenderWorkspace(prefix=f"batch{first.id}") as workspace:
+                generator = VideoGenerator(
+                    threads=threads,
+                    progress_callback=progress,
+                    workspace=workspace,
+                    profile=first.encoder_profile.value
+                )
+                output_paths = generator.composite_batch(
+                    video_path=source_path,
+                    variants=[
+                        {
+                            "filter_type": project.effective_filter,
+                            "subtitle_text": project.subtitle_text,
+                            "subtitle_cues": project.subtitle_cues,
+                            "uniquify": project.uniquify_subtitles,
+                        }
+                        for project in projects
+                    ],
+                    audio_path=first.audio_track_path,
+                    volume=first.audio_volume,
+                    normalize_audio=first.normalize_audio
+                )
+
+        except Exception as e:
+            db.rollback()
+            if _lease_held(db, job_id, worker_id):
+                for project in projects:
+                    project.status = ProjectStatus.FAILED
+                    project.error_message = str(e)
+                    project.eta_seconds = None
+                db.commit()
+            raise
+
+        if not _lease_held(db, job_id, worker_id):
+            db.rollback()
+            for output_path in output_paths:
+                Path(output_path).unlink(missing_ok=True)
+            logger.warning(f"Batch render {project_ids} finished after job {job_id} lost its lease; discarded")
+            return
+
+        cache = RenderCache()
+        for project, output_path in zip(projects, output_paths):
+            cache_key = cache.key_for_project(project, source_path)
+            if cache_key:
+                cache.put(cache_key, output_path)
+
+            project.output_path = output_path
+            project.status = ProjectStatus.COMPLETED
+            project.progress = 100.0
+            project.eta_seconds = 0.0
+        get_job_queue().enqueue_thumbnails(db, project_ids=[project.id for project in projects])
+        db.commit()
+
+        logger.info(
+            f"Rendered batch of {len(projects)} variants in {progress.elapsed:.1f}s "
+            f"at {first.render_fps or 0:.1f} fps, {first.render_speed or 0:.2f}x realtime"
+        )
+
+    finally:
+        db.close()
+
+
+class RenderPool:
+    """
+    Bounded pool of persistent render worker processes.
+
+    At most ``max_workers`` renders run at once; up to ``queue_size``
+    more wait for a free worker. Submissions beyond that are rejected
+    with RenderQueueFull instead of piling up unbounded.
+
+    Worker processes run at lowered CPU and I/O priority. With a resource
+    governor, ``idle_workers`` also holds back slots while the host is
+    short on memory.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        queue_size: int,
+        threads_per_job: int = 0,
+        governor: Optional[ResourceGovernor] = None
+    ):
+        self.max_workers = max(1, max_workers)
+        self.queue_size = max(0, queue_size)
+        self.threads_per_job = threads_per_job
+        self.governor = governor
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.queue_size)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start worker processes on first use."""
+        with self._lock:
+            if self._executor is None:
+                # Workers of a previous pool may have died mid-render
+                reclaim_stale_workspaces()
+                settings = get_settings()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=lower_process_priority,
+                    initargs=(settings.RENDER_NICE, settings.RENDER_IONICE_CLASS, settings.RENDER_IONICE_LEVEL)
+                )
+            return self._executor
+
+    def _on_done(self, future: Future) -> None:
+        """Release the queue slot and log unexpected worker failures."""
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Render job crashed: {future.exception()}")
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """
+        Queue a job for a worker process.
+
+        Args:
+            fn: Module-level function to run in the worker
+            *args: Picklable arguments for the function
+
+        Returns:
+            Future for the job result
+
+        Raises:
+            RenderQueueFull: If all workers are busy and the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            raise RenderQueueFull("Render queue is full, try again later")
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._active += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def submit_project(
+        self,
+        project_id: int,
+        cache_key: Optional[str] = None,
+        job_id: Optional[int] = None,
+        worker_id: Optional[str] = None
+    ) -> Future:
+        """Queue a render of a video project (for a queue job leased by worker_id)."""
+        return self.submit(render_project, project_id, self.threads_per_job, cache_key, job_id, worker_id)
+
+    def submit_preview(self, project_id: int) -> Future:
+        """Queue a draft preview render of a video project."""
+        return self.submit(render_preview, project_id, self.threads_per_job)
+
+    def submit_batch(
+        self,
+        project_ids: List[int],
+        job_id: Optional[int] = None,
+        worker_id: Optional[str] = None
+    ) -> Future:
+        """Queue a shared-decode render of variant projects (for a queue job leased by worker_id)."""
+        return self.submit(render_batch, list(project_ids), self.threads_per_job, job_id, worker_id)
+
+    def submit_ingest(self, video_id: int) -> Future:
+        """Queue mezzanine transcoding of an uploaded video."""
+        return self.submit(ingest_video, video_id, self.threads_per_job)
+
+    def idle_workers(self) -> int:
+        """Get the number of jobs that can start now without waiting or overloading the host."""
+        with self._lock:
+            active = self._active
+        idle = max(0, self.max_workers - active)
+        if self.governor is not None:
+            idle = min(idle, self.governor.admissible(min(active, self.max_workers)))
+        return idle
+
+    def restart(self) -> None:
+        """Replace a broken executor; the next submission starts fresh workers."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit_thumbnails(self, video_ids: List[int], project_ids: List[int]) -> Future:
+        """Queue poster and sprite generation."""
+        return self.submit(generate_thumbnails, list(video_ids), list(project_ids))
+
+    def stats(self) -> dict:
+        """Get current pool usage."""
+        with self._lock:
+            active = self._active
+        return {
+            "max_workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "running": min(active, self.max_workers),
+            "queued": max(0, active - self.max_workers),
+            "threads_per_job": self.threads_per_job,
+            "host": self.governor.stats(min(active, self.max_workers)) if self.governor else None,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+@lru_cache()
+def get_render_pool() -> RenderPool:
+    """Get the process-wide render pool."""
+    settings = get_settings()
+    governor = get_resource_governor()
+    return RenderPool(
+        max_workers=governor.slots,
+        queue_size=settings.RENDER_QUEUE_SIZE,
+        threads_per_job=governor.threads_per_job,
+        governor=governor
+    )
@@ -0,0 +1,154 @@
+"""
+Render worker.
+Pulls jobs from the durable queue and runs them on the local render pool.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, Optional
+
+from app.config import get_settings
+from app.models import RenderJob, RenderJobKind
+from app.services.job_queue import JobQueue, get_job_queue
+from app.services.render_pool import RenderPool, get_render_pool
+
+logger = logging.getLogger(__name__)
+
+
+class RenderWorker:
+    """
+    Dispatcher that feeds the local render pool from the job queue.
+
+    A background thread claims jobs only while the pool has an idle
+    worker process, renews the leases of running jobs, and requeues jobs
+    whose lease expired on any node. Any number of nodes can run a
+    worker against the same database.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        pool: Optional[RenderPool] = None,
+        poll_interval: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.queue = queue or get_job_queue()
+        self.pool = pool or get_render_pool()
+        self.poll_interval = poll_interval if poll_interval is not None else settings.RENDER_JOB_POLL_INTERVAL
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._lock = threading.Lock()
+        self._running: Dict[int, Future] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_heartbeat = 0.0
+
+    def start(self) -> None:
+        """Start the dispatcher thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self.queue.recover_orphaned_projects()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="render-worker", daemon=True)
+        self._thread.start()
+        logger.info(f"Render worker {self.worker_id} started")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop claiming jobs.
+
+        Renders already running keep going; if the process exits before
+        they finish, their leases expire and another worker retries them.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Render worker poll failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def tick(self) -> None:
+        """Renew leases, requeue expired jobs and claim work for idle workers."""
+        now = time.monotonic()
+        if now - self._last_heartbeat >= self.queue.lease_seconds / 3:
+            self._last_heartbeat = now
+            with self._lock:
+                job_ids = list(self._running)
+            held = set(self.queue.heartbeat(self.worker_id, job_ids))
+            for job_id in set(job_ids) - held:
+                logger.warning(f"Lost lease on render job {job_id}")
+            self.queue.requeue_expired()
+
+        for job in self.queue.claim(self.worker_id, self.pool.idle_workers()):
+            self._start(job)
+
+    def _start(self, job: RenderJob) -> None:
+        """Hand a claimed job to the render pool."""
+        payload = job.payload
+        try:
+            if job.kind == RenderJobKind.PROJECT:
+                future = self.pool.submit_project(
+                    payload["project_id"], payload.get("cache_key"), job.id, self.worker_id
+                )
+            elif job.kind == RenderJobKind.BATCH:
+                future = self.pool.submit_batch(payload["project_ids"], job.id, self.worker_id)
+            elif job.kind == RenderJobKind.THUMBNAILS:
+                future = self.pool.submit_thumbnails(payload["video_ids"], payload["project_ids"])
+            else:
+                future = self.pool.submit_ingest(payload["video_id"])
+        except Exception as e:
+            self.queue.fail(self.worker_id, job.id, str(e))
+            return
+
+        with self._lock:
+            self._running[job.id] = future
+        future.add_done_callback(lambda done, job_id=job.id: self._on_done(job_id, done))
+
+    def _on_done(self, job_id: int, future: Future) -> None:
+        """Record the job result once its render finishes."""
+        with self._lock:
+            self._running.pop(job_id, None)
+
+        error = None
+        if future.cancelled():
+            error = "Render was cancelled"
+        elif future.exception() is not None:
+            error = str(future.exception()) or type(future.exception()).__name__
+            if isinstance(future.exception(), BrokenProcessPool):
+                self.pool.restart()
+
+        try:
+            if error:
+                self.queue.fail(self.worker_id, job_id, error)
+            elif not self.queue.complete(self.worker_id, job_id):
+                logger.warning(f"Render job {job_id} finished after its lease was lost")
+        except Exception as e:
+            logger.error(f"Could not record result of render job {job_id}: {e}")
+
+    def stats(self) -> dict:
+        """Get the jobs this worker is running."""
+        with self._lock:
+            running = sorted(self._running)
+        return {
+            "worker_id": self.worker_id,
+            "running_jobs": running,
+        }
+
+
+@lru_cache()
+def get_render_worker() -> RenderWorker:
+    """Get the process-wide render worker."""
+    return RenderWorker()
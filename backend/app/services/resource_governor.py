@@ -0,0 +1,145 @@
+"""
+Host resource governor.
+Decides how many renders a host runs at once and how many encoder threads
+each one gets, so concurrent FFmpeg processes share cores and memory
+instead of fighting over them.
+"""
+import logging
+import os
+import shutil
+import subprocess
+from functools import lru_cache
+from typing import Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def available_memory() -> Optional[int]:
+    """
+    Get the memory available for new processes.
+
+    Returns:
+        Available bytes (MemAvailable), or None where /proc/meminfo is missing
+    """
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def lower_process_priority(nice: int, io_class: int, io_level: int) -> None:
+    """
+    Lower the CPU and I/O priority of the current process.
+
+    Runs as the render pool's process initializer; FFmpeg subprocesses
+    inherit both priorities, so API request handling stays responsive
+    while renders saturate the host. Failures are logged, not raised.
+
+    Args:
+        nice: Niceness increment (0 leaves CPU priority unchanged)
+        io_class: ionice scheduling class (0 leaves I/O priority unchanged)
+        io_level: ionice priority level within the class (0-7)
+    """
+    if nice > 0:
+        try:
+            os.nice(nice)
+        except OSError as e:
+            logger.warning(f"Could not lower render process CPU priority: {e}")
+
+    if io_class > 0:
+        ionice = shutil.which("ionice")
+        if not ionice:
+            return
+        command = [ionice, "-c", str(io_class), "-p", str(os.getpid())]
+        if io_class == 2:
+            command[3:3] = ["-n", str(io_level)]
+        try:
+            subprocess.run(command, check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"Could not lower render process I/O priority: {e}")
+
+
+class ResourceGovernor:
+    """
+    Admission control for render jobs on one host.
+
+    ``RENDER_RESERVED_CORES`` cores are left to the API; the rest are
+    split into render slots of ``threads_per_job`` x264 threads each, at
+    most ``RENDER_MAX_WORKERS``. A slot is only handed out while the host
+    has ``RENDER_JOB_MEMORY_MB`` available on top of
+    ``RENDER_MEMORY_RESERVE_MB``, so a memory-hungry batch can't push the
+    host into swap.
+
+    Oversubscribing cores with one full-width x264 encode per job makes
+    every encode slower (cache thrashing and context switches); fixed
+    thread budgets keep total throughput at the host's capacity.
+    """
+
+    def __init__(
+        self,
+        cores: Optional[int] = None,
+        max_jobs: Optional[int] = None,
+        reserved_cores: Optional[int] = None,
+        threads_per_job: Optional[int] = None,
+        job_memory_mb: Optional[int] = None,
+        memory_reserve_mb: Optional[int] = None
+    ):
+        settings = get_settings()
+        self.cores = cores or os.cpu_count() or 1
+        self.reserved_cores = reserved_cores if reserved_cores is not None else settings.RENDER_RESERVED_CORES
+        self.job_memory = (job_memory_mb if job_memory_mb is not None else settings.RENDER_JOB_MEMORY_MB) * 1024 * 1024
+        self.memory_reserve = (
+            memory_reserve_mb if memory_reserve_mb is not None else settings.RENDER_MEMORY_RESERVE_MB
+        ) * 1024 * 1024
+
+        max_jobs = max(1, max_jobs if max_jobs is not None else settings.RENDER_MAX_WORKERS)
+        configured_threads = threads_per_job if threads_per_job is not None else settings.RENDER_THREADS_PER_JOB
+
+        # A render host always keeps at least one core for encoding
+        self.render_cores = max(1, self.cores - self.reserved_cores)
+        self.slots = min(max_jobs, max(1, self.render_cores // max(1, configured_threads)))
+        self.threads_per_job = configured_threads or max(1, self.render_cores // self.slots)
+
+    def admissible(self, running: int) -> int:
+        """
+        Get how many more jobs may start now.
+
+        Args:
+            running: Jobs already running on this host
+
+        Returns:
+            Free slots, further limited by available memory
+        """
+        free = max(0, self.slots - running)
+        if free == 0 or self.job_memory <= 0:
+            return free
+
+        memory = available_memory()
+        if memory is None:
+            return free
+        return max(0, min(free, (memory - self.memory_reserve) // self.job_memory))
+
+    def stats(self, running: int = 0) -> dict:
+        """Get the host's capacity and current slot usage."""
+        return {
+            "cores": self.cores,
+            "reserved_cores": self.reserved_cores,
+            "slots": self.slots,
+            "slots_in_use": min(running, self.slots),
+            "admissible": self.admissible(running),
+            "threads_per_job": self.threads_per_job,
+            "memory_available": available_memory(),
+            "job_memory": self.job_memory,
+        }
+
+
+@lru_cache()
+def get_resource_governor() -> ResourceGovernor:
+    """Get the process-wide resource governor."""
+    return ResourceGovernor()
@@ -0,0 +1,241 @@
+"""
+File storage service.
+Stores uploaded files with all disk and network I/O on a bounded thread
+pool, so async endpoints never block the event loop while files move.
+"""
+import asyncio
+import functools
+import logging
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bytes copied per read/write when storing a stream
+COPY_BLOCK_SIZE = 1024 * 1024
+
+
+class LocalStorage:
+    """
+    Files on the local filesystem under ``UPLOAD_DIR``.
+
+    Files are addressed by a key relative to the storage root (for example
+    ``videos/<uuid>.mp4``); ``path`` maps a key to the local path stored in
+    the database. Every blocking call runs on a dedicated pool of
+    ``STORAGE_IO_WORKERS`` threads, which also bounds how many transfers
+    hit the disk at once.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_workers: Optional[int] = None):
+        self.root = Path(root or settings.UPLOAD_DIR)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.STORAGE_IO_WORKERS,
+            thread_name_prefix="storage"
+        )
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking call on the storage thread pool.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Return value of the call
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def path(self, key: str) -> Path:
+        """Get the local path of a key."""
+        return self.root / key
+
+    def key(self, path: str) -> Optional[str]:
+        """Get the key of a local path, or None if it is outside the storage root."""
+        try:
+            return Path(os.path.abspath(path)).relative_to(os.path.abspath(self.root)).as_posix()
+        except ValueError:
+            return None
+
+    def _write(self, path: Path, fileobj: BinaryIO) -> int:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fileobj.seek(0)
+        with path.open("wb") as buffer:
+            shutil.copyfileobj(fileobj, buffer, COPY_BLOCK_SIZE)
+            return buffer.tell()
+
+    async def save(self, key: str, fileobj: BinaryIO) -> str:
+        """
+        Store a file object under a key.
+
+        Args:
+            key: Storage key
+            fileobj: Readable binary file object (read from the start)
+
+        Returns:
+            Local path of the stored file
+        """
+        path = self.path(key)
+        await self.run(self._write, path, fileobj)
+        return str(path)
+
+    async def create(self, key: str) -> str:
+        """
+        Create an empty file to be written in place (resumable uploads).
+
+        Args:
+            key: Storage key
+
+        Returns:
+            Local path of the created file
+        """
+        path = self.path(key)
+        await self.run(path.parent.mkdir, parents=True, exist_ok=True)
+        await self.run(path.touch, exist_ok=False)
+        return str(path)
+
+    async def move(self, path: str, key: str) -> str:
+        """
+        Move a complete local file to a key (a rename, not a copy).
+
+        Args:
+            path: Local path of the file
+            key: Storage key
+
+        Returns:
+            Local path of the moved file
+        """
+        target = self.path(key)
+        await self.run(target.parent.mkdir, parents=True, exist_ok=True)
+        await self.run(os.replace, path, target)
+        await self.publish(str(target))
+        return str(target)
+
+    async def publish(self, path: str) -> None:
+        """
+        Mark a file written in place as complete.
+
+        Args:
+            path: Local path of the file
+        """
+        return None
+
+    def localize(self, path: str) -> str:
+        """
+        Make sure a stored file has a local copy (blocking).
+
+        Args:
+            path: Local path of the file
+
+        Returns:
+            The same path
+        """
+        return path
+
+    async def delete(self, path: str) -> None:
+        """
+        Delete a stored file; missing files are ignored.
+
+        Args:
+            path: Local path of the file
+        """
+        await self.run(Path(path).unlink, missing_ok=True)
+
+    def shutdown(self) -> None:
+        """Stop the I/O thread pool."""
+        self.executor.shutdown(wait=False)
+
+
+class S3Storage(LocalStorage):
+    """
+    Local files mirrored to an S3-compatible bucket.
+
+    The local file stays the working copy that FFmpeg and the render
+    workers read; completed files are uploaded to ``S3_BUCKET`` under
+    ``S3_PREFIX`` + key and deleted from it together with the local copy.
+    A host missing the local copy (another render host, a wiped disk)
+    downloads it from the bucket on first use. ``S3_ENDPOINT_URL`` points
+    the client at MinIO or another S3-compatible server.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_workers: Optional[int] = None):
+        try:
+            import boto3
+        except ImportError:
+            raise Exception("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+
+        if not settings.S3_BUCKET:
+            raise Exception("STORAGE_BACKEND=s3 requires S3_BUCKET")
+
+        super().__init__(root, max_workers)
+        self.bucket = settings.S3_BUCKET
+        self.prefix = settings.S3_PREFIX
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_ENDPOINT_URL or None,
+            aws_access_key_id=settings.S3_ACCESS_KEY or None,
+            aws_secret_access_key=settings.S3_SECRET_KEY or None,
+            region_name=settings.S3_REGION or None
+        )
+
+    def _object_key(self, path: str) -> Optional[str]:
+        key = self.key(path)
+        return f"{self.prefix}{key}" if key else None
+
+    async def save(self, key: str, fileobj: BinaryIO) -> str:
+        path = await super().save(key, fileobj)
+        await self.publish(path)
+        return path
+
+    async def publish(self, path: str) -> None:
+        object_key = self._object_key(path)
+        if not object_key:
+            return
+        await self.run(self.client.upload_file, path, self.bucket, object_key)
+        logger.info(f"Uploaded {object_key} to bucket {self.bucket}")
+
+    def localize(self, path: str) -> str:
+        object_key = self._object_key(path)
+        if not object_key or os.path.exists(path):
+            return path
+
+        # Download next to the target and rename, so readers never see a partial file
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f".{target.name}.{uuid.uuid4().hex}.partial")
+        try:
+            self.client.download_file(self.bucket, object_key, str(partial))
+            os.replace(partial, target)
+            logger.info(f"Downloaded {object_key} from bucket {self.bucket}")
+        except Exception as e:
+            # Left to the caller, which reports the file as missing
+            logger.warning(f"Could not download {object_key} from bucket {self.bucket}: {e}")
+        finally:
+            partial.unlink(missing_ok=True)
+        return path
+
+    async def delete(self, path: str) -> None:
+        await super().delete(path)
+        object_key = self._object_key(path)
+        if object_key:
+            await self.run(self.client.delete_object, Bucket=self.bucket, Key=object_key)
+
+
+@lru_cache()
+def get_storage() -> LocalStorage:
+    """Get the storage backend selected by STORAGE_BACKEND."""
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage()
+    if settings.STORAGE_BACKEND != "local":
+        raise Exception(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+    return LocalStorage()
@@ -0,0 +1,99 @@
+"""
+Subtitle overlay cache.
+Rasterizes each caption once and reuses the image across renders.
+"""
+import hashlib
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import ffmpeg
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bump when rasterization output changes for identical inputs
+OVERLAY_VERSION = 1
+
+
+class SubtitleOverlayCache:
+    """
+    Pre-rendered subtitle overlays for burn-in.
+
+    Captions are static text in one style, so instead of running libass
+    layout and rasterization on every frame, each (text, style, frame size)
+    combination is drawn once onto a transparent canvas and stored as
+    ``<key>.png`` under ``UPLOAD_DIR/subtitles``. Renders composite the
+    image with the ``overlay`` filter, a single alpha blend per frame.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(settings.UPLOAD_DIR) / "subtitles"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def cache_key(text: str, style: str, width: int, height: int) -> str:
+        """Get the cache key of a caption rendered at a frame size."""
+        parts = [str(OVERLAY_VERSION), style, f"{width}x{height}", text]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, text: str, style: str, width: int, height: int) -> str:
+        """
+        Get the overlay image for a caption, rasterizing it if needed.
+
+        Args:
+            text: Subtitle text
+            style: libass force_style
+            width: Frame width the overlay is composited onto
+            height: Frame height the overlay is composited onto
+
+        Returns:
+            Path to a transparent PNG of the frame size
+
+        Raises:
+            Exception: If FFmpeg processing fails
+        """
+        overlay_path = self.cache_dir / f"{self.cache_key(text, style, width, height)}.png"
+        if overlay_path.exists():
+            return str(overlay_path)
+
+        self._rasterize(text, style, width, height, overlay_path)
+        logger.info(f"Rasterized {width}x{height} subtitle overlay {overlay_path.name}")
+        return str(overlay_path)
+
+    def _rasterize(self, text: str, style: str, width: int, height: int, overlay_path: Path) -> None:
+        """
+        Draw a caption with libass onto a transparent canvas.
+
+        The ``subtitles`` filter runs on a single fully transparent RGBA
+        frame with ``alpha=1`` so the glyphs, outline and shadow keep their
+        coverage in the alpha channel. Layout is identical to burning the
+        caption in directly at this frame size.
+        """
+        unique = uuid.uuid4().hex
+        srt_path = self.cache_dir / f".{overlay_path.stem}.{unique}.srt"
+        tmp_path = self.cache_dir / f".{overlay_path.stem}.{unique}.png"
+
+        try:
+            with open(srt_path, 'w', encoding='utf-8') as f:
+                f.write("1\n")
+                f.write("00:00:00,000 --> 00:00:01,000\n")
+                f.write(f"{text}\n")
+
+            canvas = ffmpeg.input(f"color=c=black@0.0:s={width}x{height}:d=1,format=rgba", f='lavfi')
+            video = canvas.filter('subtitles', str(srt_path), force_style=style, alpha=1)
+            output = ffmpeg.output(video, str(tmp_path), vframes=1)
+            ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+            os.replace(tmp_path, overlay_path)
+
+        except ffmpeg.Error as e:
+            tmp_path.unlink(missing_ok=True)
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise Exception(f"Failed to rasterize subtitles: {error_message}")
+
+        finally:
+            srt_path.unlink(missing_ok=True)
@@ -0,0 +1,283 @@
+"""
+Timed subtitle engine.
+Turns subtitle text or timed cues into ASS subtitle files, compiled once
+per subtitle content and reused across render attempts.
+"""
+import hashlib
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bump when compiled output changes for identical inputs
+ASS_VERSION = 2
+
+# Sentence-ending punctuation that is a preferred cue break
+SENTENCE_ENDINGS = (".", "!", "?", "…")
+
+# libass reference canvas; the same one FFmpeg uses for SRT input, so
+# font sizes match the previous force_style look at every resolution
+PLAY_RES_X = 384
+PLAY_RES_Y = 288
+
+# Precompiled [V4+ Styles] lines for the standard and uniquify looks
+ASS_STYLE_FORMAT = (
+    "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+    "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+    "Alignment, MarginL, MarginR, MarginV, Encoding"
+)
+ASS_STYLE_STANDARD = (
+    "Style: Standard,Arial,20,&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,"
+    "0,0,0,0,100,100,0,0,1,1,0,2,10,10,10,0"
+)
+ASS_STYLE_UNIQUE = (
+    "Style: Unique,Arial,24,&H0000FFFF,&H0000FFFF,&H00000000,&H00000000,"
+    "-1,0,0,0,100,100,0,0,1,1,0,2,10,10,10,0"
+)
+ASS_HEADER = "\n".join([
+    "[Script Info]",
+    "ScriptType: v4.00+",
+    f"PlayResX: {PLAY_RES_X}",
+    f"PlayResY: {PLAY_RES_Y}",
+    "WrapStyle: 0",
+    "ScaledBorderAndShadow: yes",
+    "",
+    "[V4+ Styles]",
+    ASS_STYLE_FORMAT,
+    ASS_STYLE_STANDARD,
+    ASS_STYLE_UNIQUE,
+    "",
+    "[Events]",
+    "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    "",
+])
+
+
+class SubtitleCue:
+    """
+    A caption shown between two points in time.
+
+    Attributes:
+        start: Start time in seconds
+        end: End time in seconds
+        text: Caption text
+    """
+
+    __slots__ = ("start", "end", "text")
+
+    def __init__(self, start: float, end: float, text: str):
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def __repr__(self):
+        return f"<SubtitleCue {self.start:.2f}-{self.end:.2f}>"
+
+    def to_dict(self) -> dict:
+        return {"start": self.start, "end": self.end, "text": self.text}
+
+
+def parse_cues(raw_cues: Iterable[dict]) -> List[SubtitleCue]:
+    """
+    Build cues from stored ``{"start", "end", "text"}`` dictionaries.
+
+    Cues without text or with an empty time span are dropped. Already
+    ordered input (the normal case) is accepted as is in one pass.
+
+    Args:
+        raw_cues: Cue dictionaries
+
+    Returns:
+        Cues ordered by start time
+    """
+    cues = []
+    ordered = True
+    for raw in raw_cues:
+        text = str(raw.get("text") or "").strip()
+        start = max(0.0, float(raw.get("start") or 0))
+        end = float(raw.get("end") or 0)
+        if not text or end <= start:
+            continue
+        if cues and start < cues[-1].start:
+            ordered = False
+        cues.append(SubtitleCue(start, end, text))
+
+    if not ordered:
+        cues.sort(key=lambda cue: cue.start)
+    return cues
+
+
+def split_text(
+    text: str,
+    duration: float = 0.0,
+    max_chars: Optional[int] = None,
+    chars_per_second: Optional[float] = None,
+    min_cue_duration: Optional[float] = None
+) -> List[SubtitleCue]:
+    """
+    Split subtitle text into cues paced by reading speed.
+
+    Words are packed greedily into cues of at most ``max_chars``
+    characters, breaking early at sentence ends once a cue is half full.
+    Explicit line breaks are kept as line breaks inside a cue, so a short
+    multi-line caption stays one multi-line cue.
+    Each cue gets reading time for its length (at least
+    ``min_cue_duration``); with a known duration the cues are stretched or
+    compressed proportionally to span the whole video.
+
+    Args:
+        text: Subtitle text
+        duration: Video duration in seconds (0 if unknown)
+        max_chars: Maximum characters per cue
+        chars_per_second: Reading speed
+        min_cue_duration: Minimum seconds a cue stays on screen
+
+    Returns:
+        Consecutive cues covering the text
+    """
+    max_chars = max_chars or settings.SUBTITLE_MAX_CUE_CHARS
+    chars_per_second = chars_per_second or settings.SUBTITLE_CHARS_PER_SECOND
+    min_cue_duration = min_cue_duration if min_cue_duration is not None else settings.SUBTITLE_MIN_CUE_DURATION
+
+    chunks = []
+    parts = []
+    length = 0
+    for line in text.splitlines():
+        for index, word in enumerate(line.split()):
+            if parts and length + 1 + len(word) > max_chars:
+                chunks.append("".join(parts))
+                parts, length = [], 0
+            if parts:
+                # The first word of a line continues the cue on a new line
+                parts.append("\n" if index == 0 else " ")
+                length += 1
+            parts.append(word)
+            length += len(word)
+            if word.endswith(SENTENCE_ENDINGS) and length >= max_chars // 2:
+                chunks.append("".join(parts))
+                parts, length = [], 0
+    if parts:
+        chunks.append("".join(parts))
+
+    if not chunks:
+        return []
+
+    spans = [max(min_cue_duration, len(chunk) / chars_per_second) for chunk in chunks]
+    scale = duration / sum(spans) if duration > 0 else 1.0
+
+    cues = []
+    position = 0.0
+    for chunk, span in zip(chunks, spans):
+        end = position + span * scale
+        cues.append(SubtitleCue(round(position, 2), round(end, 2), chunk))
+        position = end
+    return cues
+
+
+def _ass_time(seconds: float) -> str:
+    """Format seconds as an ASS timestamp (H:MM:SS.cc)."""
+    centiseconds = int(round(seconds * 100))
+    hours, centiseconds = divmod(centiseconds, 360000)
+    minutes, centiseconds = divmod(centiseconds, 6000)
+    secs, centiseconds = divmod(centiseconds, 100)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}.{centiseconds:02d}"
+
+
+def _ass_text(text: str) -> str:
+    """Escape caption text for an ASS Dialogue line."""
+    # Braces open override blocks; a zero-width space after a backslash
+    # keeps \\N, \\n and \\h in the text literal
+    text = text.replace("\\", "\\\u200b").replace("{", "(").replace("}", ")")
+    return "\\N".join(line.strip() for line in text.splitlines())
+
+
+def build_ass(cues: Iterable[SubtitleCue], uniquify: bool = False) -> str:
+    """
+    Render cues as an ASS document.
+
+    Args:
+        cues: Cues to show
+        uniquify: Use the unique style instead of the standard one
+
+    Returns:
+        ASS file contents
+    """
+    style = "Unique" if uniquify else "Standard"
+    lines = [ASS_HEADER]
+    for cue in cues:
+        lines.append(
+            f"Dialogue: 0,{_ass_time(cue.start)},{_ass_time(cue.end)},{style},,0,0,0,,{_ass_text(cue.text)}\n"
+        )
+    return "".join(lines)
+
+
+class SubtitleCompiler:
+    """
+    Compiles subtitles to ASS files, cached by content.
+
+    The cues (given, or split from the text for the video's duration) and
+    the style determine a key; the ASS file is written once as
+    ``<key>.ass`` under ``UPLOAD_DIR/subtitles`` and every later render
+    attempt of the same subtitles reuses it.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(settings.UPLOAD_DIR) / "subtitles"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def cues_for(
+        subtitle_text: Optional[str],
+        subtitle_cues: Optional[List[dict]],
+        duration: float = 0.0
+    ) -> List[SubtitleCue]:
+        """
+        Get the cues to show: the timed cues if given, else the split text.
+
+        Args:
+            subtitle_text: Subtitle text (optional)
+            subtitle_cues: Timed cue dictionaries (optional)
+            duration: Video duration in seconds for pacing split text
+
+        Returns:
+            Cues ordered by start time
+        """
+        if subtitle_cues:
+            return parse_cues(subtitle_cues)
+        if subtitle_text:
+            return split_text(subtitle_text, duration)
+        return []
+
+    def compile(self, cues: List[SubtitleCue], uniquify: bool = False) -> str:
+        """
+        Get the ASS file for cues, writing it if needed.
+
+        Args:
+            cues: Cues to show
+            uniquify: Use the unique style
+
+        Returns:
+            Path to ASS file
+        """
+        payload = json.dumps(
+            [ASS_VERSION, uniquify, [[cue.start, cue.end, cue.text] for cue in cues]],
+            ensure_ascii=False
+        )
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        ass_path = self.cache_dir / f"{key}.ass"
+        if ass_path.exists():
+            return str(ass_path)
+
+        tmp_path = self.cache_dir / f".{key}.{uuid.uuid4().hex}.ass"
+        tmp_path.write_text(build_ass(cues, uniquify), encoding="utf-8")
+        os.replace(tmp_path, ass_path)
+
+        logger.info(f"Compiled {len(cues)} subtitle cues to {ass_path.name}")
+        return str(ass_path)
@@ -0,0 +1,180 @@
+"""
+Thumbnail and preview sprite generation.
+Produces a poster frame and a scrub-preview sprite sheet for each video file.
+"""
+import logging
+import math
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import ffmpeg
+
+from app.config import get_settings
+from app.services.media_probe import display_size, probe_media
+from app.services.render_cache import file_content_hash
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Sprite image name referenced from the WebVTT index, relative to the .vtt URL
+SPRITE_URL_NAME = "sprite.jpg"
+
+
+def _vtt_timestamp(seconds: float) -> str:
+    """Format seconds as a WebVTT timestamp (HH:MM:SS.mmm)."""
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
+
+
+class ThumbnailGenerator:
+    """
+    Generates poster frames and preview sprite sheets, cached by content hash.
+
+    For a file with content hash ``<hash>`` the cache under
+    ``UPLOAD_DIR/thumbnails`` holds:
+        - ``<hash>.jpg``: poster frame
+        - ``<hash>_sprite.jpg``: grid of low-resolution frames
+        - ``<hash>.vtt``: WebVTT index mapping time ranges to sprite tiles
+
+    Both images are decoded from keyframes only: the poster uses an input
+    seek that lands on the nearest keyframe, and the sprite skips every
+    non-key frame, so neither decodes the whole video.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(settings.UPLOAD_DIR) / "thumbnails"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _tmp_path(self, final_path: Path) -> Path:
+        return final_path.with_name(f".{final_path.stem}.{uuid.uuid4().hex}{final_path.suffix}")
+
+    def generate(self, video_path: str) -> dict:
+        """
+        Get the poster, sprite and sprite index for a video, generating them if needed.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Dictionary with thumbnail_path, sprite_path and sprite_vtt_path
+
+        Raises:
+            Exception: If probing or FFmpeg processing fails
+        """
+        content_hash = file_content_hash(video_path)
+        poster_path = self.cache_dir / f"{content_hash}.jpg"
+        sprite_path = self.cache_dir / f"{content_hash}_sprite.jpg"
+        vtt_path = self.cache_dir / f"{content_hash}.vtt"
+
+        if poster_path.exists() and sprite_path.exists() and vtt_path.exists():
+            return {
+                "thumbnail_path": str(poster_path),
+                "sprite_path": str(sprite_path),
+                "sprite_vtt_path": str(vtt_path),
+            }
+
+        probe = probe_media(video_path)
+        video_stream = next((s for s in probe['streams'] if s['codec_type'] == 'video'), None)
+        if not video_stream:
+            raise Exception("Failed to generate thumbnails: no video stream found")
+
+        duration = float(probe['format'].get('duration') or video_stream.get('duration') or 0)
+        # Frames are autorotated on decode, so tiles follow the displayed shape
+        width, height = display_size(video_path)
+
+        if not poster_path.exists():
+            self._extract_poster(video_path, poster_path, duration)
+        if not (sprite_path.exists() and vtt_path.exists()):
+            self._build_sprite(video_path, sprite_path, vtt_path, duration, width, height)
+
+        logger.info(f"Generated thumbnails for {video_path}")
+        return {
+            "thumbnail_path": str(poster_path),
+            "sprite_path": str(sprite_path),
+            "sprite_vtt_path": str(vtt_path),
+        }
+
+    def _extract_poster(self, video_path: str, poster_path: Path, duration: float) -> None:
+        """
+        Extract the poster frame at THUMBNAIL_POSTER_OFFSET of the duration.
+
+        ``-ss`` before the input seeks in the demuxer; with
+        ``-noaccurate_seek`` and ``-skip_frame nokey`` the first decoded
+        frame is the keyframe at the seek point, so only one frame is decoded.
+        """
+        offset = duration * settings.THUMBNAIL_POSTER_OFFSET if duration > 0 else 0
+        tmp_path = self._tmp_path(poster_path)
+
+        try:
+            video = ffmpeg.input(video_path, ss=offset, noaccurate_seek=None, skip_frame='nokey').video
+            video = video.filter('scale', settings.THUMBNAIL_WIDTH, -2)
+            output = ffmpeg.output(video, str(tmp_path), vframes=1, **{'q:v': 3})
+            ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+            os.replace(tmp_path, poster_path)
+
+        except ffmpeg.Error as e:
+            tmp_path.unlink(missing_ok=True)
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise Exception(f"Failed to extract poster frame: {error_message}")
+
+    def _build_sprite(
+        self,
+        video_path: str,
+        sprite_path: Path,
+        vtt_path: Path,
+        duration: float,
+        width: int,
+        height: int
+    ) -> None:
+        """
+        Build a sprite sheet with one tile every SPRITE_INTERVAL seconds and its WebVTT index.
+
+        Long videos get a wider interval so the sheet stays within
+        SPRITE_MAX_TILES tiles.
+        """
+        interval = settings.SPRITE_INTERVAL
+        tiles = max(1, math.ceil(duration / interval)) if duration > 0 else 1
+        if tiles > settings.SPRITE_MAX_TILES:
+            tiles = settings.SPRITE_MAX_TILES
+            interval = duration / tiles
+
+        columns = min(settings.SPRITE_COLUMNS, tiles)
+        rows = math.ceil(tiles / columns)
+        tile_width = settings.SPRITE_TILE_WIDTH
+        tile_height = max(2, round(tile_width * height / width / 2) * 2)
+
+        tmp_sprite = self._tmp_path(sprite_path)
+        try:
+            video = (
+                ffmpeg.input(video_path, skip_frame='nokey').video
+                .filter('fps', f"1/{interval}")
+                .filter('scale', tile_width, tile_height)
+                .filter('tile', f"{columns}x{rows}")
+            )
+            output = ffmpeg.output(video, str(tmp_sprite), vframes=1, **{'q:v': 5})
+            ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+            os.replace(tmp_sprite, sprite_path)
+
+        except ffmpeg.Error as e:
+            tmp_sprite.unlink(missing_ok=True)
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise Exception(f"Failed to build preview sprite: {error_message}")
+
+        lines = ["WEBVTT", ""]
+        for index in range(tiles):
+            start = index * interval
+            end = min((index + 1) * interval, duration) if duration > 0 else interval
+            x = (index % columns) * tile_width
+            y = (index // columns) * tile_height
+            lines.append(f"{_vtt_timestamp(start)} --> {_vtt_timestamp(end)}")
+            lines.append(f"{SPRITE_URL_NAME}#xywh={x},{y},{tile_width},{tile_height}")
+            lines.append("")
+
+        tmp_vtt = self._tmp_path(vtt_path)
+        tmp_vtt.write_text("\n".join(lines), encoding="utf-8")
+        os.replace(tmp_vtt, vtt_path)
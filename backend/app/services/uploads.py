@@ -0,0 +1,277 @@
+"""
+Resumable upload service.
+Writes chunked uploads straight to their final location and tracks how
+many bytes have arrived, so interrupted uploads continue where they stopped.
+"""
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Dict, Optional
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import VideoUpload, UploadStatus
+from app.services.storage import get_storage
+from app.utils.helpers import calculate_file_hash
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Received bytes are written in blocks of this size
+WRITE_BLOCK_SIZE = 1024 * 1024
+
+# PostgreSQL error code of a NOWAIT lock that is held elsewhere
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class _StreamHash:
+    """SHA-256 of an upload's first ``offset`` bytes, fed as chunks are written."""
+
+    __slots__ = ("hasher", "offset")
+
+    def __init__(self):
+        self.hasher = hashlib.sha256()
+        self.offset = 0
+
+
+# Running hashes of uploads receiving chunks in this process
+_hashes: Dict[str, _StreamHash] = {}
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds its declared length or MAX_UPLOAD_SIZE."""
+
+
+class UploadOffsetMismatch(Exception):
+    """Raised when a chunk does not start at the upload's current offset."""
+
+
+class UploadBusy(Exception):
+    """Raised when another request is already writing to the upload."""
+
+
+async def create_upload(
+    db: Session,
+    title: str,
+    filename: str,
+    length: int,
+    account_id: Optional[int] = None,
+    platform: Optional[str] = None,
+    normalize: Optional[bool] = None
+) -> VideoUpload:
+    """
+    Start a resumable upload and create its (empty) destination file.
+
+    Args:
+        db: Database session
+        title: Title of the video to create
+        filename: Original file name (its extension is kept)
+        length: Total upload size in bytes
+        account_id: Account of the video to create (optional)
+        platform: Platform name (optional)
+        normalize: Queue mezzanine transcoding on finalize (optional)
+
+    Returns:
+        Created upload session
+
+    Raises:
+        UploadTooLarge: If length exceeds MAX_UPLOAD_SIZE
+    """
+    if length > settings.MAX_UPLOAD_SIZE:
+        raise UploadTooLarge(f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE / (1024*1024)} MB")
+
+    upload_path = await get_storage().create(f"videos/{uuid.uuid4()}{Path(filename).suffix}")
+
+    upload = VideoUpload(
+        id=uuid.uuid4().hex,
+        title=title,
+        filename=filename,
+        platform=platform,
+        account_id=account_id,
+        normalize=normalize,
+        file_path=upload_path,
+        length=length,
+        offset=0
+    )
+    db.add(upload)
+    db.commit()
+    db.refresh(upload)
+    return upload
+
+
+async def write_chunk(db: Session, upload: VideoUpload, offset: int, chunks: AsyncIterator[bytes]) -> int:
+    """
+    Write a request body into an upload at an offset.
+
+    Bytes go straight into the destination file as they arrive, in blocks
+    of WRITE_BLOCK_SIZE, with file I/O on the storage thread pool. Whatever was
+    written before the client disconnected or overran the declared length
+    is recorded, so the client can resume from the stored offset.
+
+    The upload row is locked while the chunk is written (see
+    ``lock_upload``) and the offset only advances with a conditional
+    ``UPDATE ... WHERE offset = :expected``, so concurrent requests in any
+    process cannot interleave their bytes.
+
+    Args:
+        db: Database session
+        upload: Upload session
+        offset: Offset the client says the chunk starts at
+        chunks: Request body stream
+
+    Returns:
+        New upload offset
+
+    Raises:
+        UploadOffsetMismatch: If offset is not the upload's current offset
+        UploadTooLarge: If the body runs past the declared length
+        UploadBusy: If another request is writing to the upload
+    """
+    if lock_upload(db, upload.id) is None or offset != upload.offset:
+        db.rollback()
+        raise UploadOffsetMismatch(f"Upload is at offset {upload.offset}, not {offset}")
+
+    # Hash while writing; a chunk resumed in another process (or after a
+    # restart) loses the running hash and finalize reads the file instead
+    stream_hash = _hashes.get(upload.id)
+    if offset == 0:
+        stream_hash = _hashes[upload.id] = _StreamHash()
+    elif stream_hash is not None and stream_hash.offset != offset:
+        del _hashes[upload.id]
+        stream_hash = None
+
+    storage = get_storage()
+    written = 0
+    buffer = bytearray()
+    file = await storage.run(open, upload.file_path, "r+b")
+    try:
+        await storage.run(file.seek, offset)
+        async for chunk in chunks:
+            if offset + written + len(buffer) + len(chunk) > upload.length:
+                raise UploadTooLarge(f"Upload exceeds its declared length of {upload.length} bytes")
+            buffer += chunk
+            if len(buffer) >= WRITE_BLOCK_SIZE:
+                await storage.run(_write_block, file, buffer, offset + written, stream_hash)
+                written += len(buffer)
+                buffer = bytearray()
+
+        if buffer:
+            await storage.run(_write_block, file, buffer, offset + written, stream_hash)
+            written += len(buffer)
+
+    finally:
+        await storage.run(file.close)
+        advanced = bool(written) and db.query(VideoUpload).filter(
+            VideoUpload.id == upload.id,
+            VideoUpload.offset == offset
+        ).update({VideoUpload.offset: offset + written}, synchronize_session=False)
+        # Commits the new offset and releases the row lock
+        db.commit()
+
+    if written and not advanced:
+        raise UploadOffsetMismatch(f"Upload moved past offset {offset} while the chunk was written")
+    return upload.offset
+
+
+def _write_block(file: BinaryIO, block: bytearray, position: int, stream_hash: Optional[_StreamHash]) -> None:
+    file.write(block)
+    if stream_hash is None:
+        return
+    if stream_hash.offset == position:
+        stream_hash.hasher.update(block)
+        stream_hash.offset += len(block)
+    else:
+        # Another writer got in between; finalize reads the file instead
+        stream_hash.offset = -1
+
+
+async def upload_digest(upload: VideoUpload) -> str:
+    """
+    Get the SHA-256 of a fully received upload.
+
+    Uses the hash computed while the chunks were written, or reads the
+    file if this process did not see every chunk.
+
+    Args:
+        upload: Upload session
+
+    Returns:
+        Hex digest of the file content
+    """
+    stream_hash = _hashes.get(upload.id)
+    if stream_hash is not None and stream_hash.offset == upload.length:
+        return stream_hash.hasher.hexdigest()
+    return await get_storage().run(calculate_file_hash, upload.file_path)
+
+
+def lock_upload(db: Session, upload_id: str) -> Optional[VideoUpload]:
+    """
+    Lock an upload row until the session commits or rolls back.
+
+    A chunk holds the lock while it is written, so no other request (in
+    any process) can write, finalize or cancel the upload meanwhile.
+
+    Args:
+        db: Database session
+        upload_id: Upload ID
+
+    Returns:
+        Locked upload, or None if it does not exist
+
+    Raises:
+        UploadBusy: If a chunk is being written to the upload
+    """
+    try:
+        return db.query(VideoUpload).filter(
+            VideoUpload.id == upload_id
+        ).with_for_update(nowait=True).populate_existing().first()
+    except OperationalError as e:
+        db.rollback()
+        if getattr(e.orig, "pgcode", None) == LOCK_NOT_AVAILABLE:
+            raise UploadBusy("Upload is already receiving a chunk")
+        raise
+
+
+def release_upload(upload_id: str) -> None:
+    """Forget the running hash of a finished or aborted upload."""
+    _hashes.pop(upload_id, None)
+
+
+def expire_stale_uploads(max_age: Optional[float] = None) -> int:
+    """
+    Remove unfinished uploads that received nothing for too long.
+
+    Args:
+        max_age: Seconds since the last chunk (default UPLOAD_SESSION_MAX_AGE)
+
+    Returns:
+        Number of uploads removed
+    """
+    from app.database import SessionLocal
+
+    max_age = max_age if max_age is not None else settings.UPLOAD_SESSION_MAX_AGE
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+
+    db = SessionLocal()
+    try:
+        stale = db.query(VideoUpload).filter(
+            VideoUpload.status == UploadStatus.UPLOADING,
+            VideoUpload.updated_at < cutoff
+        ).with_for_update(skip_locked=True).all()
+
+        for upload in stale:
+            Path(upload.file_path).unlink(missing_ok=True)
+            release_upload(upload.id)
+            db.delete(upload)
+
+        db.commit()
+        if stale:
+            logger.info(f"Removed {len(stale)} stale uploads")
+        return len(stale)
+
+    finally:
+        db.close()
@@ -4,14 +4,35 @@ Handles video processing, audio mixing, filters, and subtitles.
 """
 import ffmpeg
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import os
+import shutil
+import threading
+import time
 import uuid
 from datetime import datetime
 
 from app.config import get_settings
+from app.services.audio_cache import AudioPreparer
+from app.services.encoder_profiles import EncoderProfile, get_encoder_profile
+from app.services.filter_presets import RenderChain, get_filter_registry
+from app.services.media_probe import display_size, get_media_info, stream_codec
+from app.services.subtitle_overlay import SubtitleOverlayCache
+from app.services.subtitles import SubtitleCompiler
+from app.services.workspace import RenderWorkspace
 
 settings = get_settings()
 
+# Codecs that can be stream-copied into an MP4 container untouched
+MP4_COPY_VIDEO_CODECS = {"h264", "hevc", "mpeg4", "av1", "vp9"}
+MP4_COPY_AUDIO_CODECS = {"aac", "mp3", "alac", "ac3"}
+
+# Subtitle styles (libass force_style)
+SUBTITLE_STYLE_STANDARD = "Fontsize=20,PrimaryColour=&HFFFFFF"
+SUBTITLE_STYLE_UNIQUE = "Fontsize=24,PrimaryColour=&H00FFFF,Bold=1,BorderStyle=1"
+
 
 class VideoGenerator:
     """
@@ -24,7 +45,28 @@ class VideoGenerator:
     - Compositing final video with all effects
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        threads: int = 0,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+        workspace: Optional[RenderWorkspace] = None,
+        profile: Optional[str] = None
+    ):
+        """
+        Initialize the generator.
+
+        Args:
+            threads: x264 thread budget per encode (0 uses the profile's)
+            progress_callback: Called with render progress stats (percent,
+                fps, speed, eta_seconds) while FFmpeg runs
+            workspace: Scratch workspace for intermediates, owned by the
+                caller; without one, each call uses and removes its own
+            profile: Encoder profile name (draft, standard, archival)
+        """
+        self.threads = threads
+        self.profile: EncoderProfile = get_encoder_profile(profile)
+        self.progress_callback = progress_callback
+        self.workspace = workspace
         self.output_dir = Path(settings.UPLOAD_DIR) / "projects"
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -35,6 +77,359 @@ class VideoGenerator:
         filename = f"{prefix}_{timestamp}_{unique_id}.mp4"
         return str(self.output_dir / filename)
 
+    def _open_workspace(self) -> RenderWorkspace:
+        """Get the scratch workspace for one render call."""
+        return self.workspace or RenderWorkspace(prefix="render")
+
+    def _close_workspace(self, workspace: RenderWorkspace) -> None:
+        """Remove a per-call workspace; a caller-owned one is left to its owner."""
+        if workspace is not self.workspace:
+            workspace.cleanup()
+
+    def _encoder_options(self) -> dict:
+        """Get output options applied to every libx264 encode, from the encoder profile."""
+        options = {'vcodec': 'libx264', 'preset': self.profile.preset, 'crf': self.profile.crf}
+        threads = self.threads or self.profile.threads
+        if threads > 0:
+            options['threads'] = threads
+        if self.profile.faststart:
+            options['movflags'] = '+faststart'
+        if self.profile.max_duration:
+            options['t'] = self.profile.max_duration
+        return options
+
+    def _needs_scale(self, video_path: str) -> bool:
+        """Check whether the source is taller than the profile's maximum height."""
+        if not self.profile.height:
+            return False
+
+        source_height = get_media_info(video_path).get('height', 0)
+        return not source_height or source_height > self.profile.height
+
+    def _scale_video(self, video, video_path: str):
+        """Downscale a video stream to the profile's maximum height, keeping aspect ratio."""
+        if not self._needs_scale(video_path):
+            return video
+        return video.filter('scale', -2, self.profile.height)
+
+    def _frame_size(self, video_path: str) -> tuple:
+        """Get the frame size after the profile's downscale, as ``scale=-2:height`` computes it."""
+        width, height = display_size(video_path)
+        if self.profile.height and height > self.profile.height:
+            width = int(self.profile.height * width / height / 2 + 0.5) * 2
+            height = self.profile.height
+        return width, height
+
+    def _run(self, output, source_path: Optional[str] = None) -> None:
+        """
+        Run an FFmpeg command, reporting progress if a callback is set.
+
+        Progress is read from FFmpeg's ``-progress`` output, which emits a
+        block of ``key=value`` lines ending in ``progress=continue`` or
+        ``progress=end`` about twice a second.
+
+        Args:
+            output: ffmpeg-python output node
+            source_path: Source video whose duration is the render length
+
+        Raises:
+            ffmpeg.Error: If FFmpeg exits with an error
+        """
+        if not self.progress_callback:
+            ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+            return
+
+        duration = 0.0
+        if source_path:
+            try:
+                duration = self.get_video_info(source_path).get('duration', 0.0)
+            except Exception:
+                duration = 0.0
+
+        process = (
+            output
+            .global_args('-progress', 'pipe:1', '-nostats')
+            .overwrite_output()
+            .run_async(pipe_stdout=True, pipe_stderr=True)
+        )
+
+        # Drain stderr in the background so FFmpeg never blocks on a full pipe
+        stderr_chunks = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()),
+            daemon=True
+        )
+        stderr_reader.start()
+
+        block = {}
+        for raw_line in process.stdout:
+            key, _, value = raw_line.decode('utf-8', errors='replace').strip().partition('=')
+            block[key] = value
+            if key == 'progress':
+                self._report_progress(block, duration)
+                block = {}
+
+        process.wait()
+        stderr_reader.join()
+
+        if process.returncode != 0:
+            raise ffmpeg.Error('ffmpeg', b'', b''.join(stderr_chunks))
+
+    def _report_progress(self, block: dict, duration: float) -> None:
+        """Convert an FFmpeg progress block to stats and pass it to the callback."""
+        out_time_us = block.get('out_time_us') or block.get('out_time_ms') or '0'
+        try:
+            out_time = max(0.0, int(out_time_us) / 1_000_000)
+        except ValueError:
+            out_time = 0.0
+
+        try:
+            fps = float(block.get('fps', 0) or 0)
+        except ValueError:
+            fps = 0.0
+
+        try:
+            speed = float(block.get('speed', '0').rstrip('x') or 0)
+        except ValueError:
+            speed = 0.0
+
+        finished = block.get('progress') == 'end'
+        if finished:
+            percent = 100.0
+        elif duration > 0:
+            percent = min(99.9, out_time / duration * 100)
+        else:
+            percent = 0.0
+
+        eta_seconds = None
+        if finished:
+            eta_seconds = 0.0
+        elif duration > 0 and speed > 0:
+            eta_seconds = max(0.0, (duration - out_time) / speed)
+
+        self.progress_callback({
+            'percent': round(percent, 1),
+            'fps': fps,
+            'speed': speed,
+            'eta_seconds': round(eta_seconds, 1) if eta_seconds is not None else None,
+            'finished': finished,
+            'timestamp': time.time(),
+        })
+
+    @staticmethod
+    def _apply_filter_chain(stream, chain: RenderChain):
+        """
+        Apply a preset's render chain to a stream.
+
+        The LUT path goes to lut3d as a single option (ffmpeg-python
+        escapes it), so paths containing ',' or ':' survive.
+
+        Args:
+            stream: ffmpeg-python stream to filter
+            chain: LUT and comma-separated filter chain (e.g. "eq=contrast=1.2,vignette=PI/4")
+
+        Returns:
+            Filtered stream
+        """
+        if chain.lut_path:
+            stream = stream.filter('lut3d', file=chain.lut_path)
+        if not chain.filters:
+            return stream
+
+        for filter_spec in chain.filters.split(','):
+            name, _, params = filter_spec.partition('=')
+            args = []
+            kwargs = {}
+            for param in params.split(':') if params else []:
+                key, separator, value = param.partition('=')
+                if separator:
+                    kwargs[key] = value
+                else:
+                    args.append(param)
+            stream = stream.filter(name, *args, **kwargs)
+        return stream
+
+    @staticmethod
+    def _subtitle_style(uniquify: bool) -> str:
+        """Get libass force_style for standard or unique subtitles."""
+        return SUBTITLE_STYLE_UNIQUE if uniquify else SUBTITLE_STYLE_STANDARD
+
+    def _subtitle_overlay(self, text: str, uniquify: bool, video_path: str) -> str:
+        """Get the cached overlay image of a caption at this render's frame size."""
+        width, height = self._frame_size(video_path)
+        return SubtitleOverlayCache().get(text, self._subtitle_style(uniquify), width, height)
+
+    def _prepare_subtitles(
+        self,
+        video_path: str,
+        subtitle_text: Optional[str],
+        subtitle_cues: Optional[List[dict]],
+        uniquify: bool
+    ) -> Optional[tuple]:
+        """
+        Get the burn-in source for a render's subtitles.
+
+        Text that fits in a single cue is shown for the whole video from the
+        cached overlay image. Timed cues, and text long enough to be split
+        into cues paced over the video's duration, are compiled to a cached
+        ASS file.
+
+        Args:
+            video_path: Path to source video file
+            subtitle_text: Subtitle text (optional)
+            subtitle_cues: Timed cue dictionaries (optional, take precedence)
+            uniquify: Apply unique subtitle styling
+
+        Returns:
+            Tuple of ("overlay" or "ass", path), or None without subtitles
+        """
+        if not (subtitle_text or subtitle_cues):
+            return None
+
+        duration = 0.0
+        if not subtitle_cues:
+            duration = get_media_info(video_path).get('duration', 0.0)
+        cues = SubtitleCompiler.cues_for(subtitle_text, subtitle_cues, duration)
+        if not cues:
+            return None
+
+        if not subtitle_cues and len(cues) == 1:
+            return "overlay", self._subtitle_overlay(cues[0].text, uniquify, video_path)
+        return "ass", SubtitleCompiler().compile(cues, uniquify)
+
+    @staticmethod
+    def _burn_subtitles(video, subtitles: tuple, offset: float = 0.0):
+        """
+        Burn prepared subtitles into a video stream.
+
+        Args:
+            video: ffmpeg-python video stream
+            subtitles: Result of _prepare_subtitles
+            offset: Source time of the stream's first frame, for segments
+
+        Returns:
+            Video stream with subtitles
+        """
+        kind, path = subtitles
+        if kind == "overlay":
+            return video.overlay(ffmpeg.input(path))
+
+        if not offset:
+            return video.filter('ass', path)
+        # Shift to source time so cue timing matches, then back
+        return (
+            video
+            .filter('setpts', f'PTS+{offset}/TB')
+            .filter('ass', path)
+            .filter('setpts', f'PTS-{offset}/TB')
+        )
+
+    def _build_video_branch(
+        self,
+        video,
+        video_path: str,
+        filter_type: Optional[str],
+        subtitle_text: Optional[str],
+        uniquify: bool,
+        subtitle_cues: Optional[List[dict]] = None
+    ):
+        """
+        Chain the profile's downscale, the color filter and subtitle burn-in
+        onto a video stream.
+
+        Args:
+            video: ffmpeg-python video stream
+            video_path: Path to source video file
+            filter_type: Visual filter type
+            subtitle_text: Subtitle text (optional)
+            uniquify: Apply unique subtitle styling
+            subtitle_cues: Timed cue dictionaries (optional)
+
+        Returns:
+            Filtered video stream
+        """
+        # Scale first so filters and subtitles run on fewer pixels
+        video = self._scale_video(video, video_path)
+
+        filter_chain = get_filter_registry().render_chain(filter_type)
+        if filter_chain:
+            video = self._apply_filter_chain(video, filter_chain)
+
+        subtitles = self._prepare_subtitles(video_path, subtitle_text, subtitle_cues, uniquify)
+        if subtitles:
+            video = self._burn_subtitles(video, subtitles)
+
+        return video
+
+    @staticmethod
+    def _needs_video_filter(filter_type: Optional[str], subtitles) -> bool:
+        """Check whether the video branch has any filter to run."""
+        return bool(get_filter_registry().get(filter_type) or subtitles)
+
+    @staticmethod
+    def _stream_codec(file_path: str, codec_type: str) -> Optional[str]:
+        """
+        Get the codec name of the first stream of a type.
+
+        Args:
+            file_path: Path to media file
+            codec_type: Stream type ("video" or "audio")
+
+        Returns:
+            Codec name, or None if the file has no such stream or can't be probed
+        """
+        return stream_codec(file_path, codec_type)
+
+    def _video_output(self, source, video_path: str):
+        """
+        Get the unfiltered video stream and codec options for an output.
+
+        Stream-copies the video when the container allows it and the source
+        already fits the encoder profile's maximum height (the draft profile
+        included), otherwise re-encodes with libx264.
+
+        Args:
+            source: ffmpeg-python input node of the source video
+            video_path: Path to source video file
+
+        Returns:
+            Tuple of (stream, output options)
+        """
+        if not self._needs_scale(video_path) and self._stream_codec(video_path, 'video') in MP4_COPY_VIDEO_CODECS:
+            options = {'vcodec': 'copy'}
+            if self.profile.max_duration:
+                options['t'] = self.profile.max_duration
+            return source['v:0'], options
+        return self._scale_video(source['v:0'], video_path), self._encoder_options()
+
+    def _audio_output(self, audio_path: str, volume: float, normalize: bool = False):
+        """
+        Get the audio track stream and codec options for an output.
+
+        The track is stream-copied when its volume is unchanged and its codec
+        fits the MP4 container. Otherwise a prepared AAC track with the volume
+        (and optional loudness normalization) applied is taken from the audio
+        preparation cache and stream-copied, so a soundtrack is encoded once
+        no matter how many renders use it.
+
+        Args:
+            audio_path: Path to audio file
+            volume: Audio volume multiplier
+            normalize: Apply two-pass loudness normalization
+
+        Returns:
+            Tuple of (stream, output options)
+        """
+        if (
+            volume == 1.0
+            and not normalize
+            and self._stream_codec(audio_path, 'audio') in MP4_COPY_AUDIO_CODECS
+        ):
+            return ffmpeg.input(audio_path).audio, {'acodec': 'copy'}
+
+        prepared_path = AudioPreparer().prepare(audio_path, volume, normalize)
+        return ffmpeg.input(prepared_path).audio, {'acodec': 'copy'}
+
     def add_audio(
         self,
         video_path: str,
@@ -55,34 +450,38 @@ class VideoGenerator:
         Raises:
             Exception: If FFmpeg processing fails
         """
-        output_path = self._generate_output_path("audio_mixed")
+        final_path = self._generate_output_path("audio_mixed")
+        workspace = self._open_workspace()
+        output_path = workspace.output_path(final_path)
 
         try:
-            video = ffmpeg.input(video_path)
-            audio = ffmpeg.input(audio_path)
+            # Video is untouched: pass it through when the container allows it
+            video, video_options = self._video_output(ffmpeg.input(video_path), video_path)
 
             # Adjust audio volume
-            audio = audio.filter('volume', volume)
+            audio, audio_options = self._audio_output(audio_path, volume)
 
             # Combine video and audio
             output = ffmpeg.output(
                 video,
                 audio,
                 output_path,
-                vcodec='libx264',
-                acodec='aac',
-                strict='experimental',
+                **video_options,
+                **audio_options,
                 shortest=None  # Use shortest stream duration
             )
 
-            ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+            self._run(output, video_path)
 
-            return output_path
+            return workspace.commit(output_path, final_path)
 
         except ffmpeg.Error as e:
             error_message = e.stderr.decode() if e.stderr else str(e)
             raise Exception(f"Failed to add audio: {error_message}")
 
+        finally:
+            self._close_workspace(workspace)
+
     def apply_filter(
         self,
         video_path: str,
@@ -93,7 +492,8 @@ class VideoGenerator:
 
         Args:
             video_path: Path to source video file
-            filter_type: Filter type (cinematic, bright, cyberpunk, vintage, warm, cool)
+            filter_type: Filter preset name (cinematic, bright, cyberpunk, vintage,
+                warm, cool, or a custom preset)
 
         Returns:
             Path to output video file
@@ -101,55 +501,62 @@ class VideoGenerator:
         Raises:
             Exception: If FFmpeg processing fails
         """
-        output_path = self._generate_output_path(f"filtered_{filter_type}")
+        final_path = self._generate_output_path(f"filtered_{filter_type}")
 
-        # Define filter presets
-        filters = {
-            "cinematic": "eq=contrast=1.2:brightness=0.05:saturation=0.8,vignette=PI/4",
-            "bright": "eq=brightness=0.15:contrast=1.1:saturation=1.2",
-            "cyberpunk": "eq=contrast=1.3:saturation=1.5,colorchannelmixer=rr=1:rb=0.3:br=0.2:bb=1:bg=0.2",
-            "vintage": "curves=vintage,colorbalance=rs=0.1:gs=-0.05:bs=-0.1",
-            "warm": "colortemperature=temperature=7000,eq=saturation=1.1",
-            "cool": "colortemperature=temperature=3000,eq=saturation=1.1",
-            "none": None
-        }
+        filter_chain = get_filter_registry().render_chain(filter_type)
 
-        filter_string = filters.get(filter_type.lower())
+        workspace = self._open_workspace()
+        output_path = workspace.output_path(final_path)
 
         try:
-            video = ffmpeg.input(video_path)
+            source = ffmpeg.input(video_path)
 
-            if filter_string:
-                video = video.filter_multi_output(filter_string)
+            if filter_chain:
+                video = self._scale_video(source.video, video_path)
+                video = self._apply_filter_chain(video, filter_chain)
+                video_options = self._encoder_options()
+            else:
+                video, video_options = self._video_output(source, video_path)
 
             output = ffmpeg.output(
                 video,
+                source['a?'],
                 output_path,
-                vcodec='libx264',
+                **video_options,
                 acodec='copy'
             )
 
-            ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+            self._run(output, video_path)
 
-            return output_path
+            return workspace.commit(output_path, final_path)
 
         except ffmpeg.Error as e:
             error_message = e.stderr.decode() if e.stderr else str(e)
             raise Exception(f"Failed to apply filter: {error_message}")
 
+        finally:
+            self._close_workspace(workspace)
+
     def add_subtitles(
         self,
         video_path: str,
-        text: str,
-        uniquify: bool = False
+        text: Optional[str],
+        uniquify: bool = False,
+        cues: Optional[List[dict]] = None
     ) -> str:
         """
         Add subtitles to video.
 
+        A caption that fits in one cue is rasterized once per text, style and
+        frame size (see SubtitleOverlayCache) and composited with
+        ``overlay``; timed or longer captions are burned in from a compiled
+        ASS file (see SubtitleCompiler).
+
         Args:
             video_path: Path to source video file
             text: Subtitle text content
             uniquify: Apply unique styling to subtitles
+            cues: Timed cues (``start``, ``end``, ``text``) instead of the text
 
         Returns:
             Path to output video file
@@ -157,54 +564,35 @@ class VideoGenerator:
         Raises:
             Exception: If FFmpeg processing fails
         """
-        output_path = self._generate_output_path("subtitled")
-
-        # Create temporary subtitle file (SRT format)
-        srt_path = self.output_dir / f"subtitle_{uuid.uuid4().hex}.srt"
-
-        # Write SRT file
-        with open(srt_path, 'w', encoding='utf-8') as f:
-            f.write("1\n")
-            f.write("00:00:00,000 --> 00:10:00,000\n")
-            f.write(f"{text}\n")
+        final_path = self._generate_output_path("subtitled")
+        workspace = self._open_workspace()
+        output_path = workspace.output_path(final_path)
 
         try:
-            video = ffmpeg.input(video_path)
+            video = self._scale_video(ffmpeg.input(video_path).video, video_path)
 
-            # Subtitle styling
-            if uniquify:
-                # Unique styling: yellow, bold, border
-                subtitle_style = "Fontsize=24,PrimaryColour=&H00FFFF,Bold=1,BorderStyle=1"
-            else:
-                # Standard styling: white, centered
-                subtitle_style = "Fontsize=20,PrimaryColour=&HFFFFFF"
-
-            # Add subtitles using subtitles filter
-            video = video.filter(
-                'subtitles',
-                str(srt_path),
-                force_style=subtitle_style
-            )
+            subtitles = self._prepare_subtitles(video_path, text, cues, uniquify)
+            if subtitles:
+                video = self._burn_subtitles(video, subtitles)
 
             output = ffmpeg.output(
                 video,
                 output_path,
-                vcodec='libx264',
+                **self._encoder_options(),
                 acodec='copy'
             )
 
-            ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
-
-            # Clean up subtitle file
-            srt_path.unlink(missing_ok=True)
+            self._run(output, video_path)
 
-            return output_path
+            return workspace.commit(output_path, final_path)
 
         except ffmpeg.Error as e:
-            srt_path.unlink(missing_ok=True)  # Clean up on error
             error_message = e.stderr.decode() if e.stderr else str(e)
             raise Exception(f"Failed to add subtitles: {error_message}")
 
+        finally:
+            self._close_workspace(workspace)
+
     def composite_video(
         self,
         video_path: str,
@@ -212,12 +600,27 @@ class VideoGenerator:
         subtitle_text: Optional[str] = None,
         volume: int = 100,
         filter_type: str = "none",
-        uniquify: bool = False
+        uniquify: bool = False,
+        segmented: Optional[bool] = None,
+        normalize_audio: bool = False,
+        subtitle_cues: Optional[List[dict]] = None
     ) -> str:
         """
         Composite video with all effects (audio, filters, subtitles).
 
         This is the main processing pipeline that combines all effects.
+        All effects are built into a single filtergraph so the video is
+        decoded and encoded exactly once:
+
+            [0:v] -> color filter -> subtitles -> libx264
+            [1:a] -> prepared AAC track (cached) -> copy
+
+        Streams that need no processing are stream-copied instead, so an
+        audio-only project finishes in roughly I/O time. Long sources can
+        be encoded segment-parallel (see ``_composite_segmented``).
+
+        The output is rendered inside the scratch workspace and only moved
+        to the projects directory once complete.
 
         Args:
             video_path: Path to source video file
@@ -226,6 +629,11 @@ class VideoGenerator:
             volume: Audio volume (0-100)
             filter_type: Visual filter type
             uniquify: Apply unique subtitle styling
+            segmented: Force segment-parallel encoding on or off; None enables
+                it for sources longer than SEGMENT_RENDER_MIN_DURATION
+            normalize_audio: Loudness-normalize the audio track
+            subtitle_cues: Timed cues (``start``, ``end``, ``text``) shown
+                instead of subtitle_text
 
         Returns:
             Path to final output video file
@@ -233,55 +641,439 @@ class VideoGenerator:
         Raises:
             Exception: If any processing step fails
         """
-        current_video = video_path
+        final_path = self._generate_output_path("composite")
+        workspace = self._open_workspace()
+        output_path = workspace.output_path(final_path)
 
         try:
-            # Step 1: Apply visual filter if specified
-            if filter_type and filter_type.lower() != "none":
-                current_video = self.apply_filter(current_video, filter_type)
+            needs_filter = self._needs_video_filter(filter_type, subtitle_text or subtitle_cues)
+            if needs_filter and self._use_segmented(video_path, segmented):
+                self._composite_segmented(
+                    video_path, output_path, audio_path, subtitle_text,
+                    volume, filter_type, uniquify, normalize_audio, workspace, subtitle_cues
+                )
+                return workspace.commit(output_path, final_path)
+
+            source = ffmpeg.input(video_path)
 
-            # Step 2: Add audio if provided
+            # Video branch: color filter, then subtitles; untouched video is copied
+            if needs_filter:
+                video = self._build_video_branch(
+                    source.video, video_path, filter_type, subtitle_text, uniquify, subtitle_cues
+                )
+                video_options = self._encoder_options()
+            else:
+                video, video_options = self._video_output(source, video_path)
+
+            # Audio branch: volume-adjusted track, or the source audio if present
             if audio_path:
                 volume_multiplier = volume / 100.0  # Convert 0-100 to 0.0-1.0
-                current_video = self.add_audio(current_video, audio_path, volume_multiplier)
+                audio, audio_options = self._audio_output(audio_path, volume_multiplier, normalize_audio)
+                audio_options['shortest'] = None  # Use shortest stream duration
+            else:
+                audio, audio_options = source['a?'], {'acodec': 'copy'}
 
-            # Step 3: Add subtitles if provided
-            if subtitle_text:
-                current_video = self.add_subtitles(current_video, subtitle_text, uniquify)
+            output = ffmpeg.output(
+                video,
+                audio,
+                output_path,
+                **video_options,
+                **audio_options
+            )
+
+            self._run(output, video_path)
 
-            return current_video
+            return workspace.commit(output_path, final_path)
+
+        except ffmpeg.Error as e:
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise Exception(f"Video composition failed: {error_message}")
 
         except Exception as e:
             raise Exception(f"Video composition failed: {str(e)}")
 
-    def get_video_info(self, video_path: str) -> dict:
+        finally:
+            self._close_workspace(workspace)
+
+    def _use_segmented(self, video_path: str, segmented: Optional[bool]) -> bool:
+        """Decide whether a render should be encoded segment-parallel."""
+        if self.profile.max_duration:
+            # Only the head of the video is rendered
+            return False
+
+        if segmented is not None:
+            return segmented
+
+        min_duration = settings.SEGMENT_RENDER_MIN_DURATION
+        if min_duration <= 0:
+            return False
+
+        try:
+            return self.get_video_info(video_path).get('duration', 0) >= min_duration
+        except Exception:
+            return False
+
+    def _composite_segmented(
+        self,
+        video_path: str,
+        output_path: str,
+        audio_path: Optional[str],
+        subtitle_text: Optional[str],
+        volume: int,
+        filter_type: str,
+        uniquify: bool,
+        normalize_audio: bool,
+        workspace: RenderWorkspace,
+        subtitle_cues: Optional[List[dict]] = None
+    ) -> None:
         """
-        Get video metadata using FFprobe.
+        Composite a long video by encoding keyframe-aligned segments in parallel.
+
+        1. Split the video stream at keyframes with the segment muxer (stream copy)
+        2. Run the filtergraph on every segment, one FFmpeg process per segment
+        3. Join the encoded segments with the concat demuxer (stream copy)
+        4. Mux the audio track onto the joined video
+
+        Every segment burns in the same prepared subtitles; timed cues keep
+        their timing by shifting each segment's timestamps back to source
+        time around the ``ass`` filter.
 
         Args:
-            video_path: Path to video file
+            video_path: Path to source video file
+            output_path: Path to output video file
+            audio_path: Path to audio file (optional)
+            subtitle_text: Subtitle text (optional)
+            volume: Audio volume (0-100)
+            filter_type: Visual filter type
+            uniquify: Apply unique subtitle styling
+            normalize_audio: Loudness-normalize the audio track
+            workspace: Scratch workspace for segments
+            subtitle_cues: Timed cue dictionaries (optional)
+
+        Raises:
+            ffmpeg.Error: If an FFmpeg step fails
+        """
+        work_dir = workspace.directory("segments")
+
+        try:
+            # Step 1: Split at keyframes without re-encoding
+            segment_list = work_dir / "segments.csv"
+            split = ffmpeg.input(video_path)['v:0'].output(
+                str(work_dir / "source_%05d.mp4"),
+                c='copy',
+                f='segment',
+                segment_time=settings.SEGMENT_RENDER_LENGTH,
+                segment_list=str(segment_list),
+                segment_list_type='csv',
+                reset_timestamps=1
+            )
+            ffmpeg.run(split, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+
+            with open(segment_list, newline='', encoding='utf-8') as f:
+                segments = [
+                    (work_dir / row[0], float(row[1]), float(row[2]))
+                    for row in csv.reader(f) if row
+                ]
+
+            filter_chain = get_filter_registry().render_chain(filter_type)
+
+            subtitles = self._prepare_subtitles(video_path, subtitle_text, subtitle_cues, uniquify)
+
+            # Step 2: Encode segments in parallel
+            # Split the job's thread budget (or the host's cores) between the parallel encodes
+            encoder_options = self._encoder_options()
+            budget = encoder_options.get('threads') or os.cpu_count() or 1
+            workers = settings.SEGMENT_RENDER_WORKERS or os.cpu_count() or 1
+            workers = max(1, min(workers, len(segments), budget))
+            encoder_options['threads'] = max(1, budget // workers)
+            total_duration = segments[-1][2] if segments else 0.0
+            encoded_paths = [work_dir / f"encoded_{index:05d}.mp4" for index in range(len(segments))]
+            # Segments are intermediates; only the joined output needs faststart
+            faststart = encoder_options.pop('movflags', None)
+            started_at = time.monotonic()
+            done_duration = 0.0
+            progress_lock = threading.Lock()
+
+            def encode_segment(index: int) -> None:
+                nonlocal done_duration
+                segment_path, start, end = segments[index]
+                video = self._scale_video(ffmpeg.input(str(segment_path)).video, video_path)
+
+                if filter_chain:
+                    video = self._apply_filter_chain(video, filter_chain)
+
+                if subtitles:
+                    video = self._burn_subtitles(video, subtitles, start)
+
+                output = ffmpeg.output(video, str(encoded_paths[index]), **encoder_options)
+                ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+
+                if self.progress_callback:
+                    with progress_lock:
+                        done_duration += end - start
+                        elapsed = time.monotonic() - started_at
+                        speed = done_duration / elapsed if elapsed > 0 else 0.0
+                        remaining = max(0.0, total_duration - done_duration)
+                        self.progress_callback({
+                            'percent': round(min(99.0, done_duration / total_duration * 100), 1)
+                            if total_duration > 0 else 0.0,
+                            'fps': 0.0,
+                            'speed': round(speed, 2),
+                            'eta_seconds': round(remaining / speed, 1) if speed > 0 else None,
+                            'finished': False,
+                            'timestamp': time.time(),
+                        })
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(encode_segment, range(len(segments))))
+
+            # Step 3: Join encoded segments without re-encoding
+            concat_list = work_dir / "concat.txt"
+            with open(concat_list, 'w', encoding='utf-8') as f:
+                for encoded_path in encoded_paths:
+                    f.write(f"file '{encoded_path.resolve()}'\n")
+
+            joined = ffmpeg.input(str(concat_list), f='concat', safe=0)
+
+            # Step 4: Stitch audio onto the joined video
+            if audio_path:
+                volume_multiplier = volume / 100.0  # Convert 0-100 to 0.0-1.0
+                audio, audio_options = self._audio_output(audio_path, volume_multiplier, normalize_audio)
+                audio_options['shortest'] = None
+            else:
+                audio, audio_options = ffmpeg.input(video_path)['a?'], {'acodec': 'copy'}
+
+            if faststart:
+                audio_options['movflags'] = faststart
+            output = ffmpeg.output(joined.video, audio, output_path, vcodec='copy', **audio_options)
+            ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+
+            if self.progress_callback:
+                elapsed = time.monotonic() - started_at
+                self.progress_callback({
+                    'percent': 100.0,
+                    'fps': 0.0,
+                    'speed': round(total_duration / elapsed, 2) if elapsed > 0 else 0.0,
+                    'eta_seconds': 0.0,
+                    'finished': True,
+                    'timestamp': time.time(),
+                })
+
+        finally:
+            # Segments are the bulk of the scratch space; free them right away
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def composite_batch(
+        self,
+        video_path: str,
+        variants: List[dict],
+        audio_path: Optional[str] = None,
+        volume: int = 100,
+        normalize_audio: bool = False
+    ) -> List[str]:
+        """
+        Composite several variants of one source video in a single FFmpeg run.
+
+        The source is decoded once and its frames are fanned out with
+        ``split``; each branch gets its own filter and subtitles and is
+        encoded to its own output:
+
+            [0:v] -> split -> filter/subtitles -> libx264 (variant 1)
+                           -> filter/subtitles -> libx264 (variant N)
+            [1:a] -> prepared AAC track (cached) -> copy (every variant)
+
+        Variants without a filter or subtitles stream-copy the source video.
+        The job's thread budget is split between the variants that encode.
+
+        Args:
+            video_path: Path to source video file
+            variants: Variant settings, each with optional ``filter_type``,
+                ``subtitle_text``, ``subtitle_cues`` and ``uniquify`` keys
+            audio_path: Path to audio file shared by all variants (optional)
+            volume: Audio volume (0-100)
+            normalize_audio: Loudness-normalize the audio track
 
         Returns:
-            Dictionary with video metadata (duration, resolution, codec, etc.)
+            Output file paths, in variant order
+
+        Raises:
+            Exception: If processing fails
         """
+        count = len(variants)
+        final_paths = [self._generate_output_path("variant") for _ in range(count)]
+        workspace = self._open_workspace()
+        output_paths = [workspace.output_path(final_path) for final_path in final_paths]
+
         try:
-            probe = ffmpeg.probe(video_path)
-            video_stream = next(
-                (stream for stream in probe['streams'] if stream['codec_type'] == 'video'),
-                None
+            source = ffmpeg.input(video_path)
+
+            # Only variants with filters or subtitles need decoded frames
+            filtered = [
+                index for index, variant in enumerate(variants)
+                if self._needs_video_filter(
+                    variant.get('filter_type'),
+                    variant.get('subtitle_text') or variant.get('subtitle_cues')
+                )
+            ]
+            video_branches = {}
+            if len(filtered) > 1:
+                video_split = source.video.filter_multi_output('split', len(filtered))
+                for branch, index in enumerate(filtered):
+                    video_branches[index] = video_split.stream(branch)
+            elif filtered:
+                video_branches[filtered[0]] = source.video
+
+            # The prepared audio is an input stream, so every output can map it
+            if audio_path:
+                volume_multiplier = volume / 100.0  # Convert 0-100 to 0.0-1.0
+                audio, audio_options = self._audio_output(audio_path, volume_multiplier, normalize_audio)
+                audio_options['shortest'] = None
+            else:
+                audio, audio_options = source['a?'], {'acodec': 'copy'}
+
+            unfiltered = {
+                index: self._video_output(source, video_path)
+                for index in range(len(variants)) if index not in video_branches
+            }
+
+            # The encodes run in one FFmpeg process; split the job's thread
+            # budget (or the host's cores) between them
+            encoder_options = self._encoder_options()
+            budget = encoder_options.get('threads') or os.cpu_count() or 1
+            encodes = len(filtered) + sum(
+                1 for _, options in unfiltered.values() if options.get('vcodec') != 'copy'
             )
+            threads = max(1, budget // max(1, encodes))
+            encoder_options['threads'] = threads
+
+            outputs = []
+            for index, variant in enumerate(variants):
+                if index in video_branches:
+                    video = self._build_video_branch(
+                        video_branches[index],
+                        video_path,
+                        variant.get('filter_type'),
+                        variant.get('subtitle_text'),
+                        variant.get('uniquify', False),
+                        variant.get('subtitle_cues')
+                    )
+                    video_options = dict(encoder_options)
+                else:
+                    video, video_options = unfiltered[index]
+                    if video_options.get('vcodec') != 'copy':
+                        video_options['threads'] = threads
 
-            if video_stream:
-                return {
-                    'duration': float(probe['format'].get('duration', 0)),
-                    'width': int(video_stream.get('width', 0)),
-                    'height': int(video_stream.get('height', 0)),
-                    'codec': video_stream.get('codec_name', 'unknown'),
-                    'fps': eval(video_stream.get('r_frame_rate', '0/1')),
-                    'size': int(probe['format'].get('size', 0))
-                }
+                outputs.append(ffmpeg.output(
+                    video,
+                    audio,
+                    output_paths[index],
+                    **video_options,
+                    **audio_options
+                ))
 
-            return {}
+            self._run(ffmpeg.merge_outputs(*outputs), video_path)
 
+            return [
+                workspace.commit(output_path, final_path)
+                for output_path, final_path in zip(output_paths, final_paths)
+            ]
+
+        except ffmpeg.Error as e:
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise Exception(f"Batch composition failed: {error_message}")
+
+        except Exception as e:
+            raise Exception(f"Batch composition failed: {str(e)}")
+
+        finally:
+            self._close_workspace(workspace)
+
+    def create_mezzanine(self, video_path: str) -> str:
+        """
+        Transcode a source into the house mezzanine format.
+
+        The mezzanine is a fixed-size vertical H.264/AAC MP4 at a constant
+        frame rate with a keyframe every MEZZANINE_KEYFRAME_INTERVAL seconds
+        and the moov atom up front. Renders from it never need to conform
+        odd codecs, frame rates or GOP structures, and segment-parallel
+        splits land on regular keyframes.
+
+        Args:
+            video_path: Path to source video file
+
+        Returns:
+            Path to mezzanine file
+
+        Raises:
+            Exception: If FFmpeg processing fails
+        """
+        mezzanine_dir = Path(settings.UPLOAD_DIR) / "videos" / "mezzanine"
+        mezzanine_dir.mkdir(parents=True, exist_ok=True)
+        final_path = str(mezzanine_dir / f"{Path(video_path).stem}_mezzanine.mp4")
+
+        width = settings.MEZZANINE_WIDTH
+        height = settings.MEZZANINE_HEIGHT
+        fps = settings.MEZZANINE_FPS
+        gop = max(1, round(fps * settings.MEZZANINE_KEYFRAME_INTERVAL))
+
+        workspace = self._open_workspace()
+        output_path = workspace.output_path(final_path)
+
+        try:
+            source = ffmpeg.input(video_path)
+            video = (
+                source.video
+                .filter('scale', width, height, force_original_aspect_ratio='decrease')
+                .filter('pad', width, height, '(ow-iw)/2', '(oh-ih)/2')
+                .filter('setsar', 1)
+                .filter('fps', fps)
+                .filter('format', 'yuv420p')
+            )
+
+            # The mezzanine has its own quality settings and is never cut short
+            encoder_options = self._encoder_options()
+            encoder_options.pop('t', None)
+            encoder_options.update(
+                preset=settings.MEZZANINE_PRESET,
+                crf=settings.MEZZANINE_CRF,
+                movflags='+faststart'
+            )
+
+            output = ffmpeg.output(
+                video,
+                source['a?'],
+                output_path,
+                **encoder_options,
+                g=gop,
+                keyint_min=gop,
+                sc_threshold=0,
+                acodec='aac',
+                ar=48000,
+                ac=2
+            )
+
+            self._run(output, video_path)
+
+            return workspace.commit(output_path, final_path)
+
+        except ffmpeg.Error as e:
+            error_message = e.stderr.decode() if e.stderr else str(e)
+            raise Exception(f"Failed to create mezzanine: {error_message}")
+
+        finally:
+            self._close_workspace(workspace)
+
+    def get_video_info(self, video_path: str) -> dict:
+        """
+        Get video metadata using FFprobe (cached per file version).
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Dictionary with video metadata (duration, resolution, codec, etc.)
+        """
+        try:
+            return get_media_info(video_path)
         except Exception as e:
             raise Exception(f"Failed to get video info: {str(e)}")
@@ -0,0 +1,208 @@
+"""
+Bulk video statistics ingestion.
+Applies scraped views, likes and comments to many videos with set-based SQL.
+"""
+import io
+import logging
+from typing import Dict, Iterable, List
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Float, Numeric, bindparam, case, cast, column, func, select, table, update
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import Video
+from app.schemas import VideoStatsUpdate
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+videos = Video.__table__
+
+# Temporary table the PostgreSQL path COPYs rows into
+STAGING_TABLE = "video_stats_staging"
+staging = table(STAGING_TABLE, column("id"), column("views"), column("likes"), column("comments"))
+
+_updates_adapter = TypeAdapter(List[VideoStatsUpdate])
+
+
+class StatsPayloadError(Exception):
+    """Raised when a bulk statistics payload cannot be parsed."""
+
+
+def parse_stats(payload: bytes, ndjson: bool) -> List[VideoStatsUpdate]:
+    """
+    Parse a bulk statistics payload.
+
+    Args:
+        payload: Request body, a JSON array or one JSON object per line
+        ndjson: Parse as newline-delimited JSON
+
+    Returns:
+        Parsed updates
+
+    Raises:
+        StatsPayloadError: If the payload or a row is invalid
+    """
+    if not ndjson:
+        try:
+            return _updates_adapter.validate_json(payload)
+        except ValidationError as e:
+            raise StatsPayloadError(str(e))
+
+    updates = []
+    for number, line in enumerate(payload.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            updates.append(VideoStatsUpdate.model_validate_json(line))
+        except ValidationError as e:
+            raise StatsPayloadError(f"Line {number}: {e}")
+    return updates
+
+
+def engagement_rate_sql(views, likes, comments):
+    """
+    SQL expression of ``Video.calculate_engagement``.
+
+    ((likes + comments) / views) * 100 rounded to two decimals, 0 without
+    views. The quotient is cast to NUMERIC because PostgreSQL only rounds
+    to a number of decimals on NUMERIC.
+    """
+    rate = cast(likes + comments, Float) * 100 / views
+    return case((views > 0, func.round(cast(rate, Numeric), 2)), else_=0.0)
+
+
+def _stats_values(views, likes, comments) -> dict:
+    """SET clause for new statistics; missing (NULL) values keep the stored ones."""
+    views = func.coalesce(views, videos.c.views)
+    likes = func.coalesce(likes, videos.c.likes)
+    comments = func.coalesce(comments, videos.c.comments)
+    return {
+        "views": views,
+        "likes": likes,
+        "comments": comments,
+        "engagement_rate": engagement_rate_sql(views, likes, comments),
+    }
+
+
+def _copy_value(value) -> str:
+    return "\\N" if value is None else str(value)
+
+
+def _apply_copy(db: Session, rows: List[VideoStatsUpdate]) -> int:
+    """COPY rows into a temporary staging table and UPDATE ... FROM it (PostgreSQL)."""
+    buffer = io.StringIO("".join(
+        f"{row.video_id}\t{_copy_value(row.views)}\t{_copy_value(row.likes)}\t{_copy_value(row.comments)}\n"
+        for row in rows
+    ))
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} "
+            "(id integer, views bigint, likes bigint, comments integer) ON COMMIT DROP"
+        )
+        cursor.copy_expert(f"COPY {STAGING_TABLE} (id, views, likes, comments) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+    statement = (
+        update(videos)
+        .where(videos.c.id == staging.c.id)
+        .values(**_stats_values(staging.c.views, staging.c.likes, staging.c.comments))
+    )
+    return db.execute(statement).rowcount
+
+
+def _apply_batches(db: Session, rows: List[VideoStatsUpdate]) -> int:
+    """
+    UPDATE in executemany batches of STATS_BATCH_SIZE rows (any database).
+
+    Drivers may report -1 as the rowcount of an executemany, so the
+    updated rows are counted with a SELECT of the batch's IDs.
+    """
+    statement = (
+        update(videos)
+        .where(videos.c.id == bindparam("b_id"))
+        .values(**_stats_values(bindparam("b_views"), bindparam("b_likes"), bindparam("b_comments")))
+    )
+
+    updated = 0
+    batch_size = max(1, settings.STATS_BATCH_SIZE)
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        updated += db.execute(
+            select(func.count()).select_from(videos).where(videos.c.id.in_([row.video_id for row in batch]))
+        ).scalar()
+        params = [
+            {"b_id": row.video_id, "b_views": row.views, "b_likes": row.likes, "b_comments": row.comments}
+            for row in batch
+        ]
+        db.execute(statement, params)
+    return updated
+
+
+def apply_stats(db: Session, updates: Iterable[VideoStatsUpdate]) -> Dict[str, int]:
+    """
+    Apply statistics updates with set-based SQL, computing engagement_rate in SQL.
+
+    Rows for the same video are collapsed to the last one. On PostgreSQL
+    (psycopg2) the rows are COPYed into a temporary table and applied with
+    a single UPDATE ... FROM; elsewhere they are applied as batched UPDATEs.
+    The caller commits.
+
+    Args:
+        db: Database session
+        updates: Parsed updates
+
+    Returns:
+        Number of received, updated and missing (unknown video) rows
+    """
+    received = 0
+    latest = {}
+    for row in updates:
+        received += 1
+        latest[row.video_id] = row
+
+    # Ordered by primary key so concurrent ingests lock rows in the same order
+    rows = [latest[video_id] for video_id in sorted(latest)]
+    if not rows:
+        return {"received": received, "updated": 0, "missing": 0}
+
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+        updated = _apply_copy(db, rows)
+    else:
+        updated = _apply_batches(db, rows)
+
+    return {"received": received, "updated": updated, "missing": len(rows) - updated}
+
+
+def ingest_video_stats(payload: bytes, ndjson: bool) -> Dict[str, int]:
+    """
+    Parse and apply a bulk statistics payload in its own session.
+
+    Args:
+        payload: Request body
+        ndjson: Parse as newline-delimited JSON
+
+    Returns:
+        Number of received, updated and missing rows
+
+    Raises:
+        StatsPayloadError: If the payload is invalid (nothing is applied)
+    """
+    from app.database import SessionLocal
+
+    updates = parse_stats(payload, ndjson)
+
+    db = SessionLocal()
+    try:
+        counts = apply_stats(db, updates)
+        db.commit()
+        logger.info(f"Applied statistics of {counts['updated']} videos ({counts['missing']} unknown)")
+        return counts
+
+    finally:
+        db.close()
@@ -0,0 +1,233 @@
+"""
+Scratch workspaces for render jobs.
+Keeps intermediates out of the output directories and reclaims them reliably.
+"""
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Seconds between touches of a live workspace, which keep it from looking stale
+HEARTBEAT_INTERVAL = 60.0
+
+
+def get_scratch_root() -> Path:
+    """Get the scratch root directory (RENDER_SCRATCH_DIR or UPLOAD_DIR/scratch)."""
+    return Path(settings.RENDER_SCRATCH_DIR or Path(settings.UPLOAD_DIR) / "scratch")
+
+
+def _directory_size(path: Path) -> int:
+    """Sum file sizes under a directory, ignoring files that vanish mid-walk."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                continue
+    return total
+
+
+class RenderWorkspace:
+    """
+    Per-job scratch directory.
+
+    Every intermediate file of a render (subtitle files, segments, partial
+    outputs) is written here. Only the final output leaves the workspace,
+    through an atomic ``commit``; everything else is removed on ``cleanup``,
+    whether the render succeeded or failed.
+
+    Directories are named ``<prefix>__<host>__<pid>__<id>`` so that
+    workspaces of dead worker processes can be found and reclaimed after
+    a restart. While the workspace exists, a heartbeat thread touches its
+    directory every HEARTBEAT_INTERVAL seconds, so other hosts sharing the
+    scratch root only reclaim it once its process is gone.
+
+    Usage:
+        with RenderWorkspace() as workspace:
+            scratch_path = workspace.output_path(final_path)
+            ...  # render into scratch_path
+            workspace.commit(scratch_path, final_path)
+    """
+
+    def __init__(self, root: Optional[str] = None, prefix: str = "job"):
+        self.root = Path(root) if root else get_scratch_root()
+        name = f"{prefix}__{socket.gethostname()}__{os.getpid()}__{uuid.uuid4().hex[:12]}"
+        self.path = self.root / name
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._stopped = threading.Event()
+        threading.Thread(target=self._heartbeat, name=f"workspace-{name}", daemon=True).start()
+
+    def __enter__(self) -> "RenderWorkspace":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.cleanup()
+
+    def _heartbeat(self) -> None:
+        while not self._stopped.wait(HEARTBEAT_INTERVAL):
+            self.touch()
+
+    def touch(self) -> None:
+        """Mark the workspace as in use now (its age counts from here)."""
+        try:
+            os.utime(self.path)
+        except FileNotFoundError:
+            pass
+
+    def file(self, name: str) -> Path:
+        """Get a path for a named file inside the workspace."""
+        return self.path / name
+
+    def temp_file(self, prefix: str, suffix: str) -> Path:
+        """Get a unique file path inside the workspace."""
+        return self.path / f"{prefix}_{uuid.uuid4().hex}{suffix}"
+
+    def directory(self, prefix: str) -> Path:
+        """Create a unique subdirectory inside the workspace."""
+        path = self.path / f"{prefix}_{uuid.uuid4().hex}"
+        path.mkdir(parents=True)
+        return path
+
+    def output_path(self, final_path: str) -> str:
+        """Get the scratch path a final output is rendered to before commit."""
+        return str(self.path / Path(final_path).name)
+
+    def commit(self, scratch_path: str, final_path: str) -> str:
+        """
+        Move a finished file to its final location atomically.
+
+        A rename is atomic on the same filesystem. When the scratch space is
+        on a different filesystem (e.g. tmpfs), the file is copied next to
+        the destination first and then renamed into place, so readers never
+        see a partial file.
+
+        Args:
+            scratch_path: Finished file inside the workspace
+            final_path: Destination path
+
+        Returns:
+            Final path
+        """
+        final = Path(final_path)
+        final.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            os.replace(scratch_path, final)
+        except OSError:
+            staging = final.with_name(f".{final.name}.{uuid.uuid4().hex}.partial")
+            try:
+                shutil.copyfile(scratch_path, staging)
+                os.replace(staging, final)
+            finally:
+                staging.unlink(missing_ok=True)
+            Path(scratch_path).unlink(missing_ok=True)
+
+        return str(final)
+
+    def size(self) -> int:
+        """Get the bytes currently used by the workspace."""
+        return _directory_size(self.path)
+
+    def cleanup(self) -> None:
+        """Remove the workspace and everything left in it."""
+        self._stopped.set()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def reclaim_stale_workspaces(root: Optional[str] = None, max_age: Optional[float] = None) -> dict:
+    """
+    Remove workspaces left behind by crashed or restarted workers.
+
+    A workspace is stale if it belongs to this host and its process no
+    longer exists, or if its heartbeat stopped more than ``max_age``
+    seconds ago (covering workspaces of other hosts sharing the scratch
+    directory).
+
+    Args:
+        root: Scratch root (default: configured scratch root)
+        max_age: Maximum workspace age in seconds (default: RENDER_SCRATCH_MAX_AGE)
+
+    Returns:
+        Number of reclaimed workspaces and bytes freed
+    """
+    scratch_root = Path(root) if root else get_scratch_root()
+    max_age = settings.RENDER_SCRATCH_MAX_AGE if max_age is None else max_age
+    hostname = socket.gethostname()
+    now = time.time()
+
+    reclaimed = 0
+    freed_bytes = 0
+    if not scratch_root.exists():
+        return {"workspaces": reclaimed, "freed_bytes": freed_bytes}
+
+    for path in scratch_root.iterdir():
+        if not path.is_dir():
+            continue
+
+        parts = path.name.split("__")
+        if len(parts) != 4 or not parts[2].isdigit():
+            continue
+        host, pid = parts[1], int(parts[2])
+
+        try:
+            age = now - path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+
+        dead_local = host == hostname and pid != os.getpid() and not _process_alive(pid)
+        if dead_local or age > max_age:
+            freed_bytes += _directory_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+            reclaimed += 1
+
+    if reclaimed:
+        logger.info(f"Reclaimed {reclaimed} stale render workspaces ({freed_bytes} bytes)")
+
+    return {"workspaces": reclaimed, "freed_bytes": freed_bytes}
+
+
+def scratch_usage(root: Optional[str] = None) -> dict:
+    """
+    Get disk usage of the scratch space.
+
+    Args:
+        root: Scratch root (default: configured scratch root)
+
+    Returns:
+        Scratch path, active workspace count, bytes used and filesystem free space
+    """
+    scratch_root = Path(root) if root else get_scratch_root()
+    scratch_root.mkdir(parents=True, exist_ok=True)
+
+    workspaces = [path for path in scratch_root.iterdir() if path.is_dir()]
+    disk = shutil.disk_usage(scratch_root)
+
+    return {
+        "path": str(scratch_root),
+        "workspaces": len(workspaces),
+        "size_bytes": sum(_directory_size(path) for path in workspaces),
+        "disk_total_bytes": disk.total,
+        "disk_free_bytes": disk.free,
+    }
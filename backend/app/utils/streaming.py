@@ -0,0 +1,227 @@
+"""
+Ranged file streaming.
+Serves large media files with HTTP Range, ETag and Last-Modified support
+and without copying the bytes through Python where the server allows it.
+"""
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import anyio
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Bytes read per body message when the server has no zero-copy extension
+STREAM_CHUNK_SIZE = 256 * 1024
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangedFileResponse(Response):
+    """
+    Response sending ``length`` bytes of a file starting at ``start``.
+
+    If the ASGI server offers the ``http.response.zerocopysend`` extension
+    the open file is handed to it and the kernel copies the bytes
+    (sendfile); otherwise the range is read in STREAM_CHUNK_SIZE pieces on
+    a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        start: int,
+        length: int,
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        media_type: Optional[str] = None,
+        send_body: bool = True
+    ):
+        self.path = path
+        self.start = start
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.send_body = send_body
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        if not self.send_body or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            file = await anyio.to_thread.run_sync(open, self.path, "rb")
+            try:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.start,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            finally:
+                await anyio.to_thread.run_sync(file.close)
+            return
+
+        remaining = self.length
+        async with await anyio.open_file(self.path, "rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+        if remaining > 0:
+            # File shrank while streaming; end the body
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range.
+
+    Returns:
+        (start, end) inclusive, or None for a header that is not a single
+        byte range (served as the whole file)
+
+    Raises:
+        HTTPException: 416 if the range is not satisfiable
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+        return max(0, size - suffix), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the file."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _range_applies(request: Request, etag: str, last_modified: str) -> bool:
+    """Evaluate If-Range: a stale validator means the whole file is sent."""
+    if_range = request.headers.get("if-range")
+    return if_range is None or if_range.strip() in (etag, last_modified)
+
+
+async def ranged_file_response(
+    request: Request,
+    path: str,
+    media_type: Optional[str] = None,
+    etag: Optional[str] = None,
+    filename: Optional[str] = None,
+    download: bool = False,
+    cache_control: str = "private, max-age=3600"
+) -> Response:
+    """
+    Serve a file with Range, ETag and Last-Modified support.
+
+    When STREAM_ACCEL_REDIRECT_PREFIX is set and the file is under
+    UPLOAD_DIR, the response is an ``X-Accel-Redirect`` to that internal
+    location and the reverse proxy (nginx) sends the file with sendfile,
+    handling ranges and validators itself.
+
+    Args:
+        request: Incoming request (GET or HEAD)
+        path: File to serve
+        media_type: Content type (default: guessed from the extension)
+        etag: Strong validator such as a content hash (default: from size and mtime)
+        filename: Name offered in Content-Disposition (default: file name)
+        download: Offer the file as an attachment instead of inline
+        cache_control: Cache-Control header value
+
+    Returns:
+        200 with the file, 206 with a byte range, or 304 if not modified
+
+    Raises:
+        HTTPException: 404 if the file is missing, 416 for an unsatisfiable range
+    """
+    try:
+        stat = await run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    media_type = media_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
+    filename = filename or Path(path).name
+    disposition = "attachment" if download else "inline"
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": cache_control,
+        "Content-Disposition": f'{disposition}; filename="{filename}"',
+    }
+
+    if settings.STREAM_ACCEL_REDIRECT_PREFIX:
+        try:
+            key = Path(os.path.abspath(path)).relative_to(os.path.abspath(settings.UPLOAD_DIR)).as_posix()
+        except ValueError:
+            key = None
+        if key is not None:
+            headers["X-Accel-Redirect"] = settings.STREAM_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + key
+            return Response(status_code=200, headers=headers, media_type=media_type)
+
+    etag = f'"{etag}"' if etag else f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    headers["ETag"] = etag
+    headers["Last-Modified"] = last_modified
+
+    if _not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    send_body = request.method != "HEAD"
+    size = stat.st_size
+
+    range_header = request.headers.get("range")
+    byte_range = None
+    if range_header and _range_applies(request, etag, last_modified):
+        byte_range = _parse_range(range_header, size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return RangedFileResponse(path, 0, size, 200, headers, media_type, send_body)
+
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return RangedFileResponse(path, start, end - start + 1, 206, headers, media_type, send_body)
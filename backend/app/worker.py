@@ -0,0 +1,49 @@
+"""
+Standalone render node.
+Runs a render worker against the shared database without serving the API.
+
+Usage:
+    python -m app.worker
+"""
+import logging
+import signal
+import threading
+
+from app.config import init_directories
+from app.database import engine, Base
+from app.services.render_pool import get_render_pool
+from app.services.render_worker import get_render_worker
+from app.services.workspace import reclaim_stale_workspaces
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """Run a render worker until SIGINT or SIGTERM."""
+    pool = get_render_pool()
+    logger.info(f"Starting render node ({pool.max_workers} workers, {pool.threads_per_job} threads each)")
+
+    init_directories()
+    reclaim_stale_workspaces()
+    Base.metadata.create_all(bind=engine)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    worker = get_render_worker()
+    worker.start()
+    stop.wait()
+
+    logger.info("Stopping render node")
+    worker.stop()
+    # Let running renders finish so their jobs complete instead of waiting out the lease
+    get_render_pool().shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main()
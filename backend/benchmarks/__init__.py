@@ -0,0 +1,3 @@
+"""
+Render benchmarks for the video generator.
+"""
@@ -0,0 +1,205 @@
+"""
+Benchmark the video generator's render operations on synthetic sources.
+
+Generates H.264/AAC sources with FFmpeg's lavfi ``testsrc2`` and ``sine``
+sources at each resolution and duration, then times every filter preset,
+the audio mix, the subtitle burn-in and the full composite through
+``VideoGenerator``. Each case runs in a fresh process so its peak RSS
+(including the FFmpeg children it starts) is measured on its own.
+
+Results are written as JSON so runs before and after a change can be
+compared. Everything runs offline on the CPU.
+
+Usage (from the backend directory):
+    python -m benchmarks.render_suite --resolutions 640x360,1280x720 --durations 5,20 --output bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.segment_parallel import generate_source
+
+OPERATIONS = ("filter", "audio", "subtitles", "composite")
+
+SUBTITLE_TEXT = "Benchmark caption"
+
+
+def generate_audio(path: Path, duration: float) -> None:
+    """Generate a synthetic AAC audio track."""
+    import ffmpeg
+
+    audio = ffmpeg.input("sine=frequency=220:sample_rate=48000", f='lavfi', t=duration)
+    output = ffmpeg.output(audio, str(path), acodec='aac')
+    ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+
+
+def run_case(case: dict) -> dict:
+    """
+    Run one benchmark case in the current process.
+
+    Args:
+        case: Operation, filter, source and audio paths, frame count
+
+    Returns:
+        The case with wall time, encode fps, peak RSS and output size added
+    """
+    from app.services.filter_presets import get_filter_registry
+    from app.services.video_generator import VideoGenerator
+
+    generator = VideoGenerator(profile=case["profile"])
+    operation = case["operation"]
+
+    # Bake the preset's LUT outside the timed section
+    if case["filter"] != "none":
+        get_filter_registry().render_chain(case["filter"])
+
+    started = time.perf_counter()
+    if operation == "filter":
+        output = generator.apply_filter(case["source"], case["filter"])
+    elif operation == "audio":
+        output = generator.add_audio(case["source"], case["audio"], volume=0.8)
+    elif operation == "subtitles":
+        output = generator.add_subtitles(case["source"], SUBTITLE_TEXT)
+    else:
+        output = generator.composite_video(
+            video_path=case["source"],
+            audio_path=case["audio"],
+            subtitle_text=SUBTITLE_TEXT,
+            volume=80,
+            filter_type=case["filter"],
+            segmented=False
+        )
+    elapsed = time.perf_counter() - started
+
+    # ru_maxrss is in kilobytes on Linux; children are the FFmpeg processes
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    ) * 1024
+
+    output_path = Path(output)
+    result = dict(case)
+    result.update({
+        "wall_seconds": round(elapsed, 3),
+        "encode_fps": round(case["frames"] / elapsed, 1) if elapsed > 0 else None,
+        "peak_rss_bytes": peak_rss,
+        "output_bytes": output_path.stat().st_size,
+    })
+    output_path.unlink(missing_ok=True)
+    return result
+
+
+def ffmpeg_version() -> str:
+    """Get the first line of ``ffmpeg -version``."""
+    try:
+        completed = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True, check=True)
+        return completed.stdout.splitlines()[0]
+    except (OSError, subprocess.CalledProcessError, IndexError):
+        return "unknown"
+
+
+def parse_resolution(value: str) -> tuple:
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resolutions", default="640x360,1280x720,1920x1080", help="Comma-separated WxH list")
+    parser.add_argument("--durations", default="5,20", help="Comma-separated source durations in seconds")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--operations", default=",".join(OPERATIONS), help="Subset of: " + ", ".join(OPERATIONS))
+    parser.add_argument("--filters", help="Comma-separated filter presets (default: every FilterType)")
+    parser.add_argument("--profile", default="standard", help="Encoder profile to render with")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if not shutil.which("ffmpeg"):
+        print("ffmpeg not found on PATH", file=sys.stderr)
+        return 1
+
+    work_dir = Path(tempfile.mkdtemp(prefix="render_bench_"))
+    # Inherited by the case processes, which import the settings fresh
+    os.environ["UPLOAD_DIR"] = str(work_dir)
+    os.environ["RENDER_SCRATCH_DIR"] = str(work_dir / "scratch")
+
+    from app.models import FilterType
+
+    resolutions = [parse_resolution(value) for value in args.resolutions.split(",") if value]
+    durations = [float(value) for value in args.durations.split(",") if value]
+    operations = [value for value in args.operations.split(",") if value in OPERATIONS]
+    filters = args.filters.split(",") if args.filters else [filter_type.value for filter_type in FilterType]
+
+    cases = []
+    for duration in durations:
+        audio = work_dir / f"audio_{duration:g}s.m4a"
+        generate_audio(audio, duration)
+
+        for width, height in resolutions:
+            source = work_dir / f"source_{width}x{height}_{duration:g}s.mp4"
+            print(f"Generating {duration:g}s {width}x{height}@{args.fps} source...")
+            generate_source(source, duration, width, height, args.fps)
+
+            base = {
+                "resolution": f"{width}x{height}",
+                "duration": duration,
+                "fps": args.fps,
+                "frames": int(duration * args.fps),
+                "profile": args.profile,
+                "source": str(source),
+                "audio": str(audio),
+            }
+            for operation in operations:
+                case_filters = filters if operation in ("filter", "composite") else ["none"]
+                for filter_type in case_filters:
+                    cases.append(dict(base, operation=operation, filter=filter_type))
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        for case in cases:
+            for run in range(args.repeat):
+                result = pool.apply(run_case, (case,))
+                result["run"] = run
+                results.append(result)
+                print(
+                    f"{result['operation']:>10} {result['filter']:>10} {result['resolution']:>10} "
+                    f"{result['duration']:5g}s: {result['wall_seconds']:7.2f}s "
+                    f"{result['encode_fps']:7.1f} fps {result['peak_rss_bytes'] / 1048576:7.1f} MB RSS "
+                    f"{result['output_bytes'] / 1048576:7.2f} MB out"
+                )
+
+    report = {
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "ffmpeg": ffmpeg_version(),
+        },
+        "profile": args.profile,
+        "cases": [
+            {key: value for key, value in result.items() if key not in ("source", "audio")}
+            for result in results
+        ],
+    }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"Results written to {args.output}")
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
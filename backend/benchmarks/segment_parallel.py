@@ -0,0 +1,85 @@
+"""
+Benchmark segment-parallel encoding against the serial render path.
+
+Generates a synthetic source with FFmpeg's lavfi ``testsrc2`` and ``sine``
+sources, renders it with ``VideoGenerator.composite_video`` both serially
+and segment-parallel, and reports the wall-clock speedup.
+
+Usage (from the backend directory):
+    python -m benchmarks.segment_parallel --duration 180 --filter cinematic
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def generate_source(path: Path, duration: float, width: int, height: int, fps: int) -> None:
+    """Generate a synthetic H.264/AAC source video."""
+    import ffmpeg
+
+    video = ffmpeg.input(f"testsrc2=size={width}x{height}:rate={fps}", f='lavfi', t=duration)
+    audio = ffmpeg.input("sine=frequency=440:sample_rate=48000", f='lavfi', t=duration)
+    output = ffmpeg.output(
+        video, audio, str(path),
+        vcodec='libx264', preset='veryfast', g=fps * 2, pix_fmt='yuv420p', acodec='aac'
+    )
+    ffmpeg.run(output, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=180.0, help="Source duration in seconds")
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=1920)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--filter", default="cinematic", help="Filter preset to render")
+    parser.add_argument("--subtitle", default="Benchmark caption", help="Subtitle text (empty to disable)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="segment_bench_"))
+    os.environ["UPLOAD_DIR"] = str(work_dir)
+
+    from app.services.video_generator import VideoGenerator
+
+    source = work_dir / "source.mp4"
+    print(f"Generating {args.duration:.0f}s {args.width}x{args.height}@{args.fps} source...")
+    generate_source(source, args.duration, args.width, args.height, args.fps)
+
+    generator = VideoGenerator()
+    results = {
+        "duration": args.duration,
+        "resolution": f"{args.width}x{args.height}",
+        "fps": args.fps,
+        "filter": args.filter,
+        "cpu_count": os.cpu_count(),
+    }
+
+    for mode, segmented in (("serial", False), ("segmented", True)):
+        started = time.perf_counter()
+        output = generator.composite_video(
+            video_path=str(source),
+            subtitle_text=args.subtitle or None,
+            filter_type=args.filter,
+            segmented=segmented
+        )
+        elapsed = time.perf_counter() - started
+        results[f"{mode}_seconds"] = round(elapsed, 2)
+        print(f"{mode:>10}: {elapsed:7.2f}s ({args.duration / elapsed:.2f}x realtime)")
+        Path(output).unlink(missing_ok=True)
+
+    results["speedup"] = round(results["serial_seconds"] / results["segmented_seconds"], 2)
+    print(f"   speedup: {results['speedup']:.2f}x")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""
+Test configuration.
+Points the app at a throwaway SQLite database and upload directory before
+any app module reads its settings.
+"""
+import os
+import tempfile
+
+_root = tempfile.mkdtemp(prefix="admin-panel-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_root}/test.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_root, "uploads")
+
+import pytest  # noqa: E402
+
+from app.database import Base, SessionLocal, engine, init_db  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """Fresh tables and a session for each test."""
+    init_db()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
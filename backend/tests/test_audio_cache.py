@@ -0,0 +1,42 @@
+"""
+Tests for the prepared audio cache.
+"""
+import os
+
+from app.services.audio_cache import AudioPreparer
+
+
+def test_evict_drops_least_recently_used(tmp_path):
+    preparer = AudioPreparer(cache_dir=str(tmp_path), max_bytes=250)
+    for index, name in enumerate(["old.m4a", "abc.target.loudnorm.json", "new.m4a"]):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + index, 1000 + index))
+    in_progress = tmp_path / ".new.1234.m4a"
+    in_progress.write_bytes(b"x" * 100)
+
+    assert preparer.evict() == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        ".new.1234.m4a", "abc.target.loudnorm.json", "new.m4a"
+    ]
+
+
+def test_cached_measurement_is_reused_and_touched(tmp_path, monkeypatch):
+    preparer = AudioPreparer(cache_dir=str(tmp_path), max_bytes=1024)
+    monkeypatch.setattr("app.services.audio_cache.file_content_hash", lambda path: "abc")
+
+    measurement = {"input_i": "-20.0"}
+    calls = []
+
+    def run(stream, **kwargs):
+        calls.append(stream)
+        return b"", b'{"input_i": "-20.0"}'
+
+    monkeypatch.setattr("app.services.audio_cache.ffmpeg.run", run)
+    assert preparer.measure_loudness("/music/track.mp3") == measurement
+
+    cached = next(tmp_path.glob("*.loudnorm.json"))
+    os.utime(cached, (1000, 1000))
+    assert preparer.measure_loudness("/music/track.mp3") == measurement
+    assert len(calls) == 1
+    assert cached.stat().st_mtime > 1000
@@ -0,0 +1,102 @@
+"""
+Tests for the content-addressed video store and video deletion.
+"""
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from app.api.videos import delete_video
+from app.models import Video, VideoBlob
+from app.services.blob_store import BlobStore
+from app.services.storage import LocalStorage
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = BlobStore(LocalStorage(root=str(tmp_path)))
+    monkeypatch.setattr("app.api.videos.get_blob_store", lambda: store)
+    monkeypatch.setattr("app.api.videos.get_storage", lambda: store.storage)
+    yield store
+    store.storage.shutdown()
+
+
+def _ingest(db, store, content: bytes) -> Video:
+    blob = asyncio.run(store.ingest(db, io.BytesIO(content), ".mp4"))
+    video = Video(title="Test", file_path=blob.file_path, content_hash=blob.sha256)
+    db.add(video)
+    db.commit()
+    return video
+
+
+def test_identical_uploads_share_a_blob(db, store):
+    first = _ingest(db, store, b"same content")
+    second = _ingest(db, store, b"same content")
+
+    assert first.file_path == second.file_path
+    assert first.content_hash == hashlib.sha256(b"same content").hexdigest()
+    assert db.get(VideoBlob, first.content_hash).ref_count == 2
+
+
+def test_delete_video_removes_unreferenced_blob(db, store, tmp_path):
+    first = _ingest(db, store, b"same content")
+    second = _ingest(db, store, b"same content")
+    mezzanine = tmp_path / "mezzanine.mp4"
+    mezzanine.write_bytes(b"mezzanine")
+    second.mezzanine_path = str(mezzanine)
+    db.commit()
+    blob_path = tmp_path.joinpath(store.blob_key(first.content_hash, ".mp4"))
+
+    asyncio.run(delete_video(first.id, delete_file=True, db=db))
+    assert blob_path.exists()
+    assert mezzanine.exists()
+
+    # The last reference goes, taking the mezzanine along
+    asyncio.run(delete_video(second.id, delete_file=True, db=db))
+    assert not blob_path.exists()
+    assert not mezzanine.exists()
+    assert db.get(VideoBlob, first.content_hash) is None
+
+
+def test_delete_video_without_delete_file_keeps_files(db, store, tmp_path):
+    video = _ingest(db, store, b"only copy")
+    mezzanine = tmp_path / "mezzanine.mp4"
+    mezzanine.write_bytes(b"mezzanine")
+    video.mezzanine_path = str(mezzanine)
+    db.commit()
+    sha256 = video.content_hash
+    blob_path = tmp_path.joinpath(store.blob_key(sha256, ".mp4"))
+
+    asyncio.run(delete_video(video.id, delete_file=False, db=db))
+    assert blob_path.exists()
+    assert mezzanine.exists()
+    assert db.get(VideoBlob, sha256).ref_count == 0
+
+    # Left for an explicit reclaim
+    assert asyncio.run(store.purge_unreferenced()) == 1
+    assert not blob_path.exists()
+
+
+def test_released_blob_is_reused_until_purged(db, store, tmp_path):
+    video = _ingest(db, store, b"content")
+    sha256 = video.content_hash
+
+    assert store.release(db, sha256)
+    db.delete(video)
+    db.commit()
+
+    # An identical upload takes the blob over before it is purged
+    _ingest(db, store, b"content")
+    assert not asyncio.run(store.purge(db, sha256))
+    assert tmp_path.joinpath(store.blob_key(sha256, ".mp4")).exists()
+
+
+def test_purge_unreferenced(db, store, tmp_path):
+    video = _ingest(db, store, b"content")
+    store.release(db, video.content_hash)
+    db.delete(video)
+    db.commit()
+
+    assert asyncio.run(store.purge_unreferenced()) == 1
+    assert not tmp_path.joinpath(store.blob_key(video.content_hash, ".mp4")).exists()
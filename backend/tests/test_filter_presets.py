@@ -0,0 +1,49 @@
+"""
+Tests for the filter preset registry.
+"""
+import json
+import os
+
+import ffmpeg
+
+from app.services.filter_presets import FilterPresetRegistry, RenderChain
+from app.services.video_generator import VideoGenerator
+
+
+def _registry(tmp_path):
+    return FilterPresetRegistry(presets_dir=str(tmp_path / "presets"), lut_dir=str(tmp_path / "luts"))
+
+
+def test_custom_preset_edited_in_place_is_reloaded(tmp_path):
+    registry = _registry(tmp_path)
+    preset_file = registry.presets_dir / "teal.json"
+    preset_file.write_text(json.dumps({"color_filter": "eq=saturation=1.1"}))
+    assert registry.get("teal").color_filter == "eq=saturation=1.1"
+
+    # Rewriting a file does not touch the directory's mtime
+    dir_stat = registry.presets_dir.stat()
+    preset_file.write_text(json.dumps({"color_filter": "eq=saturation=1.4"}))
+    file_stat = preset_file.stat()
+    os.utime(preset_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000))
+    os.utime(registry.presets_dir, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+    assert registry.get("teal").color_filter == "eq=saturation=1.4"
+
+
+def test_registered_presets_do_not_replace_builtins(tmp_path):
+    registry = _registry(tmp_path)
+    registry.register("cinematic", color_filter="eq=contrast=2")
+
+    assert registry.get("cinematic").color_filter == "eq=contrast=2"
+    assert not registry.get("cinematic").builtin
+    assert [preset.name for preset in registry.presets()].count("cinematic") == 1
+    assert _registry(tmp_path).get("cinematic").builtin
+
+
+def test_lut_path_is_passed_as_one_option():
+    chain = RenderChain("/data/luts/a:b,c.cube", "vignette=PI/4")
+
+    video = VideoGenerator._apply_filter_chain(ffmpeg.input("in.mp4").video, chain)
+    graph = ffmpeg.output(video, "out.mp4").get_args()[3]
+
+    assert graph == "[0:v]lut3d=file=/data/luts/a\\\\:b\\,c.cube[s0];[s0]vignette=PI/4[s1]"
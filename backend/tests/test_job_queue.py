@@ -0,0 +1,164 @@
+"""
+Tests for the render job queue and how render results are recorded.
+"""
+from concurrent.futures import Future
+
+import pytest
+
+from app.models import ProjectStatus, RenderJob, RenderJobStatus, VideoProject
+from app.services import render_pool
+from app.services.job_queue import JobQueue
+from app.services.render_worker import RenderWorker
+from app.services.video_generator import VideoGenerator
+
+
+@pytest.fixture
+def queue():
+    return JobQueue(lease_seconds=60, max_attempts=2, queue_size=100)
+
+
+@pytest.fixture
+def project(db):
+    project = VideoProject(name="Test", video_track_path="/nonexistent/source.mp4", status=ProjectStatus.PROCESSING)
+    db.add(project)
+    db.commit()
+    return project
+
+
+def _job(db, job_id):
+    db.expire_all()
+    return db.get(RenderJob, job_id)
+
+
+def _project_job(db, queue, project):
+    job = queue.enqueue_project(db, project.id)
+    db.commit()
+    return job
+
+
+def test_claim_takes_lease(db, queue, project):
+    job = _project_job(db, queue, project)
+
+    claimed = queue.claim("worker-a", limit=5)
+
+    assert [claimed_job.id for claimed_job in claimed] == [job.id]
+    job = _job(db, job.id)
+    assert job.status == RenderJobStatus.RUNNING
+    assert job.lease_owner == "worker-a"
+    assert job.attempts == 1
+    assert queue.claim("worker-b") == []
+
+
+def test_expired_lease_is_requeued(db, queue, project):
+    job = _project_job(db, queue, project)
+    expiring = JobQueue(lease_seconds=-1, max_attempts=2, queue_size=100)
+    expiring.claim("worker-a")
+
+    assert queue.requeue_expired() == {"requeued": 1, "failed": 0}
+    assert _job(db, job.id).status == RenderJobStatus.QUEUED
+
+    # The original worker lost its lease and cannot record a result
+    assert not queue.complete("worker-a", job.id)
+    assert [claimed_job.id for claimed_job in queue.claim("worker-b")] == [job.id]
+    assert _job(db, job.id).attempts == 2
+
+
+def test_expired_lease_out_of_attempts_fails_project(db, project):
+    expiring = JobQueue(lease_seconds=-1, max_attempts=1, queue_size=100)
+    job = _project_job(db, expiring, project)
+    expiring.claim("worker-a")
+
+    assert expiring.requeue_expired() == {"requeued": 0, "failed": 1}
+    assert _job(db, job.id).status == RenderJobStatus.FAILED
+    db.refresh(project)
+    assert project.status == ProjectStatus.FAILED
+
+
+def test_fail_retries_then_fails(db, queue, project):
+    job = _project_job(db, queue, project)
+
+    queue.claim("worker-a")
+    assert queue.fail("worker-a", job.id, "boom")
+    job = _job(db, job.id)
+    assert job.status == RenderJobStatus.QUEUED
+    assert job.last_error == "boom"
+
+    queue.claim("worker-a")
+    assert queue.fail("worker-a", job.id, "boom again")
+    assert _job(db, job.id).status == RenderJobStatus.FAILED
+    db.refresh(project)
+    assert project.status == ProjectStatus.FAILED
+    assert "boom again" in project.error_message
+
+
+def test_complete(db, queue, project):
+    job = _project_job(db, queue, project)
+    queue.claim("worker-a")
+
+    assert not queue.complete("worker-b", job.id)
+    assert queue.complete("worker-a", job.id)
+    job = _job(db, job.id)
+    assert job.status == RenderJobStatus.COMPLETED
+    assert job.lease_owner is None
+
+
+def _raise(*args, **kwargs):
+    raise Exception("Failed to composite video: ffmpeg exited with 1")
+
+
+def test_failed_render_fails_attempt(db, queue, project, monkeypatch):
+    monkeypatch.setattr(VideoGenerator, "composite_video", _raise)
+    job = _project_job(db, queue, project)
+    queue.claim("worker-a")
+
+    with pytest.raises(Exception, match="Failed to composite video"):
+        render_pool.render_project(project.id, job_id=job.id, worker_id="worker-a")
+    db.refresh(project)
+    assert project.status == ProjectStatus.FAILED
+    assert "ffmpeg exited" in project.error_message
+
+    # The retry puts the project back in processing
+    assert queue.fail("worker-a", job.id, "ffmpeg exited with 1")
+    assert _job(db, job.id).status == RenderJobStatus.QUEUED
+    db.refresh(project)
+    assert project.status == ProjectStatus.PROCESSING
+
+
+def test_render_after_lost_lease_is_discarded(db, queue, project, monkeypatch, tmp_path):
+    output = tmp_path / "out.mp4"
+
+    def composite_video(self, **kwargs):
+        output.write_bytes(b"video")
+        return str(output)
+
+    monkeypatch.setattr(VideoGenerator, "composite_video", composite_video)
+    job = _project_job(db, queue, project)
+    queue.claim("worker-a")
+    queue.fail("worker-a", job.id, "lease lost")
+
+    render_pool.render_project(project.id, job_id=job.id, worker_id="worker-a")
+
+    db.refresh(project)
+    assert project.status == ProjectStatus.PROCESSING
+    assert project.output_path is None
+    assert not output.exists()
+
+
+def test_worker_records_failure(db, queue, project):
+    job = _project_job(db, queue, project)
+    worker = RenderWorker(queue=queue, pool=object(), poll_interval=1)
+    queue.claim(worker.worker_id)
+
+    future = Future()
+    future.set_exception(Exception("Failed to composite video"))
+    worker._on_done(job.id, future)
+
+    job = _job(db, job.id)
+    assert job.status == RenderJobStatus.QUEUED
+    assert job.last_error == "Failed to composite video"
+
+    queue.claim(worker.worker_id)
+    future = Future()
+    future.set_result(None)
+    worker._on_done(job.id, future)
+    assert _job(db, job.id).status == RenderJobStatus.COMPLETED
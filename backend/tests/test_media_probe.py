@@ -0,0 +1,30 @@
+"""
+Tests for the media probe cache.
+"""
+import os
+
+from app.services import media_probe
+from app.services.media_probe import probe_media, prune_probe_cache
+
+
+def test_prune_drops_entries_of_deleted_or_changed_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_probe, "_probe_cache_dir", lambda: tmp_path / "probe")
+    (tmp_path / "probe").mkdir()
+    monkeypatch.setattr(media_probe.ffmpeg, "probe", lambda path: {"format": {"filename": path}})
+    media_probe._cached_probe.cache_clear()
+
+    kept = tmp_path / "kept.mp4"
+    deleted = tmp_path / "deleted.mp4"
+    changed = tmp_path / "changed.mp4"
+    for path in (kept, deleted, changed):
+        path.write_bytes(b"video")
+        probe_media(str(path))
+    (tmp_path / "probe" / "legacy.json").write_text('{"format": {}}')
+
+    deleted.unlink()
+    changed.write_bytes(b"longer video")
+    assert prune_probe_cache() == 3
+
+    media_probe._cached_probe.cache_clear()
+    assert probe_media(str(kept)) == {"format": {"filename": os.path.abspath(kept)}}
+    assert len(list((tmp_path / "probe").glob("*.json"))) == 1
@@ -0,0 +1,46 @@
+"""
+Tests for the content-addressed render cache.
+"""
+import os
+
+from app.services.render_cache import RenderCache
+
+
+def _cache(tmp_path):
+    cache = RenderCache(cache_dir=str(tmp_path / "cache"), max_bytes=1024)
+    cache.output_dir = tmp_path / "projects"
+    cache.output_dir.mkdir()
+    return cache
+
+
+def test_checkout_links_into_output_dir(tmp_path):
+    cache = _cache(tmp_path)
+    render = tmp_path / "render.mp4"
+    render.write_bytes(b"video")
+    cache.put("key", str(render))
+
+    output = cache.checkout("key")
+
+    assert os.path.dirname(output) == str(cache.output_dir)
+    assert open(output, "rb").read() == b"video"
+    assert cache.checkout("missing") is None
+
+
+def test_checkout_copies_without_hard_links(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+    render = tmp_path / "render.mp4"
+    render.write_bytes(b"video")
+    cache.put("key", str(render))
+
+    def no_link(src, dst):
+        raise OSError("Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", no_link)
+    output = cache.checkout("key")
+
+    assert os.path.dirname(output) == str(cache.output_dir)
+    assert open(output, "rb").read() == b"video"
+
+    # The output outlives eviction of the cache entry
+    os.unlink(cache.get("key"))
+    assert os.path.exists(output)
@@ -0,0 +1,76 @@
+"""
+Tests for the S3 storage backend against an in-memory S3 stand-in.
+"""
+import asyncio
+import io
+import shutil
+import sys
+import types
+
+import pytest
+
+from app.services import storage as storage_module
+from app.services.storage import S3Storage
+
+
+class FakeS3Client:
+    """The part of the boto3 S3 client the storage backend uses, in memory."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_file(self, path, bucket, key):
+        with open(path, "rb") as f:
+            self.objects[(bucket, key)] = f.read()
+
+    def download_file(self, bucket, key, path):
+        if (bucket, key) not in self.objects:
+            raise Exception("404 Not Found")
+        with open(path, "wb") as f:
+            f.write(self.objects[(bucket, key)])
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+@pytest.fixture
+def s3(tmp_path, monkeypatch):
+    client = FakeS3Client()
+    monkeypatch.setitem(sys.modules, "boto3", types.SimpleNamespace(client=lambda *args, **kwargs: client))
+    monkeypatch.setattr(storage_module.settings, "S3_BUCKET", "media")
+    monkeypatch.setattr(storage_module.settings, "S3_PREFIX", "panel/")
+    storage = S3Storage(root=str(tmp_path))
+    yield storage, client
+    storage.shutdown()
+
+
+def test_save_mirrors_the_file_to_the_bucket(s3, tmp_path):
+    storage, client = s3
+    path = asyncio.run(storage.save("videos/clip.mp4", io.BytesIO(b"video")))
+
+    assert path == str(tmp_path / "videos" / "clip.mp4")
+    assert client.objects == {("media", "panel/videos/clip.mp4"): b"video"}
+
+
+def test_localize_downloads_a_missing_local_copy(s3, tmp_path):
+    storage, client = s3
+    path = asyncio.run(storage.save("videos/clip.mp4", io.BytesIO(b"video")))
+    shutil.rmtree(tmp_path / "videos")
+
+    assert storage.localize(path) == path
+    assert open(path, "rb").read() == b"video"
+    assert [p.name for p in (tmp_path / "videos").iterdir()] == ["clip.mp4"]
+
+    # Not in the bucket either: left to the caller to report
+    missing = str(tmp_path / "videos" / "missing.mp4")
+    assert storage.localize(missing) == missing
+    assert [p.name for p in (tmp_path / "videos").iterdir()] == ["clip.mp4"]
+
+
+def test_delete_removes_local_copy_and_object(s3, tmp_path):
+    storage, client = s3
+    path = asyncio.run(storage.save("videos/clip.mp4", io.BytesIO(b"video")))
+
+    asyncio.run(storage.delete(path))
+    assert not (tmp_path / "videos" / "clip.mp4").exists()
+    assert client.objects == {}
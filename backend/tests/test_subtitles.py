@@ -0,0 +1,19 @@
+"""
+Tests for the timed subtitle engine.
+"""
+from app.services.subtitles import build_ass, split_text
+
+
+def test_line_breaks_stay_inside_a_cue():
+    cues = split_text("First line\nsecond line", max_chars=40, chars_per_second=10, min_cue_duration=1)
+
+    assert [cue.text for cue in cues] == ["First line\nsecond line"]
+    assert "First line\\Nsecond line" in build_ass(cues)
+
+
+def test_long_text_splits_by_length_and_sentence():
+    text = "One two three four five six.\nSeven eight nine ten eleven twelve"
+    cues = split_text(text, duration=10, max_chars=20, chars_per_second=10, min_cue_duration=1)
+
+    assert [cue.text for cue in cues] == ["One two three four", "five six.\nSeven", "eight nine ten", "eleven twelve"]
+    assert cues[0].start == 0 and cues[-1].end == 10
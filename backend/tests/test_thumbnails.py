@@ -0,0 +1,37 @@
+"""
+Tests for poster frame and sprite sheet generation.
+"""
+from app.services import media_probe, thumbnails
+from app.services.thumbnails import ThumbnailGenerator
+
+
+def test_sprite_tiles_follow_rotation(tmp_path, monkeypatch):
+    # Portrait phone footage stored as 1920x1080 with a 90 degree rotation
+    probe = {
+        "format": {"duration": "20"},
+        "streams": [{
+            "codec_type": "video",
+            "width": 1920,
+            "height": 1080,
+            "side_data_list": [{"rotation": -90}],
+        }],
+    }
+    monkeypatch.setattr(thumbnails, "probe_media", lambda path: probe)
+    monkeypatch.setattr(media_probe, "probe_media", lambda path: probe)
+    monkeypatch.setattr(thumbnails, "file_content_hash", lambda path: "abc")
+
+    commands = []
+
+    def run(stream, **kwargs):
+        commands.append(" ".join(stream.get_args()))
+        open(stream.get_args()[-1], "wb").close()
+
+    monkeypatch.setattr(thumbnails.ffmpeg, "run", run)
+
+    result = ThumbnailGenerator(cache_dir=str(tmp_path)).generate("/videos/portrait.mp4")
+
+    tile_width = thumbnails.settings.SPRITE_TILE_WIDTH
+    tile_height = round(tile_width * 1920 / 1080 / 2) * 2
+    assert any(f"scale={tile_width}:{tile_height}" in command for command in commands)
+    with open(result["sprite_vtt_path"], encoding="utf-8") as file:
+        assert f"#xywh=0,0,{tile_width},{tile_height}" in file.read()
@@ -0,0 +1,128 @@
+"""
+Tests for resumable uploads and finalizing them into videos.
+"""
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import videos as videos_api
+from app.database import SessionLocal
+from app.models import RenderJob, RenderJobKind, UploadStatus, Video, VideoBlob, VideoUpload
+from app.services.uploads import UploadOffsetMismatch, create_upload, write_chunk
+
+
+async def _body(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def _upload(db, content: bytes) -> VideoUpload:
+    upload = asyncio.run(create_upload(db, "Test", "clip.mp4", len(content)))
+    asyncio.run(write_chunk(db, upload, 0, _body(content[:4], content[4:])))
+    return upload
+
+
+@pytest.fixture(autouse=True)
+def no_probe(monkeypatch):
+    def get_media_info(path):
+        raise Exception("ffprobe not available")
+
+    monkeypatch.setattr(videos_api, "get_media_info", get_media_info)
+
+
+def test_chunks_advance_offset(db):
+    upload = asyncio.run(create_upload(db, "Test", "clip.mp4", 10))
+
+    assert asyncio.run(write_chunk(db, upload, 0, _body(b"01234"))) == 5
+    with pytest.raises(UploadOffsetMismatch):
+        asyncio.run(write_chunk(db, upload, 0, _body(b"01234")))
+    assert asyncio.run(write_chunk(db, upload, 5, _body(b"56789"))) == 10
+
+    with open(upload.file_path, "rb") as file:
+        assert file.read() == b"0123456789"
+
+
+def test_offset_advanced_elsewhere_is_rejected(db):
+    upload = asyncio.run(create_upload(db, "Test", "clip.mp4", 10))
+
+    async def racing_body():
+        # Another request records bytes while this chunk is streaming
+        other = SessionLocal()
+        other.query(VideoUpload).filter(VideoUpload.id == upload.id).update({VideoUpload.offset: 5})
+        other.commit()
+        other.close()
+        yield b"01234"
+
+    with pytest.raises(UploadOffsetMismatch):
+        asyncio.run(write_chunk(db, upload, 0, racing_body()))
+    db.refresh(upload)
+    assert upload.offset == 5
+
+
+def test_finalize_and_dedupe(db):
+    first = _upload(db, b"video bytes")
+    second = _upload(db, b"video bytes")
+    second_path = second.file_path
+
+    video = asyncio.run(videos_api.finalize_upload(first.id, db=db))
+    again = asyncio.run(videos_api.finalize_upload(first.id, db=db))
+    duplicate = asyncio.run(videos_api.finalize_upload(second.id, db=db))
+
+    assert again.id == video.id
+    assert duplicate.file_path == video.file_path
+    assert db.get(VideoBlob, video.content_hash).ref_count == 2
+    assert not os.path.exists(second_path)
+
+
+def test_duplicate_upload_reuses_ingest_results(db):
+    first = _upload(db, b"video bytes")
+    first.normalize = True
+    db.commit()
+    video = asyncio.run(videos_api.finalize_upload(first.id, db=db))
+    assert {job.kind for job in db.query(RenderJob).all()} == {RenderJobKind.INGEST, RenderJobKind.THUMBNAILS}
+
+    video.duration = 12.5
+    video.mezzanine_path = "/uploads/videos/mezzanine/clip_mezzanine.mp4"
+    video.thumbnail_path = "/uploads/thumbnails/clip.jpg"
+    video.sprite_path = "/uploads/thumbnails/clip_sprite.jpg"
+    video.sprite_vtt_path = "/uploads/thumbnails/clip.vtt"
+    db.commit()
+
+    second = _upload(db, b"video bytes")
+    second.normalize = True
+    db.commit()
+    duplicate = asyncio.run(videos_api.finalize_upload(second.id, db=db))
+
+    assert db.query(RenderJob).count() == 2
+    assert duplicate.duration == 12.5
+    assert duplicate.mezzanine_path == video.mezzanine_path
+    assert duplicate.sprite_vtt_path == video.sprite_vtt_path
+
+
+def test_failed_finalize_restores_upload(db, monkeypatch):
+    upload = _upload(db, b"video bytes")
+    upload_path = upload.file_path
+
+    async def register_fails(*args, **kwargs):
+        raise Exception("database went away")
+
+    register = videos_api._register_video
+    monkeypatch.setattr(videos_api, "_register_video", register_fails)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(videos_api.finalize_upload(upload.id, db=db))
+    assert error.value.status_code == 500
+
+    db.refresh(upload)
+    assert upload.status == UploadStatus.UPLOADING
+    assert upload.file_path == upload_path
+    assert os.path.exists(upload_path)
+    assert db.query(VideoBlob).count() == 0
+    assert db.query(Video).count() == 0
+
+    # The upload can be finalized once the failure is gone
+    monkeypatch.setattr(videos_api, "_register_video", register)
+    video = asyncio.run(videos_api.finalize_upload(upload.id, db=db))
+    assert os.path.exists(video.file_path)
+    assert not os.path.exists(upload_path)
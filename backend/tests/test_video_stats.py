@@ -0,0 +1,35 @@
+"""
+Tests for bulk video statistics ingestion.
+"""
+import pytest
+
+from app.models import Video
+from app.services.video_stats import StatsPayloadError, apply_stats, parse_stats
+
+
+def test_apply_stats_counts_updated_and_missing(db):
+    video = Video(title="Test", file_path="/videos/a.mp4", views=10, likes=1, comments=0, engagement_rate=10.0)
+    db.add(video)
+    db.commit()
+
+    updates = parse_stats(
+        f'{{"video_id": {video.id}, "views": 200, "likes": 30}}\n{{"video_id": 999999, "views": 5}}\n'.encode(),
+        ndjson=True
+    )
+    counts = apply_stats(db, updates)
+    db.commit()
+
+    assert counts == {"received": 2, "updated": 1, "missing": 1}
+    db.refresh(video)
+    assert (video.views, video.likes, video.comments) == (200, 30, 0)
+    assert video.engagement_rate == 15.0
+
+
+@pytest.mark.parametrize("row", [
+    '{"video_id": 1, "views": 9223372036854775808}',
+    '{"video_id": 1, "comments": 2147483648}',
+    '{"video_id": 1, "likes": -1}',
+])
+def test_out_of_range_counters_are_rejected(row):
+    with pytest.raises(StatsPayloadError):
+        parse_stats(f"[{row}]".encode(), ndjson=False)
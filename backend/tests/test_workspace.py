@@ -0,0 +1,34 @@
+"""
+Tests for render scratch workspaces.
+"""
+import os
+import time
+
+from app.services import workspace as workspace_module
+from app.services.workspace import RenderWorkspace, reclaim_stale_workspaces
+
+
+def test_heartbeat_keeps_a_long_render_from_being_reclaimed(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace_module, "HEARTBEAT_INTERVAL", 0.01)
+    workspace = RenderWorkspace(root=str(tmp_path))
+    try:
+        # Writing into subdirectories leaves the workspace's own mtime alone
+        segments = workspace.directory("segments")
+        (segments / "segment_00000.mp4").write_bytes(b"segment")
+        os.utime(workspace.path, (1000, 1000))
+        time.sleep(0.2)
+
+        assert reclaim_stale_workspaces(root=str(tmp_path), max_age=60)["workspaces"] == 0
+        assert segments.exists()
+    finally:
+        workspace.cleanup()
+
+
+def test_abandoned_workspace_is_reclaimed(tmp_path):
+    stale = tmp_path / "job__otherhost__1234__abcdef"
+    stale.mkdir()
+    (stale / "output.mp4").write_bytes(b"partial")
+    os.utime(stale, (1000, 1000))
+
+    assert reclaim_stale_workspaces(root=str(tmp_path), max_age=60) == {"workspaces": 1, "freed_bytes": 7}
+    assert not stale.exists()
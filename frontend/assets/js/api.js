@@ -273,6 +273,37 @@ class APIClient {
         });
     }
 
+    /**
+     * Watch render progress via server-sent events
+     * @param {number} projectId
+     * @param {Function} onProgress - Called with each progress event payload
+     * @returns {Promise<Object>} Final project progress once processing ends
+     */
+    watchProjectProgress(projectId, onProgress = () => {}) {
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(`${this.baseURL}/api/generator/project/${projectId}/progress`);
+
+            source.addEventListener('progress', (event) => {
+                onProgress(JSON.parse(event.data));
+            });
+
+            source.addEventListener('done', (event) => {
+                source.close();
+                const result = JSON.parse(event.data);
+                if (result.status === 'failed') {
+                    reject(new Error(result.error_message || 'Video processing failed'));
+                } else {
+                    resolve(result);
+                }
+            });
+
+            source.onerror = () => {
+                source.close();
+                reject(new Error('Lost connection to progress stream'));
+            };
+        });
+    }
+
     /**
      * Export processed video
      * @param {number} projectId
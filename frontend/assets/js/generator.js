@@ -240,8 +240,12 @@ async function exportVideo() {
         // Collect settings
         const settings = collectSettings();
 
-        // Process video
+        // Process video and wait for the render to finish
         await api.processVideo(currentProject.id, settings);
+        await api.watchProjectProgress(currentProject.id, (progress) => {
+            const eta = progress.eta_seconds != null ? `, ${Math.ceil(progress.eta_seconds)}s left` : '';
+            showLoader(`Processing video... ${Math.round(progress.progress)}%${eta}`);
+        });
 
         // Export
         const result = await api.exportVideo(currentProject.id);